@@ -4,8 +4,14 @@ To work, the file name must be formatted as "name_v001.ext".
 """
 
 import maya.cmds as cmds
+import maya.utils
 from functools import partial
 import os
+import tempfile
+import threading
+import renderTasks
+import sceneVersions
+from renderTasks import SceneSnapshot, LayerSnapshot, cleanPath
 
 def splitName(fileName):
 	# Converts a file name into a list consisting of its base name [0], its version [1], and its extension [2].
@@ -38,168 +44,512 @@ def updateVersion(version):
 	# Return the version as a string.
 	return output
 	
-def cleanPath(scenePath):
-	# This function reformats a path so the command line can read it.
-	# Breakdown the file path into components.
-	scenePath = scenePath.strip()
-	pathComponents = scenePath.split("/")
-	updatedComponents = []
-	
-	# If spaces exist in component names, surround them with quotations.
-	for component in pathComponents:
-		if component.find(" ") > -1:
-			outComponent = '"' + component + '"/'
-		else: 
-			outComponent = component + '/'
-		updatedComponents.append(outComponent)
-	
-	# Assemble a new string and return.
-	output = "".join(updatedComponents)
-	return output
+# The only overridden attributes the render script cares about.
+OVERRIDE_ATTRIBUTES = ("renderable", "startFrame", "endFrame")
+
+def getLayerAdjustments(layers):
+	# Returns a dictionary of {layer: {plug: value}} holding each layer's attribute overrides.
+	# Overrides are stored in the layer's adjustments array, so they can be read without switching layers.
+	# One listConnections finds every override, but cmds can't read a multi of generic values at once, so each value costs a getAttr.
+	adjustments = dict((layer, {}) for layer in layers)
+	if not layers:
+		return adjustments
+	connections = cmds.listConnections([layer +".adjustments" for layer in layers], source = True, destination = False, plugs = True, connections = True) or []
 	
-def getCameras():
-	# Returns a list of cameras with their respective frame ranges.
-	# First get a list of all the cameras in the scene.
-	allCameras = cmds.ls(cameras = True)
-	renderCameras = []
-	
-	for each in allCameras:
-		startFrame = 0
-		endFrame = 0
-		
-		# Check to see if the camera is renderable.
-		if cmds.getAttr(each +".renderable"):
-			# Check to see if the camera has custom frame range attributes.
-			if cmds.attributeQuery('startFrame', node = each, exists = True) == False:
-				# If not, create custom attributes and set them to the default render globals.
-				startFrame = cmds.getAttr('defaultRenderGlobals.startFrame')
-				endFrame = cmds.getAttr('defaultRenderGlobals.endFrame')
-				
-				print ("\nCreating frame range attributes for "+ each +".\n")
-				cmds.addAttr(each, longName = 'startFrame', attributeType = 'long')
-				cmds.addAttr(each, longName = 'endFrame', attributeType = 'long')
-				cmds.setAttr(each +".startFrame", startFrame)
-				cmds.setAttr(each +".endFrame", endFrame)
-		
-			startFrame = cmds.getAttr(each +".startFrame")
-			endFrame = cmds.getAttr(each +".endFrame")	
+	# Connections come back in pairs: "layer.adjustments[n].plug", "node.attribute".
+	for index in range(0, len(connections), 2):
+		adjustmentPlug = connections[index]
+		overriddenPlug = connections[index + 1]
+		if overriddenPlug.rsplit(".", 1)[-1] not in OVERRIDE_ATTRIBUTES:
+			continue
+		layer = adjustmentPlug.split(".", 1)[0]
+		value = cmds.getAttr(adjustmentPlug.rsplit(".", 1)[0] +".value")
+		adjustments[layer][overriddenPlug] = value
+	return adjustments
+	
+def readRenderLayers(layers):
+	# Returns the renderable layers among the given render layers, the current render layer, and the adjustments that resolve their values.
+	currentLayer = cmds.editRenderLayerGlobals(query = True, currentRenderLayer = True)
+	renderLayers = [each for each in layers if cmds.getAttr(each +".renderable")]
+	
+	# The master layer keeps the base values of attributes overridden by the current layer.
+	adjustmentLayers = list(renderLayers)
+	for each in ('defaultRenderLayer', currentLayer):
+		if each not in adjustmentLayers:
+			adjustmentLayers.append(each)
+	return renderLayers, currentLayer, getLayerAdjustments(adjustmentLayers)
+	
+def readCameras(shapes):
+	# Returns (shape, transform) pairs for the camera shapes, the shapes with frame range attributes, and their live values.
+	# The live values belong to the current render layer.
+	if not shapes:
+		return [], set(), {}
+	transforms = cmds.listRelatives(shapes, parent = True) or []
+	if len(transforms) != len(shapes):
+		transforms = [cmds.listRelatives(each, parent = True)[0] for each in shapes]
+	frameRangeShapes = set(plug.split(".", 1)[0] for plug in cmds.ls([each +".startFrame" for each in shapes]) or [])
+	
+	live = {}
+	for each in shapes:
+		live[each +".renderable"] = cmds.getAttr(each +".renderable")
+		if each in frameRangeShapes:
+			live[each +".startFrame"] = cmds.getAttr(each +".startFrame")
+			live[each +".endFrame"] = cmds.getAttr(each +".endFrame")
+	return list(zip(shapes, transforms)), frameRangeShapes, live
+	
+# The render globals read along with the cameras.
+GLOBAL_PLUGS = ('defaultRenderGlobals.startFrame', 'defaultRenderGlobals.endFrame', 'defaultResolution.width', 'defaultResolution.height')
 
-			# Get the transform for each camera.
-			cameraTransform = cmds.listRelatives(each, parent = True)
-			
-			# Add the final render information to the output list.
-			renderCameras.append("-cam "+ cameraTransform[0] +" -s "+ str(startFrame) +" -e "+ str(endFrame))
-	return renderCameras
+def getSceneSnapshot():
+	# Reads the render layers, their renderable cameras, and frame ranges without switching layers.
+	# Per-layer values are resolved from the layer adjustments, so the current render layer never changes.
+	# The cmds calls still grow with the scene: a getAttr per layer's renderable flag, per override, and per camera attribute.
+	# SceneIndex keeps these values current so the window doesn't pay this on every edit.
+	renderLayers, currentLayer, adjustments = readRenderLayers(cmds.listConnections('renderLayerManager.renderLayerId') or [])
+	cameras, frameRangeShapes, live = readCameras(cmds.ls(cameras = True) or [])
+	for plug in GLOBAL_PLUGS:
+		live[plug] = cmds.getAttr(plug)
+	return renderTasks.resolveSnapshot(renderLayers, currentLayer, adjustments, live, cameras, frameRangeShapes, live['defaultResolution.width'], live['defaultResolution.height'])
 	
-def getLayers():
-	# Returns a list containing the scene's render layers.
-	baseRenderLayers = cmds.listConnections('renderLayerManager.renderLayerId')
-	activeLayers = []
+# Scene events after which everything is read again, and those that only change the render layers or the cameras.
+RESCAN_EVENTS = ("SceneOpened", "NewSceneOpened", "NameChanged", "renderLayerManagerChange")
+LAYER_EVENTS = ("renderLayerChange",)
+CAMERA_EVENTS = ("DagObjectCreated",)
+
+class SceneIndex(object):
+	# Holds everything getSceneSnapshot reads and keeps it current with scriptJobs, so a snapshot costs no cmds calls.
+	# The jobs only note what changed. The changed parts are read again once Maya is idle, or when a snapshot is asked for.
+	# Each layer's cameras are resolved once and kept, so an edit only resolves the layers and cameras it touches.
+	# index = SceneIndex(parent = "batchSaveWindow", onChange = refreshPreview)
+	# exportScript(snapshot = index.getSnapshot())
 	
-	# Iterate through the list of layers. Determine which are renderable.
-	for each in baseRenderLayers:
-		if cmds.getAttr(each +".renderable"):
-			# If renderable, add the current layer and its cameras to the render text.
-			cmds.editRenderLayerGlobals(currentRenderLayer = each)
-			cameraList = getCameras()
+	def __init__(self, parent = None, onChange = None):
+		self.parent = parent
+		self.onChange = onChange
+		self.jobs = {}
+		self.pending = False
+		self.rescan()
+		
+		# Jobs that outlive the nodes they watch are kept under None.
+		for event in RESCAN_EVENTS:
+			self.addJob(None, event = [event, self.sceneChanged])
+		for event in LAYER_EVENTS:
+			self.addJob(None, event = [event, self.layersChanged])
+		for event in CAMERA_EVENTS:
+			self.addJob(None, event = [event, self.cameraListChanged])
+		for plug in GLOBAL_PLUGS:
+			self.addJob(None, attributeChange = [plug, partial(self.plugChanged, plug)])
+		# Layer overrides of the render globals frame range are connections to the layers' adjustments.
+		for plug in GLOBAL_PLUGS[:2]:
+			self.addJob(None, connectionChange = [plug, self.layersChanged])
 			
-			for eachCamera in cameraList:
-				activeLayers.append("-rl "+ each + " " + eachCamera + " ")
+	# Registers a scriptJob under key, parented to the window if there is one.
+	def addJob(self, key, **flags):
+		if self.parent:
+			flags["parent"] = self.parent
+		self.jobs.setdefault(key, []).append(cmds.scriptJob(**flags))
+		
+	# Kills the scriptJobs registered under key.
+	def killJobs(self, key):
+		for job in self.jobs.pop(key, []):
+			if cmds.scriptJob(exists = job):
+				cmds.scriptJob(kill = job, force = True)
+				
+	# Kills every scriptJob. The index stops updating.
+	def close(self):
+		for key in list(self.jobs):
+			self.killJobs(key)
+		self.pending = False
+		
+	# Watches a render layer's renderable flag.
+	def watchLayer(self, layer):
+		self.addJob(layer, attributeChange = [layer +".renderable", self.layersChanged])
 		
-	baseRenderLayers = []
-	cmds.editRenderLayerGlobals(currentRenderLayer = 'defaultRenderLayer')	
+	# Watches a camera's plugs, overrides of them, its frame range attributes being added or deleted, and its deletion.
+	def watchCamera(self, shape):
+		for attribute in OVERRIDE_ATTRIBUTES:
+			plug = shape +"."+ attribute
+			if plug not in self.live:
+				continue
+			self.addJob(shape, attributeChange = [plug, partial(self.plugChanged, plug)])
+			self.addJob(shape, connectionChange = [plug, self.layersChanged])
+		if shape in self.frameRangeShapes:
+			self.addJob(shape, attributeDeleted = [shape +".startFrame", partial(self.cameraChanged, shape)])
+		else:
+			self.addJob(shape, attributeAdded = [shape +".startFrame", partial(self.cameraChanged, shape)])
+		self.addJob(shape, nodeDeleted = [shape, self.cameraListChanged])
+		
+	# Reads the whole scene again and watches every render layer and camera.
+	def rescan(self):
+		for key in [each for each in self.jobs if each is not None]:
+			self.killJobs(key)
+		self.layers = []
+		self.shapes = []
+		self.transforms = {}
+		self.frameRangeShapes = set()
+		self.live = {}
+		self.currentLayer = None
+		self.adjustments = {}
+		# entries holds {layer: {shape: CameraSnapshot or None}}. Layers missing from it are resolved in full.
+		self.entries = {}
+		self.layerSnapshots = {}
+		self.staleShapes = set()
+		self.reorder = False
+		self.readLayers()
+		self.readCameraList()
+		for plug in GLOBAL_PLUGS:
+			self.live[plug] = cmds.getAttr(plug)
+		self.clearChanges()
+		
+	# Forgets the noted changes and the cached snapshot.
+	def clearChanges(self):
+		self.rescanNeeded = False
+		self.layersDirty = False
+		self.cameraListDirty = False
+		self.dirtyCameras = set()
+		self.dirtyPlugs = set()
+		self.snapshot = None
+		
+	# Reads the render layers and their adjustments, watching layers that are new.
+	def readLayers(self):
+		layers = cmds.listConnections('renderLayerManager.renderLayerId') or []
+		for layer in self.layers:
+			if layer not in layers:
+				self.killJobs(layer)
+		for layer in layers:
+			if layer not in self.layers:
+				self.watchLayer(layer)
+		self.layers = layers
+		renderLayers, currentLayer, adjustments = readRenderLayers(layers)
+		
+		# Another current layer, or a change to its overrides or the master layer's, can change any layer's values.
+		# Other overrides only change their own layer.
+		if currentLayer != self.currentLayer or [each for each in ('defaultRenderLayer', currentLayer) if adjustments.get(each) != self.adjustments.get(each)]:
+			self.entries = {}
+		else:
+			for layer in renderLayers:
+				if adjustments.get(layer) != self.adjustments.get(layer):
+					self.entries.pop(layer, None)
+		self.renderLayers, self.currentLayer, self.adjustments = renderLayers, currentLayer, adjustments
+		
+	# Finds added and removed cameras. Only the added ones are read.
+	def readCameraList(self):
+		shapes = cmds.ls(cameras = True) or []
+		known = set(self.shapes)
+		current = set(shapes)
+		for shape in known - current:
+			self.forgetCamera(shape)
+			for entries in self.entries.values():
+				entries.pop(shape, None)
+		if shapes != self.shapes:
+			self.reorder = True
+		self.shapes = shapes
+		self.readCameras([each for each in shapes if each not in known])
+		
+	# Drops a camera's values and jobs.
+	def forgetCamera(self, shape):
+		self.killJobs(shape)
+		self.transforms.pop(shape, None)
+		self.frameRangeShapes.discard(shape)
+		for attribute in OVERRIDE_ATTRIBUTES:
+			self.live.pop(shape +"."+ attribute, None)
+			
+	# Reads the given cameras again and watches them.
+	def readCameras(self, shapes):
+		for shape in shapes:
+			self.forgetCamera(shape)
+		cameras, frameRangeShapes, live = readCameras(shapes)
+		self.transforms.update(cameras)
+		self.frameRangeShapes.update(frameRangeShapes)
+		self.live.update(live)
+		self.staleShapes.update(shapes)
+		for shape in shapes:
+			self.watchCamera(shape)
+			
+	def sceneChanged(self, *args):
+		self.rescanNeeded = True
+		self.schedule()
+		
+	def layersChanged(self, *args):
+		self.layersDirty = True
+		self.schedule()
+		
+	def cameraListChanged(self, *args):
+		self.cameraListDirty = True
+		self.schedule()
+		
+	def cameraChanged(self, shape, *args):
+		self.dirtyCameras.add(shape)
+		self.schedule()
+		
+	def plugChanged(self, plug, *args):
+		self.dirtyPlugs.add(plug)
+		self.schedule()
+		
+	# Queues one update for when Maya is idle, however many changes come in before then.
+	def schedule(self):
+		self.snapshot = None
+		if not self.pending:
+			self.pending = True
+			cmds.evalDeferred(self.update, lowestPriority = True)
+			
+	# Reads what changed since the last update, then calls onChange.
+	def update(self):
+		if not self.pending:
+			return
+		self.pending = False
+		if self.rescanNeeded:
+			self.rescan()
+		else:
+			if self.cameraListDirty:
+				self.readCameraList()
+			cameras = [each for each in self.dirtyCameras if each in self.transforms]
+			if cameras:
+				self.readCameras(cameras)
+			for plug in self.dirtyPlugs:
+				if plug in self.live:
+					self.readPlug(plug)
+			if self.layersDirty:
+				self.readLayers()
+			self.clearChanges()
+		if self.onChange is not None:
+			self.onChange()
+			
+	# Reads a plug again and notes the cameras whose snapshots it can change.
+	def readPlug(self, plug):
+		value = cmds.getAttr(plug)
+		if value == self.live[plug]:
+			return
+		self.live[plug] = value
+		node = plug.split(".", 1)[0]
+		if node in self.transforms:
+			self.staleShapes.add(node)
+		elif plug in GLOBAL_PLUGS[:2]:
+			self.staleShapes.update(shape for shape in self.shapes if shape not in self.frameRangeShapes)
+			
+	# Resolves the cameras of new layers, and the stale cameras of the others, then rebuilds the layers that changed.
+	def resolveLayers(self):
+		resolve = renderTasks.getPlugResolver(self.currentLayer, self.adjustments, self.live)
+		for layer in [each for each in self.entries if each not in self.renderLayers]:
+			del self.entries[layer]
+			self.layerSnapshots.pop(layer, None)
+		staleShapes = [shape for shape in self.staleShapes if shape in self.transforms]
+		for layer in self.renderLayers:
+			entries = self.entries.get(layer)
+			changed = self.reorder or entries is None
+			if entries is None:
+				entries = self.entries[layer] = {}
+				shapes = self.shapes
+			else:
+				shapes = staleShapes
+			for shape in shapes:
+				camera = renderTasks.resolveCamera(resolve, layer, shape, self.transforms[shape], self.frameRangeShapes)
+				if entries.get(shape) != camera:
+					entries[shape] = camera
+					changed = True
+			if changed or layer not in self.layerSnapshots:
+				self.layerSnapshots[layer] = LayerSnapshot(layer, tuple(filter(None, map(entries.get, self.shapes))))
+		self.staleShapes = set()
+		self.reorder = False
+		
+	# Returns the scene snapshot, reading any changes that have not been picked up yet.
+	def getSnapshot(self):
+		self.update()
+		if self.snapshot is None:
+			self.resolveLayers()
+			self.snapshot = SceneSnapshot(tuple(self.layerSnapshots[layer] for layer in self.renderLayers), self.live['defaultResolution.width'], self.live['defaultResolution.height'])
+		return self.snapshot
+		
+def addFrameRangeAttributes(snapshot):
+	# Creates the custom frame range attributes on renderable cameras that do not have them yet.
+	cameras = {}
+	for layer in snapshot.layers:
+		for camera in layer.cameras:
+			cameras.setdefault(camera.shape, camera)
+	if not cameras:
+		return
+	existing = set(plug.split(".", 1)[0] for plug in cmds.ls([each +".startFrame" for each in cameras]) or [])
+	
+	for camera in cameras.values():
+		if camera.shape in existing:
+			continue
+		print ("\nCreating frame range attributes for "+ camera.shape +".\n")
+		cmds.addAttr(camera.shape, longName = 'startFrame', attributeType = 'long')
+		cmds.addAttr(camera.shape, longName = 'endFrame', attributeType = 'long')
+		cmds.setAttr(camera.shape +".startFrame", camera.startFrame)
+		cmds.setAttr(camera.shape +".endFrame", camera.endFrame)
+	
+def getLayers(snapshot = None):
+	# Returns a list containing the render text for each renderable layer and camera.
+	if snapshot is None:
+		snapshot = getSceneSnapshot()
+	activeLayers = []
+	for task in renderTasks.buildTasks(snapshot):
+		activeLayers.append(renderTasks.getTaskArguments(task))
 	return activeLayers
 	
-def getResolution():
+def getResolution(snapshot = None):
 	# Returns the scene's resolution settings.
-	x = cmds.getAttr('defaultResolution.width')
-	y = cmds.getAttr('defaultResolution.height')
-	output = "-x "+ str(x) +" -y "+ str(y) +" "
-	return output
-	
-def getHeader(operatingSystem):
-	# Adds a header for bash.
-	header = ""
-	if (operatingSystem == "mac"):
-		header = "#!/bin/bash\n"
+	if snapshot is None:
+		x = cmds.getAttr('defaultResolution.width')
+		y = cmds.getAttr('defaultResolution.height')
 	else:
-		header = "\n"
-	return header
+		x = snapshot.width
+		y = snapshot.height
+	return renderTasks.getResolutionArguments(x, y)
 	
-def saveIteration():
+def getOutputNaming():
+	# Returns the render globals settings that decide where each frame's image is written.
+	imageDirectory = cmds.workspace(fileRuleEntry = 'images') or 'images'
+	imageDirectory = cmds.workspace(expandName = imageDirectory)
+	prefix = cmds.getAttr('defaultRenderGlobals.imageFilePrefix') or ""
+	padding = cmds.getAttr('defaultRenderGlobals.extensionPadding')
+	imageFormat = cmds.getAttr('defaultRenderGlobals.imageFormat')
+	extension = renderTasks.getImageExtension(imageFormat, cmds.getAttr('defaultRenderGlobals.imfPluginKey'))
+	putFrameBeforeExt = cmds.getAttr('defaultRenderGlobals.putFrameBeforeExt')
+	periodInExt = cmds.getAttr('defaultRenderGlobals.periodInExt')
+	return renderTasks.OutputNaming(imageDirectory, prefix, padding, extension, putFrameBeforeExt, periodInExt)
+	
+def saveIteration(fastSave = False):
 	# Saves a new version of the open file.
-	# Get the file path and the current file name.
-	filePath = cmds.file(query = True, expandName = True).strip(cmds.file(sceneName = True, shortName = True, query = True))
-	fileName = splitName(cmds.file(sceneName = True, shortName = True, query = True))
+	# The next version comes from the scene's folder, so a later version saved by someone else is never overwritten.
+	# With fastSave, an unmodified scene is copied rather than saved, and a modified one is saved locally and copied in the background.
+	# A copy still running from the last save has to land before another save starts.
+	waitForBackgroundSaves()
+	scenePath = cmds.file(query = True, sceneName = True)
+	directory, sceneName = os.path.split(scenePath)
+	fileName = splitName(sceneName)
+	padding = len(fileName[1].strip("v"))
 	
-	# Iterate the version up.
-	fileName[1] = updateVersion(fileName[1])
-	newFileName = fileName[0] +"_"+ fileName[1] +"."+ fileName[2]
+	# Reserve the next free version.
+	index = sceneVersions.getVersionIndex(directory)
+	newPath = index.reserve(fileName[0], fileName[2], padding)
+	newFileName = os.path.basename(newPath)
 	
-	# Save the new file.
-	cmds.file (rename = newFileName)
-	cmds.file (save=True)
-	return newFileName
-	
-def exportScript():
-	# Get the operating system.
-	operatingSystem = cmds.about (os = True)
-	extension = ""
-	
-	if operatingSystem == "mac":
-		extension = ".command"
-	elif operatingSystem == "nt" or operatingSystem == "win64":
-		operatingSystem = "windows"
-		extension = ".bat"
-	elif operatingSystem == "linux" or operatingSystem == "linux64":
-		operatingSystem = "linux"
-		extension = ".sh"
-	else:
-		print "Invalid operating system."
+	localPath = None
+	try:
+		if not fastSave:
+			# Save the new file.
+			cmds.file (rename = newPath)
+			cmds.file (save=True)
+			return newFileName
+			
+		if not cmds.file(query = True, modified = True) and os.path.exists(scenePath) and os.path.getsize(scenePath):
+			# Nothing changed, so the previous version's file can simply be duplicated.
+			# An empty file, left by a crash or a failed copy, is never duplicated. The scene is saved instead.
+			sceneVersions.copyVersion(scenePath, newPath)
+			cmds.file (rename = newPath)
+			cmds.file (modified = False)
+			return newFileName
 		
-	# Get the scene path.
-	scenePath = cleanPath(cmds.file(query = True, expandName = True).strip(cmds.file(sceneName = True, shortName = True, query = True)).rstrip("/"))
+		# Save to local disk, then point the scene at the new version and copy it over in the background.
+		handle, localPath = tempfile.mkstemp(suffix = "." + fileName[2])
+		os.close(handle)
+		cmds.file (rename = localPath)
+		cmds.file (save=True)
+		cmds.file (rename = newPath)
+		cmds.file (modified = False)
+	except Exception:
+		# Give the reserved version back, so no empty file is left behind, and leave the scene named as it was.
+		index.release(newPath)
+		cmds.file (rename = scenePath)
+		if localPath is not None and os.path.exists(localPath):
+			os.remove(localPath)
+		raise
+	
+	# If the artist saves over the new version before the copy lands, the copy is dropped rather than overwriting it.
+	stamp = sceneVersions.getFileStamp(newPath)
+	watchBackgroundSaves()
+	thread = threading.Thread(target = publishInBackground, args = (localPath, newPath, stamp))
+	thread.start()
+	backgroundSaves.append(thread)
+	return newFileName
 	
-	# Get the file path.
-	filePath = scenePath + cmds.file(sceneName = True, shortName = True, query = True)
+# Threads still copying saved versions to their destination.
+backgroundSaves = []
+
+# The scriptJobs that wait for those threads before Maya quits or clears the scene.
+backgroundSaveJobs = []
 
-	# Get the renderer path.
-	rendererPath = cleanPath(os.getenv("MAYA_LOCATION")) + "bin/render"
+def publishInBackground(localPath, newPath, stamp = None):
+	# Copies a locally saved version to its destination. Runs on a worker thread.
+	try:
+		if sceneVersions.publishFile(localPath, newPath, stamp) is None:
+			maya.utils.executeDeferred(cmds.warning, "'%s' was saved again before its background copy finished. The newer save was kept." % os.path.basename(newPath))
+	except Exception as error:
+		maya.utils.executeDeferred(reportFailedPublish, newPath, "Could not copy '%s' to '%s': %s. The saved file is still at '%s'." % (os.path.basename(newPath), newPath, error, localPath))
+		
+def reportFailedPublish(newPath, message):
+	# Runs on the main thread after a background copy failed.
+	# The scene is marked modified again, so Maya asks to save it rather than letting the artist close it as saved.
+	if cmds.file(query = True, sceneName = True) == newPath:
+		cmds.file (modified = True)
+	cmds.warning(message)
+		
+def waitForBackgroundSaves(*args):
+	# Blocks until every background copy has finished.
+	while backgroundSaves:
+		backgroundSaves.pop().join()
+		
+def watchBackgroundSaves():
+	# Makes Maya wait for background copies before it quits or opens another scene. Runs once per session.
+	if backgroundSaveJobs:
+		return
+	for event in ("quitApplication", "deleteAll"):
+		backgroundSaveJobs.append(cmds.scriptJob(event = [event, waitForBackgroundSaves]))
 	
-	# Get the project path.
-	projectPath = cleanPath(cmds.workspace(fullName = True))
-	project = "-proj " + projectPath + " "
+def getRendererPath():
+	# Returns the command line renderer of the running Maya.
+	return cleanPath(os.getenv("MAYA_LOCATION")) + "bin/render"
 	
-	# Get the script path and file name.
-	baseList = splitName(cmds.file(sceneName = True, shortName = True, query = True))
-	base = baseList[0] +"_"+ baseList[1]
-	scriptName = base + extension
-	scriptPath = cmds.file(query = True, expandName = True).strip(cmds.file(sceneName = True, shortName = True, query = True)) + scriptName
+def exportScript(framesPerTask = 0, resume = False, snapshot = None, rendererPath = None, projectPath = None, operatingSystem = None):
+	# Writes a render script for the scene, plus a JSON task manifest next to it.
+	# A framesPerTask above 0 splits each camera's frame range into independent tasks.
+	# With resume, frames whose images already exist and are newer than the scene are left out.
+	# A snapshot from a SceneIndex saves reading the render layers and cameras again.
+	# The renderer, project, and operating system default to this Maya's, for scripts rendered on another machine.
+	# Get the operating system.
+	operatingSystem = operatingSystem or cmds.about (os = True)
 	
-	# Get the header.
-	header = getHeader(operatingSystem)
+	# Get the renderer and project paths.
+	rendererPath = rendererPath or getRendererPath()
+	projectPath = projectPath or cmds.workspace(fullName = True)
 	
-	# Get the scene resolution.
-	resolution = getResolution()
+	# Read the render layers, cameras, and resolution without switching layers.
+	if snapshot is None:
+		snapshot = getSceneSnapshot()
+	addFrameRangeAttributes(snapshot)
 	
-	# Get the scene render layers.
-	renderLayers = getLayers()
+	# Write the script and its manifest. This part needs no Maya session.
+	return renderTasks.exportRenderScript(snapshot, cmds.file(query = True, sceneName = True), rendererPath, projectPath, operatingSystem, framesPerTask, getOutputNaming(), resume)
 	
-	# Create the list of render commands.
-	renderCommands = []
+# The most render commands the window previews.
+PREVIEW_LINES = 200
+
+def getPreviewText(snapshot, framesPerTask = 0):
+	# Returns the render commands the script would hold, before frames already rendered are skipped.
+	tasks = renderTasks.chunkTasks(renderTasks.buildTasks(snapshot), framesPerTask)
+	commands = renderTasks.getScriptCommands(snapshot, cmds.file(query = True, sceneName = True), getRendererPath(), cmds.workspace(fullName = True), tasks[:PREVIEW_LINES])
+	if len(tasks) > PREVIEW_LINES:
+		commands.append("... and %d more." % (len(tasks) - PREVIEW_LINES))
+	return "\n".join(commands) or "No renderable layers or cameras."
 	
-	for eachLayer in renderLayers:
-		renderCommands.append(rendererPath + " " + project + " " + eachLayer + resolution + filePath +"\n")
-		
-	# Create the file and start writing.	
-	batchFile = open(scriptPath, 'w')
-	batchFile.write(header)
-	for eachLayer in renderCommands:
-		batchFile.write(eachLayer)
-		batchFile.write("\n")
-	batchFile.close
+# Kept current while the window is open.
+sceneIndex = None
+
+def refreshPreview(*args):
+	# Shows the render commands for the indexed scene in the window.
+	if sceneIndex is None or not cmds.scrollField("previewField", exists = True):
+		return
+	framesPerTask = cmds.intField("chunkField", query = True, value = True)
+	cmds.scrollField("previewField", edit = True, text = getPreviewText(sceneIndex.getSnapshot(), framesPerTask))
 	
-	return scriptName
+def closeSceneIndex(index, *args):
+	# Stops an index when its window closes.
+	global sceneIndex
+	index.close()
+	if sceneIndex is index:
+		sceneIndex = None
 	
 def batchAndSaveExecute(type, *args):
 	# Check to see if the file is being saved or the script is being exported.
@@ -208,9 +558,13 @@ def batchAndSaveExecute(type, *args):
 		
 	# Execute helper functions to export the script or save a new version.
 	if batch:
-		scriptName = exportScript()		
+		framesPerTask = cmds.intField("chunkField", query = True, value = True)
+		resume = cmds.checkBox("resumeBox", query = True, value = True)
+		snapshot = sceneIndex.getSnapshot() if sceneIndex is not None else None
+		scriptName = exportScript(framesPerTask, resume, snapshot)		
 	if save:
-		saveName = saveIteration()
+		fastSave = cmds.checkBox("fastSaveBox", query = True, value = True)
+		saveName = saveIteration(fastSave)
 	
 	# Provide feedback for successes or failures.
 	warning = ""
@@ -229,6 +583,7 @@ def batchAndSave():
 	batchAndSaveWindow()
 	
 def batchAndSaveWindow():
+	global sceneIndex
 	if cmds.window ("batchSaveWindow", exists = True):
 		cmds.deleteUI("batchSaveWindow")
 		
@@ -242,6 +597,15 @@ def batchAndSaveWindow():
 	cmds.separator(h=10, st='in')
 	cmds.checkBox("batchBox", label = "Export render script", value = True)
 	cmds.checkBox("saveBox", label = "Save new version", value = True)
+	cmds.checkBox("fastSaveBox", label = "Fast save (copy if unchanged, upload in background)", value = False)
+	cmds.checkBox("resumeBox", label = "Skip frames already rendered", value = False)
+	cmds.rowLayout (numberOfColumns = 2)
+	cmds.text(label = "Frames per task (0 = whole range) ")
+	cmds.intField("chunkField", value = 0, minValue = 0, width = 50, changeCommand = refreshPreview)
+	cmds.setParent('..')
+	cmds.separator(h=10, st='in')
+	cmds.text(label = "Render commands", align = "left")
+	cmds.scrollField("previewField", width = width - 20, height = 120, editable = False, wordWrap = False, text = "")
 	cmds.separator(h=10, st='in')
 	cmds.setParent('..')	
 	rowLayout1 = cmds.rowLayout (numberOfColumns = 3, parent = columnLayout1)
@@ -249,6 +613,13 @@ def batchAndSaveWindow():
 	cmds.setParent('..')
 	cmds.separator(h=10, st='in')
 	cmds.textField ("warningField", width = width - 20, height = 20, text = "", editable = False)
+	
+	# Index the scene once. Its scriptJobs die with the window.
+	sceneIndex = SceneIndex(parent = window, onChange = refreshPreview)
+	cmds.scriptJob(uiDeleted = [window, partial(closeSceneIndex, sceneIndex)])
+	refreshPreview()
 	cmds.showWindow(window)
 	
-batchAndSaveWindow()
\ No newline at end of file
+# Open the window when run from Maya's interface, but not when imported by mayapy workers.
+if not cmds.about(batch = True):
+	batchAndSaveWindow()
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Exports render scripts for the latest version of every shot in a directory, several scenes at a time, e.g.:
+
+	python batchExport.py /projects/show/scenes --workers 16 --frames-per-task 50
+
+Maya ASCII scenes are read directly with maReader. Maya binary scenes are opened by mayapy workers.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import traceback
+
+import maReader
+import mayaPaths
+import renderTasks
+import sceneVersions
+
+# Runs inside mayapy to export a .mb scene through batchAndSave.
+MAYAPY_SCRIPT = """
+import sys
+sys.path.insert(0, %(path)r)
+import maya.standalone
+maya.standalone.initialize()
+import maya.cmds as cmds
+cmds.workspace(%(project)r, openWorkspace = True)
+cmds.file(%(scene)r, open = True, force = True)
+import batchAndSave
+print ("SCRIPT:" + batchAndSave.exportScript(%(framesPerTask)d, %(resume)r, None, %(renderer)r, %(project)r, %(operatingSystem)r))
+"""
+
+def exportShot(job):
+	# Exports one scene and returns a report dictionary. Runs in a worker process.
+	scenePath, framesPerTask, resume, rendererPath, projectPath, operatingSystem = job
+	report = {"scene": scenePath, "script": None, "manifest": None, "seconds": 0.0, "error": None}
+	start = time.time()
+	try:
+		if scenePath.endswith(".ma"):
+			scriptName = maReader.exportScript(scenePath, framesPerTask, resume, rendererPath, projectPath, operatingSystem)
+		else:
+			# The project is opened before the scene, so its file rules place the images the manifest expects, as in maReader.
+			source = MAYAPY_SCRIPT % {"path": os.path.dirname(os.path.abspath(__file__)), "scene": scenePath, "framesPerTask": framesPerTask, "resume": resume,
+				"renderer": rendererPath, "project": projectPath or maReader.getProjectPath(scenePath), "operatingSystem": operatingSystem}
+			process = subprocess.Popen([mayaPaths.getMayapy(), "-c", source], stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+			output = process.communicate()[0].decode("utf-8", "replace")
+			lines = [line for line in output.splitlines() if line.startswith("SCRIPT:")]
+			if process.returncode != 0 or not lines:
+				raise RuntimeError("mayapy exited with %s:\n%s" % (process.returncode, output))
+			scriptName = lines[-1][len("SCRIPT:"):]
+		sceneDirectory = os.path.dirname(os.path.abspath(scenePath))
+		report["script"] = os.path.join(sceneDirectory, scriptName)
+		report["manifest"] = os.path.join(sceneDirectory, os.path.splitext(scriptName)[0] + ".json")
+	except Exception:
+		report["error"] = traceback.format_exc()
+	report["seconds"] = time.time() - start
+	return report
+
+def exportShots(scenes, workers = 0, framesPerTask = 0, resume = False, rendererPath = None, projectPath = None, operatingSystem = None):
+	# Exports every scene in a pool of worker processes. Returns the reports in scene order.
+	jobs = [(scene, framesPerTask, resume, rendererPath, projectPath, operatingSystem) for scene in scenes]
+	if not jobs:
+		return []
+	pool = multiprocessing.Pool(workers or multiprocessing.cpu_count())
+	try:
+		return pool.map(exportShot, jobs, chunksize = 1)
+	finally:
+		pool.close()
+		pool.join()
+
+def writeCombinedManifest(manifestPath, reports):
+	# Writes one manifest listing every exported shot and its tasks.
+	shots = []
+	for report in reports:
+		if report["error"]:
+			continue
+		manifest = renderTasks.readTaskManifest(report["manifest"])
+		tasks = []
+		for task, command in zip(manifest["tasks"], manifest["commands"]):
+			entry = dict(task._asdict())
+			entry["command"] = command
+			tasks.append(entry)
+		shots.append({"scene": report["scene"], "script": report["script"], "manifest": report["manifest"], "tasks": tasks})
+	manifestFile = open(manifestPath, 'w')
+	json.dump({"shots": shots}, manifestFile, indent = 2)
+	manifestFile.close()
+	return manifestPath
+
+def getReport(reports, wallTime):
+	# Returns the per-shot timing and failure report.
+	lines = []
+	for report in reports:
+		status = "FAILED" if report["error"] else "ok"
+		lines.append("%-6s %7.2f s  %s" % (status, report["seconds"], report["scene"]))
+	failed = [report for report in reports if report["error"]]
+	lines.append("%d scenes, %d failed, %.2f s wall, %.2f s total." % (len(reports), len(failed), wallTime, sum(report["seconds"] for report in reports)))
+	for report in failed:
+		lines.append("\n%s\n%s" % (report["scene"], report["error"]))
+	return "\n".join(lines)
+
+def main(arguments = None):
+	parser = argparse.ArgumentParser(description = "Exports render scripts for the latest version of every shot in a directory.")
+	parser.add_argument("directory", help = "Folder searched for name_v###.ma/.mb scenes.")
+	parser.add_argument("--workers", type = int, default = 0, help = "Scenes exported at once. Defaults to the number of cores.")
+	parser.add_argument("--frames-per-task", type = int, default = 0, help = "Split each camera's frame range into tasks of this many frames.")
+	parser.add_argument("--resume", action = "store_true", help = "Leave out frames whose images already exist.")
+	parser.add_argument("--renderer", default = None, help = "Render executable. Defaults to $MAYA_LOCATION/bin/render.")
+	parser.add_argument("--project", default = None, help = "Project folder. Defaults to the folder above each scene's scenes/.")
+	parser.add_argument("--os", default = None, help = "mac, windows, or linux. Defaults to this machine.")
+	parser.add_argument("--manifest", default = None, help = "Combined manifest path. Defaults to batchExport.json in the directory.")
+	parser.add_argument("--no-recursive", action = "store_true", help = "Only look at the directory itself.")
+	options = parser.parse_args(arguments)
+
+	start = time.time()
+	scenes = sceneVersions.findLatestVersions(options.directory, recursive = not options.no_recursive)
+	reports = exportShots(scenes, options.workers, options.frames_per_task, options.resume, options.renderer, options.project, options.os)
+	manifestPath = writeCombinedManifest(options.manifest or os.path.join(options.directory, "batchExport.json"), reports)
+	print (getReport(reports, time.time() - start))
+	print ("Wrote '%s'." % manifestPath)
+	return 1 if [report for report in reports if report["error"]] else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
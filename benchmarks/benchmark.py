@@ -0,0 +1,445 @@
+"""
+Times batchAndSave and RibbonSpine against the in-memory maya.cmds stand-in and counts their cmds calls with cmdsProfiler.
+Results can be saved and compared between runs:
+
+	python benchmarks/benchmark.py --json before.json
+	python benchmarks/benchmark.py --compare before.json
+
+--scaling checks that high density RibbonSpine builds take time in proportion to their joint count.
+The cmds calls of getLayers and exportScript grow with the layers, overrides, and cameras. A flat call count would take
+reading the plugs through OpenMaya in one pass, which is out of scope: the calls are counted to catch regressions, not held flat.
+Every run first runs checks.py, and also checks renderRunner against stubRenderer.py: parallel renders, failed renders and retries, and --resume.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakeCmds
+
+cmds = fakeCmds.install()
+os.environ.setdefault("MAYA_LOCATION", "/usr/autodesk/maya")
+
+import batchAndSave
+import checks
+import cmdsProfiler
+import flexoPlane2
+import renderRunner
+import renderTasks
+
+try:
+	import numpy
+	import ribbonSolver
+except ImportError:
+	ribbonSolver = None
+
+LAYER_COUNTS = (1, 50, 500)
+CAMERA_COUNTS = (1, 20, 200)
+JOINT_COUNTS = (5, 50, 500)
+BULK_RIG_COUNTS = (10, 100)
+SOLVER_FRAME_COUNTS = (1000, 10000)
+SCALING_JOINT_COUNTS = (250, 500, 1000, 2000, 4000)
+
+# The render runner check's worker count, and the seconds the stub renderer spends on each frame.
+RUNNER_WORKERS = 4
+RUNNER_FRAME_SECONDS = 0.1
+STUB_RENDERER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubRenderer.py")
+
+# --scaling fails when the time per joint of any build exceeds the previous or the smallest build's by more than this factor.
+SCALING_TOLERANCE = 1.5
+
+class Quiet(object):
+	# Swallows anything printed by the code being measured.
+
+	def write(self, text):
+		pass
+
+	def flush(self):
+		pass
+
+# The modules whose cmds calls are counted.
+PROFILED_MODULES = (batchAndSave, flexoPlane2)
+
+# Set by --profile to print a hot-spot table for every case.
+profileCases = False
+
+def measure(setup, function, repeat):
+	# Runs setup and then times function, repeat times. Returns (median seconds, minimum seconds, cmds calls of the last run).
+	times = []
+	calls = {}
+	for index in range(repeat):
+		setup()
+		stdout = sys.stdout
+		sys.stdout = Quiet()
+		try:
+			with cmdsProfiler.CmdsProfiler(PROFILED_MODULES, trace = False, callers = False) as counter:
+				start = time.time()
+				function()
+				times.append(time.time() - start)
+		finally:
+			sys.stdout = stdout
+		calls = counter.getCounts()
+	if profileCases:
+		# Profile an extra run so the timed runs are not slowed by the profiler.
+		setup()
+		stdout = sys.stdout
+		sys.stdout = Quiet()
+		try:
+			with cmdsProfiler.CmdsProfiler(PROFILED_MODULES, trace = False) as profiler:
+				function()
+		finally:
+			sys.stdout = stdout
+		print (profiler.report(10) + "\n")
+	times.sort()
+	return times[len(times) // 2], times[0], calls
+
+def benchmarkExport(layers, cameras, repeat, directory):
+	# Times getLayers() and exportScript() on a scene with the given number of layers and cameras.
+	def setup():
+		cmds.reset()
+		cmds.sceneName = os.path.join(directory, "bench_v001.ma")
+		cmds.workspacePath = directory + "/"
+		fakeCmds.buildRenderScene(cmds, layers, cameras)
+	results = []
+	for name, function in (("getLayers", batchAndSave.getLayers), ("exportScript", batchAndSave.exportScript)):
+		median, minimum, calls = measure(setup, function, repeat)
+		results.append({"case": "%s %dL x %dC" % (name, layers, cameras), "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls})
+	return results
+
+def benchmarkIndex(layers, cameras, repeat, directory):
+	# Times exportScript() from a SceneIndex snapshot, and the index catching up after one camera edit.
+	state = {}
+	def setup():
+		if state.get("index"):
+			state["index"].close()
+		cmds.reset()
+		cmds.sceneName = os.path.join(directory, "bench_v001.ma")
+		cmds.workspacePath = directory + "/"
+		fakeCmds.buildRenderScene(cmds, layers, cameras)
+		state["index"] = batchAndSave.SceneIndex()
+		state["index"].getSnapshot()
+	def edit():
+		cmds.setAttr("shotCamShape1.endFrame", 50)
+		cmds.runDeferred()
+		state["index"].getSnapshot()
+	results = []
+	for name, function in (("exportScript indexed", lambda: batchAndSave.exportScript(snapshot = state["index"].getSnapshot())), ("SceneIndex edit", edit)):
+		median, minimum, calls = measure(setup, function, repeat)
+		results.append({"case": "%s %dL x %dC" % (name, layers, cameras), "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls})
+	state["index"].close()
+	return results
+
+def checkIndex():
+	# Makes each kind of edit the SceneIndex follows and compares its snapshot with a full read. Raises if they differ.
+	cmds.reset()
+	shapes = fakeCmds.buildRenderScene(cmds, 4, 3)
+	index = batchAndSave.SceneIndex()
+	def addFrameRange():
+		cmds.addAttr("newCamShape", longName = "startFrame", attributeType = "long")
+		cmds.addAttr("newCamShape", longName = "endFrame", attributeType = "long")
+		cmds.setAttr("newCamShape.startFrame", 5)
+		cmds.setAttr("newCamShape.endFrame", 25)
+	def addLayer():
+		layer = cmds.createNode("renderLayer", name = "newLayer")
+		cmds.connectAttr("renderLayerManager.renderLayerId[10]", layer + ".identification")
+	def addOverride():
+		cmds.connectAttr("defaultRenderGlobals.endFrame", "layer1.adjustments[1].plug")
+		cmds.setAttr("layer1.adjustments[1].value", 80)
+	edits = [
+		("camera frame range", lambda: cmds.setAttr(shapes[1] + ".endFrame", 40)),
+		("camera renderable", lambda: cmds.setAttr(shapes[2] + ".renderable", False)),
+		("render globals range", lambda: cmds.setAttr("defaultRenderGlobals.startFrame", 3)),
+		("resolution", lambda: cmds.setAttr("defaultResolution.width", 1280)),
+		("layer renderable", lambda: cmds.setAttr("layer3.renderable", False)),
+		("layer renderable again", lambda: cmds.setAttr("layer3.renderable", True)),
+		("removed override", lambda: cmds.disconnectAttr(shapes[0] + ".renderable", "layer2.adjustments[0].plug")),
+		("new camera", lambda: cmds.createNode("camera", name = "newCamShape", parent = cmds.createNode("transform", name = "newCam"))),
+		("frame range attribute", addFrameRange),
+		("deleted camera", lambda: cmds.delete("shotCam2")),
+		("new layer", addLayer),
+		("new override", addOverride),
+		("current layer", lambda: cmds.editRenderLayerGlobals(currentRenderLayer = "layer1")),
+		("renamed camera", lambda: cmds.rename("shotCam1", "heroCam")),
+		("new scene", lambda: (cmds.reset(), fakeCmds.buildRenderScene(cmds, 2, 2))),
+	]
+	try:
+		for name, edit in edits:
+			edit()
+			# Half the edits are picked up at idle, the other half when the snapshot is asked for.
+			if len(name) % 2:
+				cmds.runDeferred()
+			if index.getSnapshot() != batchAndSave.getSceneSnapshot():
+				raise RuntimeError("The scene index is out of date after a %s edit." % name)
+	finally:
+		index.close()
+		cmds.deferred = []
+
+def readRenderSpans(results):
+	# Returns the (start, end) times the stub renderer logged for each finished task.
+	spans = []
+	for result in results:
+		times = {}
+		logFile = open(result.logPath)
+		for line in logFile:
+			words = line.split()
+			if words and words[0] in ("start", "end"):
+				times[words[0]] = float(words[1])
+		logFile.close()
+		spans.append((times["start"], times["end"]))
+	return spans
+
+def checkRunner(directory):
+	# Runs a task manifest through renderRunner with the stub renderer. Raises if the renders don't run in parallel,
+	# if failed renders aren't retried and reported, or if --resume doesn't pick up exactly the missing frames.
+	# Returns the timing of the parallel run as a result.
+	runDirectory = tempfile.mkdtemp(prefix = "renderRunner", dir = directory)
+	scenePath = os.path.join(runDirectory, "shot_v001.ma")
+	naming = renderTasks.OutputNaming(os.path.join(runDirectory, "images"), "", 4, "iff", True, 1)
+	tasks = renderTasks.chunkTasks([renderTasks.makeTask(layer, camera, 1, 4) for layer in ("defaultRenderLayer", "bg") for camera in ("camA", "camB")], 2)
+	commands = renderTasks.getScriptCommands(renderTasks.SceneSnapshot([], 64, 64), scenePath, "render", runDirectory, tasks)
+	manifestPath = renderTasks.writeTaskManifest(os.path.join(runDirectory, "shot_v001.json"), tasks, commands, scenePath, 64, 64, naming)
+	renderer = '"%s" "%s" --manifest "%s" --seconds %g' % (sys.executable, STUB_RENDERER, manifestPath, RUNNER_FRAME_SECONDS)
+	def run(name, resume = False, retries = 0, options = ""):
+		runner = renderRunner.TaskRunner(renderRunner.readTasks(manifestPath, resume), RUNNER_WORKERS, 2, retries, os.path.join(runDirectory, name), renderer + options, Quiet())
+		return runner, runner.run()
+
+	# Every task renders, up to RUNNER_WORKERS at once, with the thread count passed on.
+	runner, results = run("parallel")
+	if len(results) != len(tasks) or [result for result in results if result.returnCode != 0]:
+		raise RuntimeError("The stub renders failed:\n" + runner.summary())
+	spans = readRenderSpans(results)
+	overlap = max(len([None for start, end in spans if start <= moment < end]) for moment, finish in spans)
+	if overlap < 2 or overlap > RUNNER_WORKERS:
+		raise RuntimeError("%d renders ran at once with %d workers." % (overlap, RUNNER_WORKERS))
+	for result in results:
+		if "threads 2" not in open(result.logPath).read():
+			raise RuntimeError("%s was not given -n 2." % result.id)
+	# Maya writes the default render layer's images under masterLayer.
+	if sorted(os.listdir(naming.imageDirectory)) != ["bg", "masterLayer"]:
+		raise RuntimeError("The images were written to %s." % ", ".join(sorted(os.listdir(naming.imageDirectory))))
+
+	# --resume renders only the frames whose images are missing.
+	if renderRunner.readTasks(manifestPath, True):
+		raise RuntimeError("--resume found frames to render after every frame was rendered.")
+	for layer, camera, frame in (("defaultRenderLayer", "camA", 2), ("bg", "camB", 3), ("bg", "camB", 4)):
+		os.remove(renderTasks.getImagePath(naming, renderTasks.expandPrefix(naming, "shot_v001", layer, camera, True, True), frame))
+	runner, results = run("resume", resume = True)
+	if sorted(result.id for result in results) != ["bg_camB_3_4", "defaultRenderLayer_camA_2_2"] or [result for result in results if result.returnCode != 0]:
+		raise RuntimeError("--resume rendered %s." % ", ".join(sorted(result.id for result in results)))
+	if renderRunner.readTasks(manifestPath, True):
+		raise RuntimeError("--resume left frames unrendered.")
+
+	# A failing layer keeps its exit code after every retry. A render that fails once succeeds on its retry.
+	runner, results = run("failing", retries = 1, options = " --seconds 0 --fail-layer bg --exit-code 7")
+	for result in results:
+		expected = (7, 2) if result.id.startswith("bg_") else (0, 1)
+		if (result.returnCode, result.attempts) != expected:
+			raise RuntimeError("%s exited %s after %d attempt(s), not %s after %d." % ((result.id, result.returnCode, result.attempts) + expected))
+	flakyDirectory = os.path.join(runDirectory, "flaky")
+	os.makedirs(flakyDirectory)
+	runner, results = run("flaky", retries = 1, options = ' --seconds 0 --flaky "%s"' % flakyDirectory)
+	if [result for result in results if (result.returnCode, result.attempts) != (0, 2)]:
+		raise RuntimeError("Renders that failed once were not retried:\n" + runner.summary())
+
+	seconds = max(end for start, end in spans) - min(start for start, end in spans)
+	return [{"case": "renderRunner %d tasks x %d workers" % (len(tasks), RUNNER_WORKERS), "median": seconds, "min": seconds, "calls": 0, "commands": {}}]
+
+def checkBake():
+	# Bakes a skinned rig of each kind. Raises unless the skinCluster keeps its bind joints, now keyed and out of the rig.
+	for options in ({}, {"highDensity": True}, {"lightweight": True}):
+		cmds.reset()
+		rig = flexoPlane2.RibbonSpine()
+		rig.createRibbonSpine("baked", 4, (0, 0, 0), (0, 10, 0), **options)
+		skin = cmds.createNode("skinCluster", name = "bakedSkin")
+		for index, joint in enumerate(rig.bindJoints):
+			cmds.connectAttr(joint + ".worldMatrix[0]", "%s.matrix[%d]" % (skin, index))
+		flexoPlane2.bakeRibbonSpines([rig])
+		influences = cmds.listConnections(skin, source = True, destination = False) or []
+		if sorted(influences) != sorted(rig.bindJoints) or cmds.ls("baked_MST_GRP"):
+			raise RuntimeError("bakeRibbonSpines %s left the skinCluster bound to %s." % (options, influences))
+		for joint in rig.bindJoints:
+			if cmds.listRelatives(joint, parent = True) != ["baked_BAKED_GRP"] or not cmds.keyframe(joint, query = True, keyframeCount = True):
+				raise RuntimeError("bakeRibbonSpines %s did not key %s under baked_BAKED_GRP." % (options, joint))
+			if cmds.listConnections(joint + ".offsetParentMatrix", source = True, destination = False):
+				raise RuntimeError("bakeRibbonSpines %s left %s driven by the rig." % (options, joint))
+
+def checkTemplate(directory):
+	# Builds the same rig directly and from a template. Raises unless the template rig keeps a scale of 1 and matches the direct build's lengths.
+	flexoPlane2.TEMPLATE_DIRECTORY = os.path.join(directory, "templates")
+	cmds.reset()
+	flexoPlane2.RibbonSpine().createRibbonSpine("direct", 4, (0, 0, 0), (0, 10, 0))
+	flexoPlane2.createRibbonSpines([("templated", (0, 0, 0), (0, 10, 0), 4)], useTemplates = True)
+	if cmds.getAttr("templated_MST_GRP.scale") != [(1.0, 1.0, 1.0)]:
+		raise RuntimeError("The template rig was scaled to %s at its _MST_GRP." % cmds.getAttr("templated_MST_GRP.scale"))
+	# Maya sizes a nonLinear handle to its geometry, which the fake has none of, so the twist handle's scale is left out.
+	for suffix in [each for each in flexoPlane2.SCALED_ATTRIBUTES if each != "_TWIST_DFMHandle.scale"]:
+		if cmds.getAttr("direct" + suffix) != cmds.getAttr("templated" + suffix):
+			raise RuntimeError("The template rig's %s is %s, not %s." % (suffix, cmds.getAttr("templated" + suffix), cmds.getAttr("direct" + suffix)))
+	
+	# A description written by another version of the rig makes the template again.
+	path = flexoPlane2.getRibbonTemplate(4)
+	descriptionPath = os.path.splitext(path)[0] + ".json"
+	description = json.load(open(descriptionPath))
+	description["graph"]["attributes"].popitem()
+	json.dump(description, open(descriptionPath, 'w'))
+	flexoPlane2._templates.clear()
+	flexoPlane2.getRibbonTemplate(4)
+	if not flexoPlane2.isTemplateCurrent(json.load(open(descriptionPath)), 4):
+		raise RuntimeError("getRibbonTemplate kept a template whose description is out of date.")
+
+def checkSelection(directory):
+	# Builds rigs directly and from templates. Raises unless the selection is the same afterwards.
+	flexoPlane2.TEMPLATE_DIRECTORY = os.path.join(directory, "templates")
+	cmds.reset()
+	selected = cmds.spaceLocator(name = "selected_LOC")[0]
+	cmds.select(selected)
+	for useTemplates in (False, True):
+		flexoPlane2.createRibbonSpines([("selection%d" % useTemplates, (0, 0, 0), (0, 10, 0), 4)], useTemplates = useTemplates)
+		if cmds.ls(selection = True) != [selected]:
+			raise RuntimeError("createRibbonSpines left %s selected." % cmds.ls(selection = True))
+
+def benchmarkRibbon(joints, repeat):
+	# Times RibbonSpine.createRibbonSpine() with the given number of joints.
+	state = {}
+	def setup():
+		cmds.reset()
+		state["rig"] = flexoPlane2.RibbonSpine()
+		state["rig"].createLocators()
+	median, minimum, calls = measure(setup, lambda: state["rig"].createRibbonSpine("bench", joints), repeat)
+	return [{"case": "createRibbonSpine %d joints" % joints, "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls}]
+
+def benchmarkBulkRibbons(rigs, joints, repeat):
+	# Times createRibbonSpines() building the given number of rigs in one call.
+	specs = [("bulk%d" % index, (index * 5.0, 0.0, 0.0), (index * 5.0, 10.0, 0.0), joints) for index in range(rigs)]
+	median, minimum, calls = measure(cmds.reset, lambda: flexoPlane2.createRibbonSpines(specs), repeat)
+	return [{"case": "createRibbonSpines %d x %d joints" % (rigs, joints), "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls}]
+
+def benchmarkTemplateRibbons(rigs, joints, repeat, directory):
+	# Times createRibbonSpines() importing the given number of rigs from an already cached template.
+	flexoPlane2.TEMPLATE_DIRECTORY = os.path.join(directory, "templates")
+	specs = [("tpl%d" % index, (index * 5.0, 0.0, 0.0), (index * 5.0, 10.0, 0.0), joints) for index in range(rigs)]
+	def setup():
+		cmds.reset()
+		flexoPlane2.getRibbonTemplate(joints)
+	median, minimum, calls = measure(setup, lambda: flexoPlane2.createRibbonSpines(specs, useTemplates = True), repeat)
+	return [{"case": "createRibbonSpines %d x %d templated" % (rigs, joints), "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls}]
+
+def benchmarkBake(rigs, joints, repeat):
+	# Times bakeRibbonSpines() on the given number of rigs, over the default 120 frame range.
+	specs = [("bake%d" % index, (index * 5.0, 0.0, 0.0), (index * 5.0, 10.0, 0.0), joints) for index in range(rigs)]
+	def setup():
+		cmds.reset()
+		flexoPlane2.createRibbonSpines(specs)
+	median, minimum, calls = measure(setup, lambda: flexoPlane2.bakeRibbonSpines([spec[0] for spec in specs], tolerance = 0.01), repeat)
+	return [{"case": "bakeRibbonSpines %d x %d joints" % (rigs, joints), "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls}]
+
+def benchmarkSolver(frames, joints, repeat):
+	# Times ribbonSolver.solveRibbon() over the given number of frames of animated controls.
+	phase = numpy.linspace(0, 10, frames)
+	top = numpy.stack([numpy.sin(phase), numpy.zeros(frames), numpy.cos(phase)], axis = 1)
+	median, minimum, calls = measure(lambda: None, lambda: ribbonSolver.solveRibbon(10.0, top, 0.0, -top, numpy.sin(phase) * 90, 0.0, joints = joints), repeat)
+	return [{"case": "solveRibbon %d frames x %d joints" % (frames, joints), "median": median, "min": minimum, "calls": 0, "commands": {}}]
+
+def benchmarkScaling(jointCounts, repeat):
+	# Times high density builds of increasing size. Returns the results and whether the time per joint stayed flat.
+	results = []
+	for joints in jointCounts:
+		median, minimum, calls = measure(cmds.reset, lambda: flexoPlane2.RibbonSpine().createRibbonSpine("dense", joints, (0, 0, 0), (0, 10, 0), highDensity = True, endDensity = 3.0), repeat)
+		results.append({"case": "highDensity %d joints" % joints, "joints": joints, "median": median, "min": minimum, "calls": sum(calls.values()), "commands": calls})
+	perJoint = [each["min"] / each["joints"] for each in results]
+	steps = all(later <= earlier * SCALING_TOLERANCE for earlier, later in zip(perJoint, perJoint[1:]))
+	return results, steps and max(perJoint) <= perJoint[0] * SCALING_TOLERANCE
+
+def formatScaling(results, linear):
+	# Returns the scaling results as a table of time and calls per joint.
+	lines = ["%-36s %12s %12s %14s" % ("case", "min ms", "us / joint", "calls / joint")]
+	for each in results:
+		lines.append("%-36s %12.2f %12.1f %14.2f" % (each["case"], each["min"] * 1000, each["min"] / each["joints"] * 1e6, float(each["calls"]) / each["joints"]))
+	lines.append("Build time grows %s with the joint count." % ("linearly" if linear else "FASTER THAN LINEARLY"))
+	return "\n".join(lines)
+
+def runBenchmarks(repeat = 3, quick = False):
+	# Runs every case and returns a list of result dictionaries.
+	layerCounts = LAYER_COUNTS[:2] if quick else LAYER_COUNTS
+	cameraCounts = CAMERA_COUNTS[:2] if quick else CAMERA_COUNTS
+	jointCounts = JOINT_COUNTS[:2] if quick else JOINT_COUNTS
+	directory = tempfile.mkdtemp(prefix = "mayaScriptsBenchmark")
+	results = []
+	# The scenes, images, logs, and templates are written here, and removed once the run ends, whether it passes or not.
+	try:
+		checks.runChecks()
+		checkIndex()
+		checkBake()
+		checkTemplate(directory)
+		checkSelection(directory)
+		results.extend(checkRunner(directory))
+		for layers in layerCounts:
+			for cameras in cameraCounts:
+				results.extend(benchmarkExport(layers, cameras, repeat, directory))
+				results.extend(benchmarkIndex(layers, cameras, repeat, directory))
+		for joints in jointCounts:
+			results.extend(benchmarkRibbon(joints, repeat))
+		for rigs in (BULK_RIG_COUNTS[:1] if quick else BULK_RIG_COUNTS):
+			results.extend(benchmarkBulkRibbons(rigs, 10, repeat))
+			results.extend(benchmarkTemplateRibbons(rigs, 10, repeat, directory))
+			results.extend(benchmarkBake(rigs, 10, repeat))
+		if ribbonSolver is not None:
+			for frames in (SOLVER_FRAME_COUNTS[:1] if quick else SOLVER_FRAME_COUNTS):
+				results.extend(benchmarkSolver(frames, 20, repeat))
+	finally:
+		shutil.rmtree(directory, ignore_errors = True)
+	return results
+
+def formatResults(results, baseline = None):
+	# Returns the results as a table, with the change from a baseline run if one is given.
+	previous = dict((each["case"], each) for each in (baseline or []))
+	lines = ["%-36s %12s %12s %10s %s" % ("case", "median ms", "min ms", "cmds calls", "vs. baseline" if baseline else "")]
+	for each in results:
+		change = ""
+		if each["case"] in previous:
+			before = previous[each["case"]]
+			change = "%+.1f%% time, %+d calls" % ((each["median"] / before["median"] - 1) * 100 if before["median"] else 0, each["calls"] - before["calls"])
+		lines.append("%-36s %12.2f %12.2f %10d %s" % (each["case"], each["median"] * 1000, each["min"] * 1000, each["calls"], change))
+	return "\n".join(lines)
+
+def main(arguments = None):
+	parser = argparse.ArgumentParser(description = "Benchmarks batchAndSave and RibbonSpine outside Maya.")
+	parser.add_argument("--repeat", type = int, default = 3, help = "Runs per case. The median is reported.")
+	parser.add_argument("--quick", action = "store_true", help = "Skip the largest cases.")
+	parser.add_argument("--json", default = None, help = "Save the results to this file.")
+	parser.add_argument("--compare", default = None, help = "Compare against results saved with --json.")
+	parser.add_argument("--profile", action = "store_true", help = "Print the cmds hot spots of every case.")
+	parser.add_argument("--scaling", action = "store_true", help = "Only check that high density RibbonSpine builds scale linearly.")
+	options = parser.parse_args(arguments)
+
+	global profileCases
+	profileCases = options.profile
+
+	if options.scaling:
+		results, linear = benchmarkScaling(SCALING_JOINT_COUNTS, options.repeat)
+		print (formatScaling(results, linear))
+		return 0 if linear else 1
+
+	results = runBenchmarks(options.repeat, options.quick)
+	baseline = None
+	if options.compare:
+		baseline = json.load(open(options.compare))["results"]
+	print ("Python %s on %s" % (platform.python_version(), platform.platform()))
+	print (formatResults(results, baseline))
+	print ("getLayers and exportScript cmds calls grow with the scene. A flat count would need OpenMaya and is out of scope.")
+	if options.json:
+		outputFile = open(options.json, 'w')
+		json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results}, outputFile, indent = 2)
+		outputFile.close()
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
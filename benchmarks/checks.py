@@ -0,0 +1,161 @@
+"""
+Checks the Maya-free parts of the scripts on small fixtures and plain arrays. Each check raises if its results are wrong:
+
+	python benchmarks/checks.py
+
+benchmark.py runs them too, before timing anything.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+
+import maReader
+import meshMirror
+import occlusionBaker
+import renderRunner
+import renderTasks
+import ribbonSolver
+
+# Small scenes written with the attribute names Maya itself writes.
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def checkMaReader():
+	# Reads renderLayers.ma, whose bg layer turns shotCam off and overrides the render globals end frame with "adjs" adjustments.
+	snapshot = maReader.readScene(os.path.join(FIXTURES, "renderLayers.ma"))
+	layers = dict((layer.name, [(camera.transform, camera.startFrame, camera.endFrame) for camera in layer.cameras]) for layer in snapshot.layers)
+	expected = {
+		"defaultRenderLayer": [("shotCam", 1, 24), ("wideCam", 5, 20), ("closeCam", 1, 24)],
+		"fg": [("shotCam", 1, 24), ("wideCam", 5, 20), ("closeCam", 1, 24)],
+		"bg": [("wideCam", 5, 20), ("closeCam", 1, 50)],
+	}
+	if [layer.name for layer in snapshot.layers] != ["defaultRenderLayer", "fg", "bg"]:
+		raise RuntimeError("maReader found the render layers %s." % [layer.name for layer in snapshot.layers])
+	for name in expected:
+		if layers[name] != expected[name]:
+			raise RuntimeError("maReader read %s's cameras as %s, not %s." % (name, layers[name], expected[name]))
+	if (snapshot.width, snapshot.height) != (1920, 1080):
+		raise RuntimeError("maReader read the resolution as %dx%d." % (snapshot.width, snapshot.height))
+
+def getFaceNormals(points, counts, connects):
+	# Returns each face's normal by Newell's method, unnormalized.
+	normals = []
+	start = 0
+	for count in counts:
+		face = points[connects[start:start + count]]
+		following = numpy.roll(face, -1, axis = 0)
+		normals.append(numpy.cross(face, following).sum(axis = 0))
+		start += count
+	return numpy.array(normals)
+
+def checkMirrorMesh():
+	# Mirrors a strip of four quads facing +Z across X. Its middle column sits further off the axis than the merge tolerance, so the cut has to be snapped.
+	xs = [-1.0, -0.5, 0.01, 0.5, 1.0]
+	points = [(x, y, 0.0) for y in (0.0, 1.0) for x in xs]
+	counts = [4] * 4
+	connects = [index for column in range(4) for index in (column, column + 1, column + 6, column + 5)]
+	points, counts, connects = meshMirror.mirrorMesh(points, counts, connects)
+
+	# The two right quads and their mirror images, sharing the two snapped seam vertices.
+	if len(points) != 10 or list(counts) != [4] * 4:
+		raise RuntimeError("mirrorMesh made %d points and faces of %s." % (len(points), counts.tolist()))
+	seam = points[numpy.abs(points[:, 0]) < 0.25]
+	if len(seam) != 2 or (seam[:, 0] != 0.0).any():
+		raise RuntimeError("mirrorMesh left the seam at %s." % seam.tolist())
+	if sorted(map(tuple, points)) != sorted(map(tuple, points * (-1, 1, 1))):
+		raise RuntimeError("mirrorMesh's points are not symmetric across X.")
+	if [len(set(connects[start:start + 4])) for start in range(0, len(connects), 4)] != [4] * 4:
+		raise RuntimeError("mirrorMesh merged vertices of the same face.")
+	normals = getFaceNormals(points, counts, connects)
+	if (normals[:, 2] <= 0).any() or numpy.abs(normals[:, :2]).max() > 1e-9:
+		raise RuntimeError("mirrorMesh's face normals are %s, not all +Z." % normals.tolist())
+
+def checkSolveRibbon():
+	# Solves a rig 10 units long at rest, stretched to twice its length, and twisted. Raises unless each pose is where the rig puts it.
+	distance, joints = 10.0, 5
+	zero = numpy.zeros((3, 3))
+	top = numpy.array([(0.0, 0.0, 0.0), (0.0, distance, 0.0), (0.0, 0.0, 0.0)])
+	pose = ribbonSolver.solveRibbon(distance, top, zero, zero, [0.0, 0.0, 90.0], [0.0, 0.0, 90.0], [1, 1, 1], joints = joints)
+	unstretched = ribbonSolver.solveRibbon(distance, top, zero, zero, enable = 0, joints = joints)
+
+	# At rest the joints sit at their follicle parameters along Y, facing +Z, at full volume.
+	heights = (ribbonSolver.getParameters(joints) - 0.5) * distance
+	if not numpy.allclose(pose.positions[0], numpy.stack([numpy.zeros(joints), heights, numpy.zeros(joints)], axis = -1)):
+		raise RuntimeError("solveRibbon put the rest pose's joints at %s." % pose.positions[0].tolist())
+	if not numpy.allclose(pose.matrices[0], [[(0.0, 1.0, 0.0), (-1.0, 0.0, 0.0), (0.0, 0.0, 1.0)]] * joints):
+		raise RuntimeError("solveRibbon's rest pose axes are %s." % pose.matrices[0, 0].tolist())
+	if not numpy.allclose(pose.scales[0], 1.0):
+		raise RuntimeError("solveRibbon scaled the rest pose to %s." % pose.scales[0].tolist())
+
+	# Twice the length halves the volume in Y and Z, unless squash and stretch is off.
+	if not numpy.allclose(pose.scales[1], [(1.0, 0.5, 0.5)] * joints) or not numpy.allclose(unstretched.scales[1], 1.0):
+		raise RuntimeError("solveRibbon scaled the stretched pose to %s, or %s with stretch off." % (pose.scales[1, 0].tolist(), unstretched.scales[1, 0].tolist()))
+
+	# A 90 degree twist at both ends turns every joint about Y, in place.
+	if not numpy.allclose(pose.positions[2], pose.positions[0]) or not numpy.allclose(pose.matrices[2, :, 2], [(-1.0, 0.0, 0.0)] * joints):
+		raise RuntimeError("solveRibbon twisted the joints' Z axes to %s." % pose.matrices[2, :, 2].tolist())
+	identity = numpy.einsum("fjab,fjcb->fjac", pose.matrices, pose.matrices)
+	if not numpy.allclose(identity, numpy.eye(3)):
+		raise RuntimeError("solveRibbon returned matrices that are not orthonormal.")
+
+def checkOcclusion():
+	# Casts random rays at random triangles. Raises unless the BVH finds the same hits as testing every triangle,
+	# a pool of workers bakes the same occlusion as one process, and a mesh without triangles is fully open.
+	random = numpy.random.RandomState(1)
+	vertices = random.uniform(-1, 1, (300, 3))
+	triangles = numpy.arange(300).reshape(-1, 3)
+	origins = random.uniform(-1.5, 1.5, (2000, 3))
+	directions = random.normal(size = (2000, 3))
+	for leafSize in (1, 8):
+		bvh = occlusionBaker.buildBVH(vertices, triangles, leafSize)
+		for maxDistance in (numpy.inf, 0.5):
+			expected = numpy.zeros(len(origins), dtype = bool)
+			for v0, v1, v2 in vertices[triangles]:
+				corner = numpy.broadcast_to(v0, origins.shape)
+				expected |= occlusionBaker.intersectTriangles(origins, directions, corner, numpy.broadcast_to(v1 - v0, origins.shape), numpy.broadcast_to(v2 - v0, origins.shape), maxDistance)
+			occluded = occlusionBaker.findOccluded(bvh, origins, directions, maxDistance)
+			if not expected.any() or (occluded != expected).any():
+				raise RuntimeError("The BVH with leaves of %d missed or added %d of %d hits within %g." % (leafSize, (occluded != expected).sum(), expected.sum(), maxDistance))
+
+	normals = random.normal(size = (len(vertices), 3))
+	serial = occlusionBaker.bakeOcclusion(vertices, triangles, normals, 16, processes = 1, chunkSize = 64)
+	pooled = occlusionBaker.bakeOcclusion(vertices, triangles, normals, 16, processes = 2, chunkSize = 64)
+	if not numpy.array_equal(serial, pooled):
+		raise RuntimeError("Baking in a pool of workers gave different occlusion than baking in one process.")
+	empty = occlusionBaker.bakeOcclusion(vertices, numpy.zeros((0, 3), dtype = int), normals, 4, processes = 1)
+	if not (empty == 1.0).all():
+		raise RuntimeError("A mesh without triangles baked to %s, not fully open." % empty[:4].tolist())
+
+def checkRenderCommands():
+	# Raises unless task IDs are safe file names and renderRunner splits commands the way the shell does,
+	# with " -" inside a quoted renderer path and scene path.
+	taskId = renderTasks.makeTask("fg", "rig:shotCam|shotCamShape", 1, 10).id
+	if taskId != "fg_rig_shotCam_shotCamShape_1_10":
+		raise RuntimeError("makeTask made the task ID %r." % taskId)
+	command = renderRunner.prepareCommand('"/opt/maya -2024/bin/render" -r file -rl fg -s 1 -e 10 "/shots/shot -a/shot_v001.ma"', 4)
+	expected = ["/opt/maya -2024/bin/render", "-n", "4", "-r", "file", "-rl", "fg", "-s", "1", "-e", "10", "/shots/shot -a/shot_v001.ma"]
+	if renderRunner.splitCommand(command) != (expected[0], expected[1:]):
+		raise RuntimeError("prepareCommand made the command %r." % command)
+	command = renderRunner.prepareCommand("render -n 2 shot.ma", 4, "python stubRenderer.py --seconds 0")
+	if command != "python stubRenderer.py --seconds 0 -n 2 shot.ma":
+		raise RuntimeError("prepareCommand made the command %r." % command)
+
+# Every check, in the order they run.
+CHECKS = (checkMaReader, checkMirrorMesh, checkSolveRibbon, checkOcclusion, checkRenderCommands)
+
+def runChecks():
+	# Runs every check. Raises on the first failure.
+	for check in CHECKS:
+		check()
+
+def main():
+	for check in CHECKS:
+		check()
+		print ("%s passed." % check.__name__)
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
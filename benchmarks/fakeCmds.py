@@ -0,0 +1,679 @@
+"""
+An in-memory stand-in for maya.cmds, so batchAndSave and flexoPlane2 can be run and measured outside Maya.
+Nodes, attributes, connections, and hierarchy live in dictionaries. Calls are counted by cmdsProfiler, not here.
+
+	import fakeCmds
+	cmds = fakeCmds.install()
+	import batchAndSave
+"""
+
+import fnmatch
+import json
+import math
+import re
+import sys
+import types
+
+# Shape node types. createNode on these also creates a parent transform, like Maya does.
+SHAPE_TYPES = ("camera", "follicle", "locator", "mesh", "nurbsCurve", "nurbsSurface", "clusterHandle", "deformTwist", "distanceDimShape")
+
+# Attribute values of a node that were never set.
+DEFAULT_ATTRIBUTES = {
+	"transform": {"translate": (0.0, 0.0, 0.0), "rotate": (0.0, 0.0, 0.0), "scale": (1.0, 1.0, 1.0), "visibility": True},
+	"joint": {"translate": (0.0, 0.0, 0.0), "rotate": (0.0, 0.0, 0.0), "scale": (1.0, 1.0, 1.0), "visibility": True},
+	"camera": {"renderable": True},
+	"renderLayer": {"renderable": True},
+	"renderGlobals": {"startFrame": 1.0, "endFrame": 10.0, "imageFilePrefix": "", "extensionPadding": 1, "imageFormat": 7, "imfPluginKey": "", "putFrameBeforeExt": True, "periodInExt": 1},
+	"resolution": {"width": 640, "height": 480},
+	"follicle": {"parameterU": 0.0, "parameterV": 0.0},
+}
+
+ELEMENT_PATTERN = re.compile(r"\[\d+\]")
+
+class FakeCmds(object):
+	# Behaves like the maya.cmds module. Unknown commands raise AttributeError rather than silently passing.
+
+	def __init__(self):
+		# scriptJobs outlive scenes, like Maya's. jobTargets maps (kind, event or plug) to {job: function}.
+		self.jobs = {}
+		self.jobTargets = {}
+		self.nextJob = 1
+		self.deferred = []
+		self.reset()
+
+	# Empties the scene and recreates Maya's default nodes.
+	def reset(self):
+		self.nodes = {}
+		self.nameNumbers = {}
+		self.order = []
+		self.outgoing = {}
+		self.incoming = {}
+		self.selection = []
+		self.currentRenderLayer = "defaultRenderLayer"
+		self.sceneName = "/tmp/untitled_v001.ma"
+		self.modified = False
+		self.workspacePath = "/tmp/"
+		self.playbackRange = (1.0, 120.0)
+		for name, nodeType in (("defaultRenderGlobals", "renderGlobals"), ("defaultResolution", "resolution"), ("renderLayerManager", "renderLayerManager"), ("defaultRenderLayer", "renderLayer")):
+			self.addNode(name, nodeType)
+		self.connect("renderLayerManager.renderLayerId[0]", "defaultRenderLayer.identification")
+		self.trigger("event", "NewSceneOpened")
+
+	# Runs the scriptJobs registered for an event, or for a change to a plug or node.
+	def trigger(self, kind, target):
+		if not self.jobTargets:
+			return
+		for function in list(self.jobTargets.get((kind, target), {}).values()):
+			function()
+
+	# Runs the functions queued by evalDeferred, the way Maya does once it is idle.
+	def runDeferred(self):
+		while self.deferred:
+			self.deferred.pop(0)()
+
+	# -- Scene storage -------------------------------------------------------------------------
+
+	def uniqueName(self, name):
+		# Returns name, or name with a number appended or incremented, whichever is free.
+		name = name.split("|")[-1]
+		if name not in self.nodes:
+			return name
+		match = re.match(r"^(.*?)(\d*)$", name)
+		base, number = match.group(1), int(match.group(2) or 0)
+		# Start after the last number handed out for this base, so creating many nodes stays linear.
+		number = max(number, self.nameNumbers.get(base, 0)) + 1
+		while "%s%d" % (base, number) in self.nodes:
+			number += 1
+		self.nameNumbers[base] = number
+		return "%s%d" % (base, number)
+
+	def addNode(self, name, nodeType, parent = None):
+		name = self.uniqueName(name)
+		self.nodes[name] = {"type": nodeType, "parent": parent, "children": [], "attrs": {}}
+		self.order.append(name)
+		if parent:
+			self.nodes[parent]["children"].append(name)
+		self.modified = True
+		if nodeType in SHAPE_TYPES or nodeType in ("transform", "joint"):
+			self.trigger("event", "DagObjectCreated")
+		elif nodeType == "renderLayer":
+			self.trigger("event", "renderLayerChange")
+		return name
+
+	def addShape(self, nodeType, name = None, parent = None):
+		# Creates a shape under a transform, creating the transform too if needed. Returns (transform, shape).
+		if parent is None:
+			parent = self.addNode(nodeType + "1", "transform")
+		shape = self.addNode(name or parent + "Shape", nodeType, parent)
+		return parent, shape
+
+	def node(self, name):
+		name = str(name).split(".")[0].split("|")[-1].lstrip(":")
+		if name not in self.nodes:
+			raise ValueError("No object matches name: %s" % name)
+		return name
+
+	def split(self, plug):
+		node, attribute = plug.split(".", 1)
+		return self.node(node), attribute
+
+	def removeNode(self, name):
+		if name not in self.nodes:
+			return
+		for child in list(self.nodes[name]["children"]):
+			self.removeNode(child)
+		parent = self.nodes[name]["parent"]
+		if parent in self.nodes:
+			self.nodes[parent]["children"].remove(name)
+		for source, destination in list(self.outgoing.get(name, [])) + list(self.incoming.get(name, [])):
+			self.disconnect(source, destination)
+		self.outgoing.pop(name, None)
+		self.incoming.pop(name, None)
+		del self.nodes[name]
+		self.order.remove(name)
+		if name in self.selection:
+			self.selection.remove(name)
+		self.trigger("nodeDeleted", name)
+
+	def connect(self, source, destination):
+		sourceNode, sourceAttribute = self.split(source)
+		destinationNode, destinationAttribute = self.split(destination)
+		for existing in self.incoming.get(destinationNode, []):
+			if existing[1] == destinationNode + "." + destinationAttribute:
+				raise RuntimeError("%s is already connected." % destination)
+		pair = (sourceNode + "." + sourceAttribute, destinationNode + "." + destinationAttribute)
+		self.outgoing.setdefault(sourceNode, []).append(pair)
+		self.incoming.setdefault(destinationNode, []).append(pair)
+		for plug in pair:
+			self.trigger("connectionChange", plug)
+
+	def disconnect(self, source, destination):
+		pair = (source, destination)
+		sourceNode = source.split(".", 1)[0]
+		destinationNode = destination.split(".", 1)[0]
+		if pair in self.outgoing.get(sourceNode, []):
+			self.outgoing[sourceNode].remove(pair)
+		if pair in self.incoming.get(destinationNode, []):
+			self.incoming[destinationNode].remove(pair)
+		for plug in pair:
+			self.trigger("connectionChange", plug)
+
+	def attributeExists(self, node, attribute):
+		attrs = self.nodes[node]["attrs"]
+		if attribute in attrs:
+			return True
+		defaults = DEFAULT_ATTRIBUTES.get(self.nodes[node]["type"], {})
+		return ELEMENT_PATTERN.sub("", attribute) in defaults or attribute.rstrip("XYZ") in defaults
+
+	def value(self, node, attribute):
+		attrs = self.nodes[node]["attrs"]
+		if attribute in attrs:
+			return attrs[attribute]
+		defaults = DEFAULT_ATTRIBUTES.get(self.nodes[node]["type"], {})
+		if attribute in defaults:
+			return defaults[attribute]
+		if attribute[:-1] in ("translate", "rotate", "scale") and attribute[-1] in "XYZ":
+			return self.value(node, attribute[:-1])["XYZ".index(attribute[-1])]
+		return 0
+
+	def setValue(self, node, attribute, value):
+		if attribute[:-1] in ("translate", "rotate", "scale") and attribute[-1] in "XYZ":
+			vector = list(self.value(node, attribute[:-1]))
+			vector["XYZ".index(attribute[-1])] = value
+			value = tuple(vector)
+			attribute = attribute[:-1]
+		self.nodes[node]["attrs"][attribute] = value
+		self.modified = True
+		self.trigger("attributeChange", node + "." + attribute)
+
+	def objects(self, args):
+		# Flattens command arguments into a list of node or plug names.
+		names = []
+		for each in args:
+			if isinstance(each, (list, tuple)):
+				names.extend(self.objects(each))
+			elif each is not None:
+				names.append(str(each))
+		return names
+
+	# -- Commands ------------------------------------------------------------------------------
+
+	def about(self, os = False, batch = False, **kwargs):
+		if os:
+			return "linux64"
+		if batch:
+			return True
+		return ""
+
+	def addAttr(self, node, longName = None, attributeType = None, defaultValue = 0, **kwargs):
+		node = self.node(node)
+		self.nodes[node]["attrs"][longName] = defaultValue
+		self.modified = True
+		self.trigger("attributeAdded", node + "." + longName)
+
+	def arclen(self, curve, constructionHistory = False):
+		shape = self.shapeOf(self.node(curve))
+		points = self.nodes[shape]["attrs"].get("points", [])
+		length = sum(math.sqrt(sum((b[i] - a[i]) ** 2 for i in range(3))) for a, b in zip(points, points[1:]))
+		info = self.addNode("curveInfo1", "curveInfo")
+		self.nodes[info]["attrs"]["arcLength"] = length
+		self.connect(shape + ".worldSpace[0]", info + ".inputCurve")
+		return info
+
+	def attributeQuery(self, attribute, node = None, exists = False):
+		return self.attributeExists(self.node(node), attribute)
+
+	def bakeResults(self, *args, **kwargs):
+		# Keys every attribute on every frame, replacing whatever drove it.
+		startFrame, endFrame = kwargs["time"]
+		keys = int(endFrame - startFrame) + 1
+		for node in [self.node(name) for name in self.objects(args)]:
+			for attribute in kwargs.get("attribute", []):
+				plug = node + "." + attribute
+				for pair in [pair for pair in self.incoming.get(node, []) if pair[1] == plug]:
+					self.disconnect(*pair)
+				curve = self.addNode("%s_%s" % (node, attribute), "animCurve")
+				self.nodes[curve]["attrs"]["keyCount"] = keys
+				self.connect(curve + ".output", plug)
+
+	def blendShape(self, *args, **kwargs):
+		deformer = self.addNode(kwargs.get("name", "blendShape1"), "blendShape")
+		return [deformer]
+
+	def cluster(self, *args, **kwargs):
+		name = kwargs.get("name", "cluster1")
+		deformer = self.addNode(name, "cluster")
+		handle = self.addShape("clusterHandle", name = deformer + "HandleShape", parent = self.addNode(deformer + "Handle", "transform"))[0]
+		self.selection = [handle]
+		return [deformer, handle]
+
+	def connectAttr(self, source, destination, force = False, **kwargs):
+		if force:
+			destinationNode, destinationAttribute = self.split(destination)
+			for pair in list(self.incoming.get(destinationNode, [])):
+				if pair[1] == destinationNode + "." + destinationAttribute:
+					self.disconnect(*pair)
+		self.connect(source, destination)
+
+	def disconnectAttr(self, source, destination, **kwargs):
+		self.disconnect(source, destination)
+
+	def copyKey(self, *args, **kwargs):
+		# Copies the key counts of the animated attributes to the clipboard.
+		self.clipboard = []
+		for node in [self.node(name) for name in self.objects(args)]:
+			for source, destination in self.incoming.get(node, []):
+				curve = source.split(".", 1)[0]
+				if self.nodes[curve]["type"] == "animCurve":
+					self.clipboard.append((destination.split(".", 1)[1], self.nodes[curve]["attrs"]["keyCount"]))
+		return len(self.clipboard)
+
+	def createNode(self, nodeType, name = None, parent = None, skipSelect = False, **kwargs):
+		if nodeType in SHAPE_TYPES:
+			return self.addShape(nodeType, name = name or nodeType + "Shape1", parent = self.node(parent) if parent else None)[1]
+		return self.addNode(name or nodeType + "1", nodeType, self.node(parent) if parent else None)
+
+	def curve(self, degree = 1, point = (), name = "curve1", **kwargs):
+		transform = self.addNode(name, "transform")
+		shape = self.addNode(transform + "Shape", "nurbsCurve", transform)
+		self.nodes[shape]["attrs"]["points"] = [tuple(each) for each in point]
+		self.selection = [transform]
+		return transform
+
+	def delete(self, *args, **kwargs):
+		if kwargs.get("constructionHistory") or kwargs.get("ch"):
+			return
+		for name in self.objects(args):
+			if name.split(".")[0].split("|")[-1] in self.nodes:
+				self.removeNode(self.node(name))
+
+	def distanceDimension(self, sp = (0, 0, 0), ep = (0, 0, 0)):
+		transform, shape = self.addShape("distanceDimShape", parent = self.addNode("distanceDimension1", "transform"))
+		self.nodes[shape]["attrs"]["distance"] = math.sqrt(sum((ep[i] - sp[i]) ** 2 for i in range(3)))
+		return shape
+
+	def duplicate(self, node, name = None, **kwargs):
+		source = self.node(node)
+		copy = self.addNode(name or source, self.nodes[source]["type"], self.nodes[source]["parent"])
+		self.nodes[copy]["attrs"] = dict(self.nodes[source]["attrs"])
+		for child in self.nodes[source]["children"]:
+			shape = self.addNode(copy + "Shape", self.nodes[child]["type"], copy)
+			self.nodes[shape]["attrs"] = dict(self.nodes[child]["attrs"])
+		self.selection = [copy]
+		return [copy]
+
+	def editRenderLayerGlobals(self, query = False, currentRenderLayer = None, **kwargs):
+		if query:
+			return self.currentRenderLayer
+		self.currentRenderLayer = self.node(currentRenderLayer)
+		self.trigger("event", "renderLayerManagerChange")
+
+	def file(self, *args, **kwargs):
+		if kwargs.get("query") or kwargs.get("q"):
+			if kwargs.get("modified"):
+				return self.modified
+			if kwargs.get("shortName"):
+				return self.sceneName.rsplit("/", 1)[-1]
+			return self.sceneName
+		if kwargs.get("exportSelected"):
+			self.exportNodes(args[0], self.selection)
+		elif kwargs.get("i") or kwargs.get("import"):
+			self.importNodes(args[0])
+		elif "rename" in kwargs:
+			self.sceneName = kwargs["rename"]
+		elif kwargs.get("save"):
+			open(self.sceneName, 'w').close()
+			self.modified = False
+		elif "modified" in kwargs:
+			self.modified = kwargs["modified"]
+
+	def exportNodes(self, path, names):
+		# Writes nodes and the connections between them as JSON, standing in for a Maya ASCII export.
+		nodes = set(names)
+		connections = [pair for name in names for pair in self.outgoing.get(name, []) if pair[1].split(".", 1)[0] in nodes]
+		exportFile = open(path, 'w')
+		json.dump({"nodes": [[name, self.nodes[name]] for name in names], "connections": connections}, exportFile)
+		exportFile.close()
+
+	def importNodes(self, path):
+		# Reads a file written by exportNodes, renaming nodes whose names are taken.
+		importFile = open(path)
+		data = json.load(importFile)
+		importFile.close()
+		names = {}
+		for name, node in data["nodes"]:
+			names[name] = self.addNode(name, node["type"])
+			self.nodes[names[name]]["attrs"] = dict(node["attrs"])
+		for name, node in data["nodes"]:
+			if node["parent"]:
+				self.reparent(names[name], names.get(node["parent"], node["parent"]))
+		rename = lambda plug: names[plug.split(".", 1)[0]] + "." + plug.split(".", 1)[1]
+		for source, destination in data["connections"]:
+			self.connect(rename(source), rename(destination))
+
+	def evalDeferred(self, function, **kwargs):
+		self.deferred.append(function)
+
+	def filterCurve(self, *args, **kwargs):
+		# Without values to compare, assume every other key can go.
+		for curve in self.objects(args):
+			attrs = self.nodes[self.node(curve)]["attrs"]
+			attrs["keyCount"] = max(2, (attrs["keyCount"] + 1) // 2)
+
+	def getAttr(self, plug, **kwargs):
+		node, attribute = self.split(plug)
+		value = self.value(node, attribute)
+		if isinstance(value, tuple):
+			return [value]
+		return value
+
+	def group(self, *args, **kwargs):
+		parent = self.node(kwargs["parent"]) if kwargs.get("parent") else None
+		group = self.addNode(kwargs.get("name", "group1"), "transform", parent)
+		for child in self.objects(args):
+			self.reparent(self.node(child), group)
+		self.selection = [group]
+		return group
+
+	def joint(self, name = "joint1", **kwargs):
+		parent = None
+		if self.selection and self.nodes[self.selection[-1]]["type"] == "joint":
+			parent = self.selection[-1]
+		joint = self.addNode(name, "joint", parent)
+		self.selection = [joint]
+		return joint
+
+	def keyframe(self, *args, **kwargs):
+		curves = [name for name in (self.listConnections(*args, source = True, destination = False) or []) if self.nodes[name]["type"] == "animCurve"]
+		return sum(self.nodes[curve]["attrs"]["keyCount"] for curve in curves)
+
+	def listConnections(self, *args, **kwargs):
+		source = kwargs.get("source", True)
+		destination = kwargs.get("destination", True)
+		plugs = kwargs.get("plugs", False)
+		connections = kwargs.get("connections", False)
+		result = []
+		for name in self.objects(args):
+			if "." in name:
+				node, attribute = self.split(name)
+				prefix = node + "." + attribute
+			else:
+				node = self.node(name)
+				prefix = None
+			pairs = []
+			if source:
+				pairs += [(pair[1], pair[0]) for pair in self.incoming.get(node, [])]
+			if destination:
+				pairs += [(pair[0], pair[1]) for pair in self.outgoing.get(node, [])]
+			for local, other in pairs:
+				if prefix and not (local == prefix or local.startswith(prefix + "[") or local.startswith(prefix + ".")):
+					continue
+				if kwargs.get("type") and not self.nodes[other.split(".", 1)[0]]["type"].startswith(kwargs["type"]):
+					continue
+				if connections:
+					result.append(local)
+				result.append(other if plugs else other.split(".", 1)[0])
+		return result or None
+
+	def listRelatives(self, *args, **kwargs):
+		result = []
+		for name in self.objects(args):
+			node = self.node(name)
+			if kwargs.get("parent"):
+				if self.nodes[node]["parent"]:
+					result.append(self.nodes[node]["parent"])
+			else:
+				result.extend(self.nodes[node]["children"])
+		if kwargs.get("type"):
+			result = [each for each in result if self.nodes[each]["type"] == kwargs["type"]]
+		return result or None
+
+	def ls(self, *args, **kwargs):
+		names = self.objects(args)
+		if names:
+			result = []
+			for name in names:
+				if "." in name:
+					nodeName = name.split(".", 1)[0]
+					if nodeName in self.nodes and self.attributeExists(nodeName, name.split(".", 1)[1]):
+						result.append(name)
+				elif "*" in name:
+					result.extend(fnmatch.filter(self.order, name))
+				elif name in self.nodes:
+					result.append(name)
+			if kwargs.get("type"):
+				result = [name for name in result if self.nodes.get(name, {}).get("type") == kwargs["type"]]
+			return result
+		if kwargs.get("cameras"):
+			return [name for name in self.order if self.nodes[name]["type"] == "camera"]
+		if kwargs.get("type"):
+			return [name for name in self.order if self.nodes[name]["type"] == kwargs["type"]]
+		if kwargs.get("selection") or kwargs.get("sl"):
+			return list(self.selection)
+		return list(self.order)
+
+	def makeIdentity(self, *args, **kwargs):
+		pass
+
+	def move(self, *args, **kwargs):
+		values = [each for each in args if isinstance(each, (int, float))]
+		for name in self.objects([each for each in args if not isinstance(each, (int, float))]):
+			if "." in name:
+				continue
+			self.setValue(self.node(name), "translate", tuple(float(each) for each in values[:3]))
+
+	def nonLinear(self, *args, **kwargs):
+		name = kwargs.get("name", "twist1")
+		deformer = self.addNode(name, "nonLinear")
+		handle = self.addNode(deformer + "Handle", "transform")
+		self.addNode(deformer + "HandleShape", "deformTwist", handle)
+		self.selection = [handle]
+		return [deformer, handle]
+
+	def nurbsPlane(self, name = "nurbsPlane1", **kwargs):
+		transform = self.addNode(name, "transform")
+		self.addNode(transform + "Shape", "nurbsSurface", transform)
+		history = self.addNode("makeNurbPlane1", "makeNurbPlane")
+		return [transform, history]
+
+	def nodeType(self, node):
+		return self.nodes[self.node(node)]["type"]
+
+	def objExists(self, name):
+		if "." in name:
+			node = name.split(".", 1)[0]
+			return node in self.nodes and self.attributeExists(node, name.split(".", 1)[1])
+		return name.split("|")[-1] in self.nodes
+
+	def parent(self, *args, **kwargs):
+		names = self.objects(args)
+		target = self.node(names[-1]) if not kwargs.get("world") else None
+		children = names if kwargs.get("world") else names[:-1]
+		for child in children:
+			self.reparent(self.node(child), target)
+		return [self.node(child) for child in children]
+
+	def reparent(self, child, parent):
+		previous = self.nodes[child]["parent"]
+		if previous:
+			self.nodes[previous]["children"].remove(child)
+		self.nodes[child]["parent"] = parent
+		if parent:
+			self.nodes[parent]["children"].append(child)
+
+	def constraint(self, nodeType, args, kwargs):
+		names = self.objects(args)
+		target = self.node(names[-1])
+		constraint = self.addNode("%s_%s1" % (target, nodeType), nodeType, target)
+		for driver in names[:-1]:
+			self.connect(self.node(driver) + ".worldMatrix[0]", constraint + ".target[%d].targetParentMatrix" % names.index(driver))
+		return [constraint]
+
+	def parentConstraint(self, *args, **kwargs):
+		return self.constraint("parentConstraint", args, kwargs)
+
+	def pointConstraint(self, *args, **kwargs):
+		return self.constraint("pointConstraint", args, kwargs)
+
+	def pasteKey(self, *args, **kwargs):
+		# Gives each node a new curve per copied attribute, replacing whatever drove it.
+		for node in [self.node(name) for name in self.objects(args)]:
+			for attribute, keys in getattr(self, "clipboard", []):
+				plug = node + "." + attribute
+				for pair in [pair for pair in self.incoming.get(node, []) if pair[1] == plug]:
+					self.disconnect(*pair)
+				curve = self.addNode("%s_%s" % (node, attribute), "animCurve")
+				self.nodes[curve]["attrs"]["keyCount"] = keys
+				self.connect(curve + ".output", plug)
+		return len(getattr(self, "clipboard", []))
+
+	def percent(self, *args, **kwargs):
+		pass
+
+	def playbackOptions(self, query = False, minTime = False, maxTime = False, **kwargs):
+		return self.playbackRange[0] if minTime else self.playbackRange[1]
+
+	def pickWalk(self, node, direction = "up"):
+		name = self.node(node)
+		return [self.nodes[name]["parent"] or name]
+
+	def refresh(self, *args, **kwargs):
+		pass
+
+	def rename(self, node, name):
+		old = self.node(node)
+		new = self.uniqueName(name)
+		self.nodes[new] = self.nodes.pop(old)
+		self.order[self.order.index(old)] = new
+		parent = self.nodes[new]["parent"]
+		if parent:
+			children = self.nodes[parent]["children"]
+			children[children.index(old)] = new
+		for child in self.nodes[new]["children"]:
+			self.nodes[child]["parent"] = new
+		# Rewrite the connections on both ends.
+		rename = lambda plug: new + plug[len(old):] if plug.split(".", 1)[0] == old else plug
+		for table in (self.outgoing, self.incoming):
+			if old in table:
+				table[new] = table.pop(old)
+		for node in set([new] + [pair[1].split(".", 1)[0] for pair in self.outgoing.get(new, [])] + [pair[0].split(".", 1)[0] for pair in self.incoming.get(new, [])]):
+			for table in (self.outgoing, self.incoming):
+				if node in table:
+					table[node] = [(rename(source), rename(destination)) for source, destination in table[node]]
+		self.selection = [new if each == old else each for each in self.selection]
+		self.trigger("event", "NameChanged")
+		return new
+
+	def rotate(self, *args, **kwargs):
+		values = [each for each in args if isinstance(each, (int, float))]
+		for name in self.objects([each for each in args if not isinstance(each, (int, float))]):
+			self.setValue(self.node(name), "rotate", tuple(float(each) for each in values[:3]))
+
+	def scale(self, *args, **kwargs):
+		values = [each for each in args if isinstance(each, (int, float))]
+		for name in self.objects([each for each in args if not isinstance(each, (int, float))]):
+			self.setValue(self.node(name), "scale", tuple(float(each) for each in values[:3]))
+
+	def scriptJob(self, **kwargs):
+		# Supports the event, plug, and node jobs SceneIndex registers. parent is accepted and ignored, as there is no UI.
+		if "exists" in kwargs:
+			return kwargs["exists"] in self.jobs
+		if "kill" in kwargs:
+			key = self.jobs.pop(kwargs["kill"])
+			del self.jobTargets[key][kwargs["kill"]]
+			return
+		for kind in ("event", "attributeChange", "connectionChange", "attributeAdded", "attributeDeleted", "nodeDeleted", "uiDeleted"):
+			if kind in kwargs:
+				target, function = kwargs[kind]
+				job = self.nextJob
+				self.nextJob += 1
+				self.jobs[job] = (kind, target)
+				self.jobTargets.setdefault((kind, target), {})[job] = function
+				return job
+		raise TypeError("Unsupported scriptJob flags: %s" % sorted(kwargs))
+
+	def select(self, *args, **kwargs):
+		if kwargs.get("clear"):
+			self.selection = []
+			return
+		names = [self.node(name) for name in self.objects(args)]
+		if kwargs.get("add"):
+			self.selection.extend(names)
+		else:
+			self.selection = names
+
+	def setAttr(self, plug, *values, **kwargs):
+		node, attribute = self.split(plug)
+		self.setValue(node, attribute, values[0] if len(values) == 1 else tuple(values))
+
+	def shapeOf(self, node):
+		children = self.nodes[node]["children"]
+		return children[0] if children else node
+
+	def spaceLocator(self, name = "locator1", **kwargs):
+		transform = self.addNode(name, "transform")
+		self.addNode(transform + "Shape", "locator", transform)
+		return [transform]
+
+	def undoInfo(self, *args, **kwargs):
+		pass
+
+	def warning(self, message):
+		sys.stderr.write("# Warning: %s\n" % message)
+
+	def wire(self, *args, **kwargs):
+		curve = self.node(kwargs["wire"])
+		deformer = self.addNode(kwargs.get("name", "wire1"), "wire")
+		base = self.addNode(curve + "BaseWire", "transform")
+		self.addNode(base + "Shape", "nurbsCurve", base)
+		return [deformer]
+
+	def xform(self, node, query = False, translation = False, **kwargs):
+		return list(self.value(self.node(node), "translate"))
+
+	def workspace(self, *args, **kwargs):
+		if kwargs.get("fullName"):
+			return self.workspacePath.rstrip("/")
+		if kwargs.get("fileRuleEntry"):
+			return "images"
+		if kwargs.get("expandName"):
+			return self.workspacePath + kwargs["expandName"]
+		return self.workspacePath
+
+def install():
+	# Registers a fresh FakeCmds as maya.cmds and returns it. Modules importing maya.cmds afterwards get the fake.
+	cmds = FakeCmds()
+	maya = sys.modules.get("maya")
+	if maya is None or not getattr(maya, "__fake__", False):
+		maya = types.ModuleType("maya")
+		maya.__fake__ = True
+		maya.__path__ = []
+		sys.modules["maya"] = maya
+	utils = types.ModuleType("maya.utils")
+	utils.executeDeferred = lambda function, *args, **kwargs: function(*args, **kwargs)
+	maya.cmds = cmds
+	maya.utils = utils
+	sys.modules["maya.cmds"] = cmds
+	sys.modules["maya.utils"] = utils
+	return cmds
+
+def buildRenderScene(cmds, layers = 1, cameras = 1, startFrame = 1, endFrame = 100):
+	# Fills the scene with render layers and cameras with frame range attributes.
+	# Every other layer overrides the renderable flag of its first camera, so adjustments are exercised.
+	shapes = []
+	for index in range(cameras):
+		shape = cmds.createNode("camera", name = "shotCamShape%d" % (index + 1), parent = cmds.createNode("transform", name = "shotCam%d" % (index + 1)))
+		cmds.addAttr(shape, longName = "startFrame", attributeType = "long")
+		cmds.addAttr(shape, longName = "endFrame", attributeType = "long")
+		cmds.setAttr(shape + ".startFrame", startFrame)
+		cmds.setAttr(shape + ".endFrame", endFrame)
+		shapes.append(shape)
+	for index in range(layers):
+		layer = cmds.createNode("renderLayer", name = "layer%d" % (index + 1))
+		cmds.connectAttr("renderLayerManager.renderLayerId[%d]" % (index + 1), layer + ".identification")
+		if index % 2:
+			cmds.connectAttr(shapes[0] + ".renderable", layer + ".adjustments[0].plug")
+			cmds.setAttr(layer + ".adjustments[0].value", False)
+	cmds.setAttr("defaultResolution.width", 1920)
+	cmds.setAttr("defaultResolution.height", 1080)
+	return shapes
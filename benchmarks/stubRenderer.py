@@ -0,0 +1,74 @@
+"""
+Stands in for Maya's Render command, so renderRunner can be checked without Maya, e.g.:
+
+	python renderRunner.py shot_v001.json --renderer "python benchmarks/stubRenderer.py --manifest shot_v001.json"
+
+It sleeps for every frame of its -s/-e range and writes a small file where the manifest's output naming expects each image.
+It prints when it starts and finishes, so the per-task logs show which renders ran at the same time.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import renderTasks
+
+def writeImages(manifestPath, layer, camera, startFrame, endFrame):
+	# Writes a file for each frame's image, named the way resumeTasks looks for it.
+	manifest = renderTasks.readTaskManifest(manifestPath)
+	naming = manifest.get("output")
+	if naming is None:
+		return
+	multipleLayers, multipleCameras = manifest["layout"] or renderTasks.getOutputLayout(manifest["tasks"])
+	sceneName = os.path.splitext(os.path.basename(manifest["scene"]))[0]
+	prefix = renderTasks.expandPrefix(naming, sceneName, layer, camera, multipleLayers, multipleCameras)
+	for frame in range(startFrame, endFrame + 1):
+		path = renderTasks.getImagePath(naming, prefix, frame)
+		if not os.path.isdir(os.path.dirname(path)):
+			try:
+				os.makedirs(os.path.dirname(path))
+			except OSError:
+				# Another render made the directory first.
+				pass
+		imageFile = open(path, 'w')
+		imageFile.write("%s %s %d\n" % (layer, camera, frame))
+		imageFile.close()
+
+def main(arguments = None):
+	parser = argparse.ArgumentParser(description = "Pretends to render the frames of one render command.")
+	parser.add_argument("--manifest", default = None, help = "Task manifest whose output naming places the images.")
+	parser.add_argument("--seconds", type = float, default = 0.05, help = "Seconds each frame takes.")
+	parser.add_argument("--fail-layer", default = None, help = "Fail every render of this layer.")
+	parser.add_argument("--flaky", default = None, help = "Directory of markers. The first attempt at each frame range fails.")
+	parser.add_argument("--exit-code", type = int, default = 3, help = "Exit code of a failed render.")
+	parser.add_argument("-n", dest = "threads", type = int, default = 0)
+	parser.add_argument("-rl", dest = "layer", default = "defaultRenderLayer")
+	parser.add_argument("-cam", dest = "camera", default = "persp")
+	parser.add_argument("-s", dest = "startFrame", type = float, default = 1)
+	parser.add_argument("-e", dest = "endFrame", type = float, default = 1)
+	# Flags the stub has no use for, such as -proj, -x, and -y, and the scene path are ignored.
+	options = parser.parse_known_args(arguments)[0]
+	startFrame, endFrame = int(options.startFrame), int(options.endFrame)
+
+	print ("start %.6f layer %s camera %s frames %d-%d threads %d" % (time.time(), options.layer, options.camera, startFrame, endFrame, options.threads))
+	sys.stdout.flush()
+	if options.fail_layer == options.layer:
+		print ("error: layer %s always fails" % options.layer)
+		return options.exit_code
+	if options.flaky:
+		marker = os.path.join(options.flaky, "%s_%s_%d_%d" % (options.layer, options.camera, startFrame, endFrame))
+		if not os.path.exists(marker):
+			open(marker, 'w').close()
+			print ("error: first attempt fails")
+			return options.exit_code
+	time.sleep(options.seconds * (endFrame - startFrame + 1))
+	if options.manifest:
+		writeImages(options.manifest, options.layer, options.camera, startFrame, endFrame)
+	print ("end %.6f" % time.time())
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
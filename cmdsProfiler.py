@@ -0,0 +1,140 @@
+"""
+Records how many maya.cmds calls batchAndSave and RibbonSpine make, how long they take, and which functions make them.
+This is the only cmds wrapper in the repository; the benchmarks count calls with it too.
+
+	import cmdsProfiler
+	with cmdsProfiler.CmdsProfiler() as profiler:
+		batchAndSave.exportScript()
+	print (profiler.report())
+	profiler.writeChromeTrace("/tmp/exportScript.json")
+
+	with cmdsProfiler.CmdsProfiler(trace = False, callers = False) as counter:
+		batchAndSave.getSceneSnapshot()
+	print (counter.getCounts())
+
+The trace opens in chrome://tracing or Perfetto.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# The modules profiled by default, when they have already been imported.
+DEFAULT_MODULES = ("batchAndSave", "flexoPlane2")
+
+# The most precise clock available.
+timer = getattr(time, "perf_counter", time.time)
+
+def getCaller(frame):
+	# Returns "module.function", or "module.Class.method" for methods, for a stack frame.
+	module = frame.f_globals.get("__name__", "?")
+	code = frame.f_code
+	instance = frame.f_locals.get("self") if code.co_argcount and code.co_varnames[0] == "self" else None
+	if instance is not None:
+		return "%s.%s.%s" % (module, type(instance).__name__, code.co_name)
+	return "%s.%s" % (module, code.co_name)
+
+class _ProfiledCmds(object):
+	# Stands in for maya.cmds inside a profiled module and times every command called through it.
+
+	def __init__(self, module, profiler):
+		self._module = module
+		self._profiler = profiler
+
+	def __getattr__(self, name):
+		command = getattr(self._module, name)
+		if not callable(command):
+			return command
+		profiler = self._profiler
+		def profiled(*args, **kwargs):
+			caller = getCaller(sys._getframe(1)) if profiler.callers is not None else None
+			start = timer()
+			try:
+				return command(*args, **kwargs)
+			finally:
+				profiler.record(name, caller, start, timer())
+		return profiled
+
+class CmdsProfiler(object):
+	# Swaps the cmds module used by the profiled modules for a timing proxy while active.
+
+	# With callers off only the commands are recorded, which keeps the cost of counting down.
+	def __init__(self, modules = None, trace = True, callers = True):
+		if modules is None:
+			modules = [sys.modules[name] for name in DEFAULT_MODULES if name in sys.modules]
+		self.modules = list(modules)
+		self.trace = trace
+		self.commands = {}
+		self.callers = {} if callers else None
+		self.events = []
+		self.lock = threading.Lock()
+		self.originals = {}
+
+	def __enter__(self):
+		self.start = timer()
+		for module in self.modules:
+			self.originals[module] = module.cmds
+			module.cmds = _ProfiledCmds(module.cmds, self)
+		return self
+
+	def __exit__(self, *args):
+		for module, original in self.originals.items():
+			module.cmds = original
+		self.originals = {}
+		self.wallTime = timer() - self.start
+
+	# Adds one command call to the totals.
+	def record(self, command, caller, start, end):
+		duration = end - start
+		with self.lock:
+			for table, key in ((self.commands, command), (self.callers, caller)):
+				if table is None:
+					continue
+				entry = table.get(key)
+				if entry is None:
+					entry = table[key] = [0, 0.0]
+				entry[0] += 1
+				entry[1] += duration
+			if self.trace:
+				self.events.append((command, caller, start, duration, threading.current_thread().ident))
+
+	# Returns a dictionary of {command: calls}.
+	def getCounts(self):
+		return dict((command, entry[0]) for command, entry in self.commands.items())
+
+	# Returns the total number of cmds calls recorded.
+	def totalCalls(self):
+		return sum(entry[0] for entry in self.commands.values())
+
+	# Returns the hot-spot tables, slowest first, for commands and for the functions that called them.
+	def report(self, limit = 20):
+		totalTime = sum(entry[1] for entry in self.commands.values()) or 1e-9
+		lines = []
+		for title, table in (("cmds command", self.commands), ("calling function", self.callers)):
+			if table is None:
+				continue
+			lines.append("%-50s %8s %10s %10s %6s" % (title, "calls", "total ms", "mean us", "%"))
+			for key, (count, seconds) in sorted(table.items(), key = lambda item: -item[1][1])[:limit]:
+				lines.append("%-50s %8d %10.2f %10.1f %5.1f%%" % (key, count, seconds * 1000, seconds / count * 1e6, seconds / totalTime * 100))
+			lines.append("")
+		wallTime = getattr(self, "wallTime", timer() - self.start)
+		lines.append("%d cmds calls, %.2f ms inside cmds, %.2f ms wall." % (self.totalCalls(), totalTime * 1000, wallTime * 1000))
+		return "\n".join(lines)
+
+	# Writes the recorded calls as a Chrome trace, one complete event per cmds call.
+	def writeChromeTrace(self, path):
+		events = []
+		for command, caller, start, duration, thread in self.events:
+			events.append({"name": command, "cat": caller, "ph": "X", "ts": (start - self.start) * 1e6, "dur": duration * 1e6, "pid": os.getpid(), "tid": thread, "args": {"caller": caller}})
+		traceFile = open(path, 'w')
+		json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, traceFile)
+		traceFile.close()
+		return path
+
+def profile(function, *args, **kwargs):
+	# Calls function under a profiler covering the default modules. Returns (result, profiler).
+	with CmdsProfiler() as profiler:
+		result = function(*args, **kwargs)
+	return result, profiler
@@ -1,10 +1,64 @@
 import maya.cmds as cmds
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+
+# In high density mode the plane gets at most this many patches, however many joints ride on it.
+HIGH_DENSITY_PATCHES = 64
+
+# Dependency nodes a rig names after itself outside its _MST_GRP hierarchy. bakeRibbonSpines() deletes them.
+RIG_NODE_SUFFIXES = ("_DFM", "_TWIST_DFM", "_WIRE", "_TOP_CLS", "_MID_CLS", "_BOT_CLS", "_STRETCH_DIV", "_VOL_DIV", "_STRETCH_COND", "_UVPIN")
+
+# Where cached rig templates are kept, and the placeholder name they are built under.
+TEMPLATE_DIRECTORY = os.getenv("RIBBON_TEMPLATE_CACHE") or os.path.join(os.path.expanduser("~"), ".ribbonSpineTemplates")
+TEMPLATE_NAME = "RIBBON_SPINE_TEMPLATE"
+
+# The wire deformer's dropoff distance, in scene units.
+WIRE_DROPOFF = 20
+
+# The rig's geometry, by name suffix. A template is built one unit long, so createFromTemplate() scales their points by the rig's length.
+SCALED_SHAPES = ("_GEO", "_BLND", "_WIRE_CRV", "_WIRE_CRVBaseWire", "_TOP_CTRL", "_MID_CTRL", "_BOTTOM_CTRL", "_MASTER_CTRL")
+# The attributes that hold a length, by node suffix. createFromTemplate() scales them the same way.
+SCALED_ATTRIBUTES = ("_BLND.translate", "_TWIST_DFMHandle.translate", "_TWIST_DFMHandle.scale", "_STRETCH_DIV.input2X",
+	"_TOP_CLSHandleShape.origin", "_MID_CLSHandleShape.origin", "_BOT_CLSHandleShape.origin",
+	"_TOP_CLSHandle.rotatePivot", "_TOP_CLSHandle.scalePivot", "_MID_CLSHandle.rotatePivot", "_MID_CLSHandle.scalePivot", "_BOT_CLSHandle.rotatePivot", "_BOT_CLSHandle.scalePivot")
+
+# The channels bakeRibbonSpines() keys on each bind joint.
+BAKED_ATTRIBUTES = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+IDENTITY_MATRIX = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+# The bind joint attributes a rig drives. bakeRibbonSpines() disconnects them.
+DRIVEN_ATTRIBUTES = ("translate", "rotate", "scale", "offsetParentMatrix")
+
+# Returns the U parameter of each follicle, one per joint, from the bottom of the plane to the top.
+# An endDensity above 1 packs joints closer together near the ends: the spacing at the ends is
+# endDensity times tighter than in the middle. Each parameter is computed directly, so nothing drifts.
+def getFollicleParameters(joints, endDensity = 1.0):
+	bias = (endDensity - 1.0) / (endDensity + 1.0)
+	parameters = []
+	for index in range(joints):
+		t = (index + 0.5) / joints
+		parameters.append(t - bias * math.sin(2 * math.pi * t) / (2 * math.pi))
+	return parameters
 
 class RibbonSpine(object):
 	
-	def createRibbonSpine(self, name = "ribbonSpine", joints = 5):
+	# Builds the rig between the top and bottom locators, or between start and end positions when given.
+	# highDensity is for ribbons with hundreds or thousands of joints. The plane's patch count is capped,
+	# and each joint is driven by its follicle's world matrix through its offsetParentMatrix instead of a constraint (Maya 2020 and later).
+	# lightweight replaces the follicles and constraints with a single uvPin node, whose output matrices
+	# drive the joints' offsetParentMatrix (Maya 2020 and later). It can be combined with highDensity.
+	def createRibbonSpine(self, name = "ribbonSpine", joints = 5, start = None, end = None, highDensity = False, endDensity = 1.0, lightweight = False):
 		self.name = name
 		self.joints = joints
+		self.start = start
+		self.end = end
+		self.highDensity = highDensity
+		self.endDensity = endDensity
+		self.lightweight = lightweight
+		self.patches = min(joints, HIGH_DENSITY_PATCHES) if highDensity else joints
 		
 		# Creates a hierarchy of groups to store our rig.
 		self.masterGroup = cmds.group (name = "%s_MST_GRP" % self.name, empty = True)
@@ -13,22 +67,28 @@ class RibbonSpine(object):
 		
 		# Create a NURBS plane that matches the distance between the two locators.
 		self.plane = self.createPlane()
-		self.blendOffset = (self.distance * (1.0 / self.joints)) * 2
+		self.blendOffset = (self.distance * (1.0 / self.patches)) * 2
 		
 		# Duplicate the plane, shift it sideways, and apply it as a blend shape to the original.
 		self.planeBlend = self.createPlaneBlend()
 		self.planeBlendDeformer = cmds.blendShape (self.planeBlend, self.plane, weight = (0, 1), name = self.name +"_DFM")
 		
 		# Place a follicle on each patch on the original plane. Then parent joints beneath the follicles.
-		self.follicles = self.createFollicles()
-		self.bindJoints = self.createJoints()
+		# The lightweight rig samples the plane with one uvPin node instead.
+		if self.lightweight:
+			self.follicles = []
+			self.pin = self.createPin()
+			self.bindJoints = self.createPinnedJoints()
+		else:
+			self.follicles = self.createFollicles()
+			self.bindJoints = self.createJoints()
 		
 		# Set up joints and curves as controls.
 		self.controlCurves = self.createControlCurves()
 		
 		# Apply a wire deformer to the blend shape.
 		self.wireDeformerCurve = cmds.curve(degree = 2, point = [(self.blendOffset, (self.distance/2) * -1, 0), (self.blendOffset, 0, 0), (self.blendOffset, (self.distance/2),0 )], name = "%s_WIRE_CRV" % self.name)
-		self.planeWireDeformer = cmds.wire(self.planeBlend, wire = self.wireDeformerCurve, groupWithBase = False, envelope = 1.0, crossingEffect = 0, localInfluence = 0, dropoffDistance = [0, 20])
+		self.planeWireDeformer = cmds.wire(self.planeBlend, wire = self.wireDeformerCurve, name = "%s_WIRE" % self.name, groupWithBase = False, envelope = 1.0, crossingEffect = 0, localInfluence = 0, dropoffDistance = [0, WIRE_DROPOFF])
 		
 		# Apply clusters to the wire deformer and connect them to the control curves.
 		self.clusterDeformers = self.createClusterDeformers()
@@ -51,12 +111,48 @@ class RibbonSpine(object):
 		self.hideObject(self.wireDeformerCurve)
 		self.hideObject("%sBaseWire" % str(self.wireDeformerCurve))
 		
+		# Without locators, move the rig halfway between the start and end positions.
+		if self.start is not None:
+			cmds.move((self.start[0] + self.end[0]) / 2.0, (self.start[1] + self.end[1]) / 2.0, (self.start[2] + self.end[2]) / 2.0, masterControlGroup)
+			return
+		
 		# Constrain the plane to the locators. Then delete the constraint and the locators.
 		constraint = cmds.pointConstraint(self.locators[0], self.locators[1], masterControlGroup)
 		cmds.delete(constraint)
 		for locator in self.locators:
 			cmds.delete(locator)
 	
+	# Builds the rig by importing the cached template for its joint count and options, making the template first if needed.
+	# The template is built at a length of 1. Its points and lengths are scaled to the real distance, so every transform keeps a scale of 1, as in a direct build.
+	def createFromTemplate(self, name = "ribbonSpine", joints = 5, start = None, end = None, **options):
+		if start is None:
+			start = cmds.xform(self.locators[0], query = True, worldSpace = True, translation = True)
+			end = cmds.xform(self.locators[1], query = True, worldSpace = True, translation = True)
+			cmds.delete(self.locators)
+		self.name = name
+		self.joints = joints
+		self.start = start
+		self.end = end
+		self.distance = math.sqrt(sum((end[axis] - start[axis]) ** 2 for axis in range(3)))
+		graph = importRibbonTemplate(name, getRibbonTemplate(joints, **options))
+		
+		# Only the geometry, the lengths listed in the template's description, and the placement depend on the distance.
+		# The wire dropoff is already in scene units, as in a direct build.
+		cmds.scale(self.distance, self.distance, self.distance, graph["components"], pivot = (0, 0, 0), relative = True)
+		for plug, value in graph["attributes"].items():
+			if isinstance(value, list):
+				cmds.setAttr(plug, *[each * self.distance for each in value])
+			else:
+				cmds.setAttr(plug, value * self.distance)
+		cmds.setAttr("%s_MST_CTRL_GRP.translate" % name, *[(start[axis] + end[axis]) / 2.0 for axis in range(3)])
+		
+		self.masterGroup = "%s_MST_GRP" % name
+		self.moveGroup = "%s_MOVE_GRP" % name
+		self.noMoveGroup = "%s_NOMOVE_GRP" % name
+		self.masterControlCurve = "%s_MASTER_CTRL" % name
+		self.plane = "%s_GEO" % name
+		self.bindJoints = ["%s_BIND_JNT_%d" % (name, index) for index in range(joints)]
+	
 	# Creates a top and bottom locators, which should be placed at the top and bottom of the prospective ribbon spine.
 	def createLocators(self):
 		locator1 = cmds.spaceLocator (name = "bottomSpine_LOC")
@@ -67,14 +163,17 @@ class RibbonSpine(object):
 	
 	# Creates a NURBS plane equal in length to the distance between the two locators.
 	def createPlane(self):
-		# First we find the distance between the two locators.
-		t1 = cmds.getAttr ("%s.translate" % self.locators[0][0])
-		t2 = cmds.getAttr ("%s.translate" % self.locators[1][0])
-		distMeasure = cmds.distanceDimension (sp = (t1[0][0], t1[0][1], t1[0][2]), ep = (t2[0][0], t2[0][1], t2[0][2]))
-		self.distance = cmds.getAttr ("%s.distance" % distMeasure)
-		cmds.delete (cmds.pickWalk (distMeasure, direction = "up"))
+		# First we find the distance between the two locators, or the start and end positions.
+		if self.start is not None:
+			self.distance = math.sqrt(sum((self.end[axis] - self.start[axis]) ** 2 for axis in range(3)))
+		else:
+			t1 = cmds.getAttr ("%s.translate" % self.locators[0][0])
+			t2 = cmds.getAttr ("%s.translate" % self.locators[1][0])
+			distMeasure = cmds.distanceDimension (sp = (t1[0][0], t1[0][1], t1[0][2]), ep = (t2[0][0], t2[0][1], t2[0][2]))
+			self.distance = cmds.getAttr ("%s.distance" % distMeasure)
+			cmds.delete (cmds.pickWalk (distMeasure, direction = "up"))
 		# Then we create a plane, freeze its transforms, and delete its construction history.
-		plane = cmds.nurbsPlane (name = self.name +"_GEO", width = self.distance, lengthRatio = (1.0 / self.joints), patchesU = self.joints, axis = (0, 0, 1))
+		plane = cmds.nurbsPlane (name = self.name +"_GEO", width = self.distance, lengthRatio = (1.0 / self.patches), patchesU = self.patches, axis = (0, 0, 1))
 		cmds.rotate(0, 0, 90, plane[0])
 		cmds.makeIdentity (plane[0], apply = True, translate = True, rotate = True, scale = True)
 		cmds.delete (plane, constructionHistory = True)
@@ -87,53 +186,77 @@ class RibbonSpine(object):
 		cmds.move (self.blendOffset, 0, 0, planeBlend[0])
 		return planeBlend[0]
 	
-	# Places a follicle in each span of the NURBS plane. Returns the follicles in a list.
+	# Places a follicle for each joint along the NURBS plane, at the center of each span unless endDensity is set.
+	# Returns the follicles in a list.
 	def createFollicles(self):
 		follicles = []
 		planeShape = cmds.listRelatives(self.plane)[0]
-		# Finds the center of each NURBS span.
-		interval = 1.0 / self.joints
-		current_interval = 0
-		spans = []
-		# Loops through the intervals to distribute the follicles evenly.
-		while current_interval <= 1.0:
-			spans.append(current_interval)
-			print str(current_interval) +" += "+ str(interval)
-			current_interval += interval
-			# Inaccurate floats would stop the loop prematurely, so added this condition to break it.
-			if current_interval >= 1:
-				spans.append(1.0)
-				continue
+		parameters = getFollicleParameters(self.joints, self.endDensity)
 		
 		# Places the follicles and connects them to the NURBS plane.
 		group = cmds.group (name = self.name +"_FOL_GRP", empty = True);
+		follicleTransforms = []
 		for fol in range(self.joints):
-			follicle = cmds.createNode("follicle", name = "%s_FOL_%s" % (self.name, str(fol)))
+			follicle = cmds.createNode("follicle", name = "%s_FOL_%s" % (self.name, str(fol)), skipSelect = True)
 			follicleTransform = cmds.listRelatives(follicle, parent = True)
 			cmds.connectAttr("%s.outRotate" % follicle, follicleTransform[0] +".rotate")
 			cmds.connectAttr("%s.outTranslate" % follicle, follicleTransform[0] +".translate")
 			cmds.connectAttr("%s.local" % planeShape, follicle +".inputSurface")
 			cmds.connectAttr("%s.worldMatrix" % planeShape, follicle +".inputWorldMatrix")
-			cmds.setAttr("%s.parameterU" % follicle, (spans[fol] + spans[fol + 1]) / 2)
+			cmds.setAttr("%s.parameterU" % follicle, parameters[fol])
 			cmds.setAttr("%s.parameterV" % follicle, 0.5)
-			cmds.parent(follicleTransform, group, relative=True)
+			follicleTransforms.append(follicleTransform[0])
 			follicles.append(follicle)
+		# Parent all the follicles in one call.
+		cmds.parent(follicleTransforms, group, relative=True)
+		self.follicleTransforms = follicleTransforms
 		self.hideObject(group)
 		self.parentObject(group, self.noMoveGroup)
 		return follicles
 		
 	# Creates bind joints and constrains and parents them to each follicle.
+	# In high density mode the follicles' world matrices drive the joints' offsetParentMatrix instead, with no constraints.
 	def createJoints(self):
 		joints = []
 		group = cmds.group(name = "%sBIND_JNT_GRP" % self.name, empty = True)
-		for follicle in self.follicles:
-			cmds.select (clear = True)
-			follicleTransform = cmds.listRelatives(follicle, parent = True)
-			joint = cmds.joint (name = "%s_BIND_JNT_%s" % (self.name, str(self.follicles.index(follicle))))
+		if self.highDensity:
+			# The matrices are already in world space, so the group must not add its own transform.
+			cmds.setAttr("%s.inheritsTransform" % group, 0)
+			for index, follicleTransform in enumerate(self.follicleTransforms):
+				joint = cmds.createNode ("joint", name = "%s_BIND_JNT_%s" % (self.name, str(index)), parent = group, skipSelect = True)
+				cmds.connectAttr("%s.worldMatrix[0]" % follicleTransform, joint +".offsetParentMatrix")
+				joints.append(joint)
+			self.parentObject(group, self.noMoveGroup)
+			return joints
+		for index, follicleTransform in enumerate(self.follicleTransforms):
+			# createNode leaves the selection alone, unlike joint, which parents to whatever joint is selected.
+			joint = cmds.createNode ("joint", name = "%s_BIND_JNT_%s" % (self.name, str(index)), skipSelect = True)
 			constraint = cmds.parentConstraint (follicleTransform, joint, weight = 1)
 			joints.append(joint)			
-		for jnt in joints:
-			self.parentObject(jnt, group)
+		self.parentObject(joints, group)
+		self.parentObject(group, self.noMoveGroup)
+		return joints
+			
+	# Creates a uvPin node with one coordinate per joint on the NURBS plane. Returns the node.
+	def createPin(self):
+		planeShape = cmds.listRelatives(self.plane)[0]
+		pin = cmds.createNode("uvPin", name = "%s_UVPIN" % self.name, skipSelect = True)
+		cmds.connectAttr("%s.worldSpace[0]" % planeShape, pin +".deformedGeometry")
+		# Match the follicles' orientation: X along the plane, Z along its normal.
+		cmds.setAttr("%s.normalAxis" % pin, 2)
+		cmds.setAttr("%s.tangentAxis" % pin, 0)
+		for index, parameter in enumerate(getFollicleParameters(self.joints, self.endDensity)):
+			cmds.setAttr("%s.coordinate[%d]" % (pin, index), parameter, 0.5, type = "double2")
+		return pin
+	
+	# Creates bind joints driven by the uvPin output matrices through their offsetParentMatrix.
+	def createPinnedJoints(self):
+		joints = []
+		group = cmds.group(name = "%sBIND_JNT_GRP" % self.name, empty = True)
+		for index in range(self.joints):
+			joint = cmds.createNode ("joint", name = "%s_BIND_JNT_%s" % (self.name, str(index)), parent = group, skipSelect = True)
+			cmds.connectAttr("%s.outputMatrix[%d]" % (self.pin, index), joint +".offsetParentMatrix")
+			joints.append(joint)
 		self.parentObject(group, self.noMoveGroup)
 		return joints
 			
@@ -165,7 +288,7 @@ class RibbonSpine(object):
 		
 	# Returns square control curves with the specified name.
 	def createControlCurve(self, name):
-		span = (self.distance * (1.0 / self.joints)) * 0.5
+		span = (self.distance * (1.0 / self.patches)) * 0.5
 		curve = cmds.curve(degree = 1, point = [(span, 0, span), (span * -1,0, span), (span * -1, 0, span * -1), (span, 0, span * -1), (span, 0, span)], name = name)
 		cmds.setAttr("%s.overrideEnabled" % curve, 1)
 		cmds.setAttr("%s.overrideColor" % curve, 17)
@@ -235,10 +358,18 @@ class RibbonSpine(object):
 		# Check to ensure that scaling is on.
 		stretchConditionNode = cmds.createNode("condition", name = "%s_STRETCH_COND" % self.name)
 		cmds.connectAttr("%s.enable" % str(self.masterControlCurve),  "%s.firstTerm" % str(stretchConditionNode))
-		cmds.connectAttr("%s.outputX" % str(volumeDivideNode), "%s.colorIfTrue.colorIfTrueR" % str(stretchConditionNode))
 		cmds.setAttr("%s.secondTerm" % str(stretchConditionNode), 1)
 		
 		# If so, scale the joints in Y and Z.
+		# The lightweight rig outputs (1, volume, volume) and drives each joint's whole scale with one connection.
+		if self.lightweight:
+			cmds.setAttr("%s.colorIfTrueR" % str(stretchConditionNode), 1)
+			cmds.connectAttr("%s.outputX" % str(volumeDivideNode), "%s.colorIfTrue.colorIfTrueG" % str(stretchConditionNode))
+			cmds.connectAttr("%s.outputX" % str(volumeDivideNode), "%s.colorIfTrue.colorIfTrueB" % str(stretchConditionNode))
+			for joint in self.bindJoints:
+				cmds.connectAttr("%s.outColor" % str(stretchConditionNode), "%s.scale" % joint)
+			return
+		cmds.connectAttr("%s.outputX" % str(volumeDivideNode), "%s.colorIfTrue.colorIfTrueR" % str(stretchConditionNode))
 		for joint in self.bindJoints:
 			cmds.connectAttr("%s.outColorR" % str(stretchConditionNode), "%s.scaleY" % joint)
 			cmds.connectAttr("%s.outColorR" % str(stretchConditionNode), "%s.scaleZ" % joint)
@@ -249,4 +380,241 @@ class RibbonSpine(object):
 		
 	# Simple helper function to hide visibility.
 	def hideObject(self, object):
-		cmds.setAttr("%s.visibility" % str(object), 0)
\ No newline at end of file
+		cmds.setAttr("%s.visibility" % str(object), 0)
+
+# Builds many ribbon spines as one undoable step, with the viewport refresh suspended.
+# group, curve, cluster, nonLinear, and duplicate all select what they make, so the selection is put back once the batch is done.
+# Each spec is (name, start, end, joints). Options such as highDensity are passed on to every rig.
+# With useTemplates, rigs are imported from the template cache instead of being built step by step.
+# Returns the rigs, each with its buildTime in seconds.
+def createRibbonSpines(specs, useTemplates = False, **options):
+	rigs = []
+	selection = cmds.ls(selection = True, long = True) or []
+	cmds.undoInfo(openChunk = True, chunkName = "createRibbonSpines")
+	cmds.refresh(suspend = True)
+	try:
+		for name, start, end, joints in specs:
+			rig = RibbonSpine()
+			begin = time.time()
+			if useTemplates:
+				rig.createFromTemplate(name, joints, start, end, **options)
+			else:
+				rig.createRibbonSpine(name, joints, start, end, **options)
+			rig.buildTime = time.time() - begin
+			rigs.append(rig)
+	finally:
+		# Anything selected that the build deleted is left out.
+		selection = cmds.ls(selection, long = True) if selection else []
+		if selection:
+			cmds.select(selection, replace = True, noExpand = True)
+		else:
+			cmds.select(clear = True)
+		cmds.refresh(suspend = False)
+		cmds.undoInfo(closeChunk = True)
+	return rigs
+	
+# Returns a table of build times, per rig and per joint, to check that throughput scales linearly.
+def reportBuildTimes(rigs):
+	lines = ["%-30s %8s %12s %12s" % ("rig", "joints", "build ms", "ms / joint")]
+	for rig in rigs:
+		lines.append("%-30s %8d %12.2f %12.3f" % (rig.name, rig.joints, rig.buildTime * 1000, rig.buildTime * 1000 / rig.joints))
+	total = sum(rig.buildTime for rig in rigs)
+	joints = sum(rig.joints for rig in rigs) or 1
+	lines.append("%d rigs, %d joints, %.2f ms total, %.3f ms / joint" % (len(rigs), joints, total * 1000, total * 1000 / joints))
+	return "\n".join(lines)
+
+# Builds a test rig with the given options and counts the DG nodes and connections it adds, then deletes it.
+# Returns a dictionary with the totals and the per-joint figures, for budgeting evaluation cost.
+def measureRibbonGraph(joints = 20, **options):
+	before = set(cmds.ls())
+	rig = RibbonSpine()
+	rig.createRibbonSpine("graphReport", joints, (0, 0, 0), (0, 10, 0), **options)
+	nodes = [node for node in cmds.ls() if node not in before]
+	# Every connection into a rig node, counted once from its destination side.
+	connections = len(cmds.listConnections(nodes, source = True, destination = False, connections = True, plugs = True) or []) // 2
+	cmds.delete(nodes)
+	return {"joints": joints, "nodes": len(nodes), "connections": connections, "nodesPerJoint": float(len(nodes)) / joints, "connectionsPerJoint": float(connections) / joints}
+	
+# Returns a table comparing the graph of the standard, high density, and lightweight builds.
+def reportRibbonGraphs(joints = 20):
+	lines = ["%-24s %8s %8s %12s %12s %12s" % ("build", "joints", "nodes", "connections", "nodes / jnt", "conns / jnt")]
+	for label, options in (("standard", {}), ("highDensity", {"highDensity": True}), ("lightweight", {"lightweight": True})):
+		graph = measureRibbonGraph(joints, **options)
+		lines.append("%-24s %8d %8d %12d %12.2f %12.2f" % (label, joints, graph["nodes"], graph["connections"], graph["nodesPerJoint"], graph["connectionsPerJoint"]))
+	return "\n".join(lines)
+
+# Bakes the bind joints of one or more ribbon spines, given as names or RibbonSpine objects, to keys and removes the rigs.
+# Every joint of every rig is sampled in one pass over the timeline. A tolerance above 0 simplifies the baked curves.
+# The bind joints themselves are kept, so skinClusters bound to them keep their influences. They end up under a
+# <name>_BAKED_GRP group per rig, with the rig's constraints and matrix connections removed.
+# Returns a dictionary with the joints baked, the keys written, and the seconds taken.
+def bakeRibbonSpines(rigs, startFrame = None, endFrame = None, tolerance = 0.0):
+	begin = time.time()
+	if startFrame is None:
+		startFrame = cmds.playbackOptions(query = True, minTime = True)
+	if endFrame is None:
+		endFrame = cmds.playbackOptions(query = True, maxTime = True)
+	names = [getattr(rig, "name", rig) for rig in rigs]
+	# ls and delete act on the whole scene or selection when given an empty list.
+	if not names:
+		return {"rigs": 0, "joints": 0, "frames": int(endFrame - startFrame) + 1, "keys": 0, "seconds": 0.0}
+	
+	cmds.undoInfo(openChunk = True, chunkName = "bakeRibbonSpines")
+	cmds.refresh(suspend = True)
+	try:
+		# Constrain a plain proxy joint to each bind joint in world space, whichever way the rig drives it.
+		joints, proxies, constraints, groups = [], [], [], []
+		for name in names:
+			group = cmds.createNode("transform", name = "%s_BAKED_GRP" % name, skipSelect = True)
+			for joint in cmds.ls("%s_BIND_JNT_*" % name, type = "joint"):
+				proxy = cmds.createNode("joint", name = "%s_BAKE" % joint, parent = group, skipSelect = True)
+				constraints.extend(cmds.parentConstraint(joint, proxy))
+				cmds.connectAttr("%s.scale" % joint, proxy +".scale")
+				joints.append(joint)
+				proxies.append(proxy)
+				groups.append(group)
+		
+		# One simulated pass over the frame range keys every proxy at once.
+		if proxies:
+			cmds.bakeResults(proxies, time = (startFrame, endFrame), simulation = True, sampleBy = 1, disableImplicitControl = True, preserveOutsideKeys = False, attribute = BAKED_ATTRIBUTES)
+			cmds.delete(constraints)
+		if tolerance > 0 and proxies:
+			curves = cmds.listConnections(proxies, type = "animCurve", source = True, destination = False) or []
+			cmds.filterCurve(curves, filter = "simplify", tolerance = tolerance)
+		
+		# Free the bind joints from the rig: delete their constraints, break whatever else drives them, and reset their offsetParentMatrix.
+		if joints:
+			rigConstraints = cmds.listRelatives(joints, type = "parentConstraint") or []
+			if rigConstraints:
+				cmds.delete(rigConstraints)
+			# Other inputs, such as display layers, are left alone.
+			drivers = cmds.listConnections(joints, source = True, destination = False, plugs = True, connections = True) or []
+			for index in range(0, len(drivers), 2):
+				if drivers[index].split(".", 1)[1].startswith(DRIVEN_ATTRIBUTES):
+					cmds.disconnectAttr(drivers[index + 1], drivers[index])
+			for joint in joints:
+				cmds.setAttr(joint +".offsetParentMatrix", IDENTITY_MATRIX, type = "matrix")
+		
+		# Move the bind joints out of the rig, one parent call per rig, and give them the proxies' keys.
+		for group in sorted(set(groups), key = groups.index):
+			cmds.parent([joint for joint, each in zip(joints, groups) if each == group], group)
+		for joint, proxy in zip(joints, proxies):
+			cmds.copyKey(proxy, attribute = BAKED_ATTRIBUTES)
+			cmds.pasteKey(joint, attribute = BAKED_ATTRIBUTES, option = "replaceCompletely")
+		if proxies:
+			cmds.delete(proxies)
+		
+		# Delete the rigs and their deformer and stretch nodes.
+		# The arclen curveInfo nodes are not named after the rig, so find them through the stretch dividers first.
+		dividers = cmds.ls(["%s_STRETCH_DIV" % name for name in names])
+		curveInfos = (cmds.listConnections(dividers, type = "curveInfo", source = True, destination = False) or []) if dividers else []
+		cmds.delete(["%s_MST_GRP" % name for name in names])
+		leftovers = cmds.ls(["%s%s" % (name, suffix) for name in names for suffix in RIG_NODE_SUFFIXES] + curveInfos)
+		if leftovers:
+			cmds.delete(leftovers)
+		keys = cmds.keyframe(joints, query = True, keyframeCount = True) if joints else 0
+	finally:
+		cmds.refresh(suspend = False)
+		cmds.undoInfo(closeChunk = True)
+	return {"rigs": len(names), "joints": len(joints), "frames": int(endFrame - startFrame) + 1, "keys": keys, "seconds": time.time() - begin}
+
+# The hash of this file, computed once per session by getSourceDigest().
+_sourceDigest = None
+
+# Template text and description by path, read once per session by importRibbonTemplate().
+_templates = {}
+
+# Returns a short hash of this file, so templates made by an older version of the rig are not reused.
+def getSourceDigest():
+	global _sourceDigest
+	if _sourceDigest is None:
+		source = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+		_sourceDigest = hashlib.md5(open(source, 'rb').read()).hexdigest()[:8] if os.path.exists(source) else "0"
+	return _sourceDigest
+
+# Returns the template file name, without extension, for a joint count and build options.
+def getTemplateKey(joints, highDensity = False, endDensity = 1.0, lightweight = False):
+	return "ribbonSpine_%d_%s%s_%g_%s" % (joints, "highDensity" if highDensity else "standard", "_lightweight" if lightweight else "", endDensity, getSourceDigest())
+	
+# Returns what createFromTemplate() scales in a rig: the components of each shape in SCALED_SHAPES, and each attribute in SCALED_ATTRIBUTES with its value.
+# Deformed geometry is scaled at its original shape, below its deformers.
+def getTemplateGraph(name):
+	components = []
+	for suffix in SCALED_SHAPES:
+		shapes = [shape for shape in cmds.listRelatives(name + suffix, shapes = True, path = True) or [] if cmds.nodeType(shape) in ("nurbsCurve", "nurbsSurface")]
+		shapes = [shape for shape in shapes if cmds.getAttr("%s.intermediateObject" % shape)] or shapes
+		components.extend(("%s.cv[*][*]" if cmds.nodeType(shape) == "nurbsSurface" else "%s.cv[*]") % shape for shape in shapes)
+	attributes = {}
+	for suffix in SCALED_ATTRIBUTES:
+		value = cmds.getAttr(name + suffix)
+		attributes[name + suffix] = list(value[0]) if isinstance(value, list) else value
+	return {"components": components, "attributes": attributes}
+
+# Returns whether a template's description matches what this version of the rig builds and scales.
+def isTemplateCurrent(description, joints, **options):
+	graph = description.get("graph")
+	if description.get("joints") != joints or description.get("options") != options or graph is None:
+		return False
+	return sorted(graph["attributes"]) == sorted(TEMPLATE_NAME + suffix for suffix in SCALED_ATTRIBUTES) and len(graph["components"]) >= len(SCALED_SHAPES)
+
+# Builds a rig one unit long under the placeholder name and saves it as a Maya ASCII template,
+# with a JSON description of what createFromTemplate() scales next to it. The rig is deleted from the scene afterwards. Returns the .ma path.
+def createRibbonTemplate(joints, path, **options):
+	before = set(cmds.ls())
+	rig = RibbonSpine()
+	rig.createRibbonSpine(TEMPLATE_NAME, joints, (0, -0.5, 0), (0, 0.5, 0), **options)
+	nodes = [node for node in cmds.ls() if node not in before]
+	
+	description = {"joints": joints, "options": options, "graph": getTemplateGraph(TEMPLATE_NAME)}
+	directory = os.path.dirname(path)
+	if not os.path.isdir(directory):
+		os.makedirs(directory)
+	cmds.select(nodes, replace = True, noExpand = True)
+	cmds.file(path, force = True, exportSelected = True, type = "mayaAscii", constructionHistory = True, channels = True, constraints = True, expressions = True)
+	cmds.select(clear = True)
+	cmds.delete(nodes)
+	descriptionFile = open(os.path.splitext(path)[0] + ".json", 'w')
+	json.dump(description, descriptionFile, indent = 1, sort_keys = True)
+	descriptionFile.close()
+	_templates.pop(path, None)
+	return path
+	
+# Returns the cached template path for a joint count and options.
+# The template is made again if it is missing, or if its description does not match what this version of the rig builds.
+def getRibbonTemplate(joints, **options):
+	path = os.path.join(TEMPLATE_DIRECTORY, getTemplateKey(joints, **options) + ".ma")
+	if path in _templates:
+		return path
+	descriptionPath = os.path.splitext(path)[0] + ".json"
+	if os.path.exists(path) and os.path.exists(descriptionPath):
+		descriptionFile = open(descriptionPath)
+		try:
+			description = json.load(descriptionFile)
+		except ValueError:
+			description = {}
+		descriptionFile.close()
+		if isTemplateCurrent(description, joints, **options):
+			return path
+	createRibbonTemplate(joints, path, **options)
+	return path
+	
+# Imports a template with the placeholder name replaced by name.
+# Returns the template's graph description, with the same names replaced.
+def importRibbonTemplate(name, path):
+	template = _templates.get(path)
+	if template is None:
+		templateFile = open(path)
+		text = templateFile.read()
+		templateFile.close()
+		descriptionFile = open(os.path.splitext(path)[0] + ".json")
+		template = _templates[path] = (text, json.dumps(json.load(descriptionFile)["graph"]))
+		descriptionFile.close()
+	text, graph = template
+	handle, renamedPath = tempfile.mkstemp(suffix = ".ma", prefix = name + "_")
+	os.write(handle, text.replace(TEMPLATE_NAME, name).encode("utf-8"))
+	os.close(handle)
+	try:
+		cmds.file(renamedPath, i = True, type = "mayaAscii", ignoreVersion = True, preserveReferences = True)
+	finally:
+		os.remove(renamedPath)
+	return json.loads(graph.replace(TEMPLATE_NAME, name))
@@ -0,0 +1,266 @@
+"""
+Reads the render settings batchAndSave needs straight from a Maya ASCII (.ma) file, so render scripts can be
+exported without launching Maya, e.g.:
+
+	python maReader.py /projects/show/scenes/shot_v003.ma --frames-per-task 50
+"""
+
+import argparse
+import mmap
+import os
+import re
+import shlex
+import sys
+import time
+
+import renderTasks
+
+# The top-level statements worth looking at. Everything else, including heavy geometry data, is never parsed.
+# Anchoring on the newline rather than "^" lets the regex engine skip ahead to line breaks, which is about ten times faster.
+STATEMENT_PATTERN = re.compile(br'\n((?:createNode (?:camera|renderLayer) |select -ne :(?:defaultRenderGlobals|defaultResolution)|connectAttr "[^"\n]*" "[^"\n]*\.(?:rlid|identification|(?:adj|adjs|adjustments)\[\d+\]\.(?:plg|plug))")[^\n]*)')
+# A node's setAttr/addAttr block ends at the next line that is not indented.
+BLOCK_END_PATTERN = re.compile(br'^[^\t]', re.M)
+# The value half of a render layer adjustment. Maya writes the adjustments array as "adjs"; the other names are accepted too.
+ADJUSTMENT_VALUE_PATTERN = re.compile(r'^\.(?:adj|adjs|adjustments)\[(\d+)\]\.(?:val|value)$')
+
+# Short and long attribute names, per node type, mapped to the long names used in snapshots.
+NODE_ATTRIBUTES = {
+	"camera": {"rnd": "renderable", "renderable": "renderable", "startFrame": "startFrame", "endFrame": "endFrame"},
+	"renderLayer": {"rndr": "renderable", "renderable": "renderable"},
+	"renderGlobals": {"fs": "startFrame", "startFrame": "startFrame", "ef": "endFrame", "endFrame": "endFrame",
+		"ifp": "imageFilePrefix", "imageFilePrefix": "imageFilePrefix", "pad": "extensionPadding", "extensionPadding": "extensionPadding",
+		"if": "imageFormat", "imageFormat": "imageFormat", "imfkey": "imfPluginKey", "imfPluginKey": "imfPluginKey",
+		"pff": "putFrameBeforeExt", "putFrameBeforeExt": "putFrameBeforeExt", "peie": "periodInExt", "periodInExt": "periodInExt"},
+	"resolution": {"w": "width", "width": "width", "h": "height", "height": "height"},
+}
+# Attributes overridden through render layer adjustments, by short and long name.
+OVERRIDE_ATTRIBUTES = {"rnd": "renderable", "renderable": "renderable", "fs": "startFrame", "startFrame": "startFrame", "ef": "endFrame", "endFrame": "endFrame"}
+# The shared nodes edited with "select -ne" rather than created.
+SHARED_NODES = {"defaultRenderGlobals": "renderGlobals", "defaultResolution": "resolution"}
+# Maya's values for attributes the file leaves at their defaults.
+DEFAULTS = {
+	"renderGlobals": {"startFrame": 1, "endFrame": 10, "imageFilePrefix": "", "extensionPadding": 1, "imageFormat": 7, "imfPluginKey": "", "putFrameBeforeExt": True, "periodInExt": 1},
+	"resolution": {"width": 640, "height": 480},
+}
+
+def toText(data):
+	# Returns file bytes as text on both Python 2 and 3.
+	if isinstance(data, str):
+		return data
+	return data.decode("utf-8", "replace")
+
+def parseValue(token):
+	# Converts a MEL value token into a Python value.
+	if token in ("yes", "on", "true"):
+		return True
+	if token in ("no", "off", "false"):
+		return False
+	try:
+		return int(token)
+	except ValueError:
+		pass
+	try:
+		return float(token)
+	except ValueError:
+		return token
+
+def splitStatements(block):
+	# Splits a block of MEL into statements, joining the lines of multi-line statements.
+	statements = []
+	current = []
+	for line in block.splitlines():
+		current.append(line.strip())
+		if line.rstrip().endswith(";"):
+			statements.append(" ".join(current).rstrip(";"))
+			current = []
+	return statements
+
+def getFlag(tokens, *flags):
+	# Returns the value following the first of the given flags, or None.
+	for index, token in enumerate(tokens[:-1]):
+		if token in flags:
+			return tokens[index + 1]
+	return None
+
+class MayaAsciiReader(object):
+	# Collects render layers, cameras, frame ranges, resolution, and output naming from a .ma file.
+
+	def __init__(self):
+		self.nodes = {}
+		self.nodeTypes = {}
+		self.parents = {}
+		self.cameras = []
+		self.layers = []
+		self.layerOrder = {}
+		self.adjustmentPlugs = {}
+		self.adjustmentValues = {}
+
+	# Scans the file once. Only the matched statements and their nodes' attribute blocks are parsed.
+	def read(self, path):
+		sceneFile = open(path, 'rb')
+		try:
+			if os.path.getsize(path) == 0:
+				return self
+			data = mmap.mmap(sceneFile.fileno(), 0, access = mmap.ACCESS_READ)
+			try:
+				for match in STATEMENT_PATTERN.finditer(data):
+					statement = toText(match.group(1))
+					if statement.startswith("connectAttr"):
+						self.parseConnection(statement)
+						continue
+					blockStart = match.end() + 1
+					blockEnd = BLOCK_END_PATTERN.search(data, blockStart)
+					block = data[blockStart:blockEnd.start() if blockEnd else len(data)]
+					self.parseNode(statement, toText(block))
+			finally:
+				data.close()
+		finally:
+			sceneFile.close()
+		return self
+
+	# Registers a created or selected node and reads the attributes set in its block.
+	def parseNode(self, statement, block):
+		tokens = shlex.split(statement.rstrip().rstrip(";"))
+		if tokens[0] == "select":
+			name = tokens[-1].lstrip(":")
+			nodeType = SHARED_NODES[name]
+		else:
+			nodeType = tokens[1]
+			name = getFlag(tokens, "-n", "-name")
+			parent = getFlag(tokens, "-p", "-parent")
+			if nodeType == "camera" and parent:
+				self.parents[name] = parent.rsplit("|", 1)[-1]
+				self.cameras.append(name)
+			elif nodeType == "renderLayer":
+				self.layers.append(name)
+		self.nodeTypes[name] = nodeType
+		attributes = self.nodes.setdefault(name, {})
+		names = NODE_ATTRIBUTES[nodeType]
+
+		for each in splitStatements(block):
+			tokens = shlex.split(each)
+			if not tokens:
+				continue
+			if tokens[0] == "addAttr":
+				longName = getFlag(tokens, "-ln", "-longName")
+				if longName in names and longName not in attributes:
+					attributes[longName] = parseValue(getFlag(tokens, "-dv", "-defaultValue") or "0")
+			elif tokens[0] == "setAttr":
+				plugs = [index for index, token in enumerate(tokens) if token.startswith(".")]
+				if not plugs:
+					continue
+				index = plugs[0]
+				values = tokens[index + 1:]
+				if values[:1] == ["-type"]:
+					values = values[2:]
+				if not values:
+					continue
+				match = ADJUSTMENT_VALUE_PATTERN.match(tokens[index])
+				if match and nodeType == "renderLayer":
+					self.adjustmentValues.setdefault(name, {})[int(match.group(1))] = parseValue(values[0])
+				elif tokens[index][1:] in names:
+					attributes[names[tokens[index][1:]]] = parseValue(values[0])
+
+	# Records render layer membership and layer adjustment connections.
+	def parseConnection(self, statement):
+		tokens = shlex.split(statement.rstrip().rstrip(";"))
+		source, destination = [token.lstrip(":") for token in tokens[1:3]]
+		destinationNode, destinationAttribute = destination.split(".", 1)
+		if destinationAttribute in ("rlid", "identification"):
+			match = re.search(r"\[(\d+)\]", source)
+			self.layerOrder[destinationNode] = int(match.group(1)) if match else len(self.layerOrder)
+			return
+		sourceNode, sourceAttribute = source.split(".", 1)
+		if sourceAttribute in OVERRIDE_ATTRIBUTES:
+			index = int(re.search(r"\[(\d+)\]", destinationAttribute).group(1))
+			self.adjustmentPlugs.setdefault(destinationNode, {})[index] = sourceNode +"."+ OVERRIDE_ATTRIBUTES[sourceAttribute]
+
+	# Returns an attribute value, falling back to Maya's default.
+	def getValue(self, node, attribute, default = None):
+		nodeType = SHARED_NODES.get(node, self.nodeTypes.get(node))
+		value = self.nodes.get(node, {}).get(attribute)
+		if value is None:
+			value = DEFAULTS.get(nodeType, {}).get(attribute, default)
+		return value
+
+	# Returns the same snapshot batchAndSave.getSceneSnapshot() reads from a live session.
+	def getSnapshot(self, currentLayer = "defaultRenderLayer"):
+		layers = [each for each in self.layers if each in self.layerOrder] or list(self.layers)
+		layers.sort(key = lambda each: self.layerOrder.get(each, 0))
+		renderLayers = [each for each in layers if self.getValue(each, "renderable", True)]
+
+		adjustments = {}
+		for layer, plugs in self.adjustmentPlugs.items():
+			values = self.adjustmentValues.get(layer, {})
+			adjustments[layer] = dict((plug, values[index]) for index, plug in plugs.items() if index in values)
+
+		live = {}
+		live['defaultRenderGlobals.startFrame'] = self.getValue("defaultRenderGlobals", "startFrame")
+		live['defaultRenderGlobals.endFrame'] = self.getValue("defaultRenderGlobals", "endFrame")
+		frameRangeShapes = set()
+		for each in self.cameras:
+			live[each +".renderable"] = self.getValue(each, "renderable", True)
+			if "startFrame" in self.nodes[each]:
+				frameRangeShapes.add(each)
+				live[each +".startFrame"] = self.getValue(each, "startFrame", 0)
+				live[each +".endFrame"] = self.getValue(each, "endFrame", 0)
+
+		cameras = [(each, self.parents[each]) for each in self.cameras]
+		width = self.getValue("defaultResolution", "width")
+		height = self.getValue("defaultResolution", "height")
+		return renderTasks.resolveSnapshot(renderLayers, currentLayer, adjustments, live, cameras, frameRangeShapes, width, height)
+
+	# Returns the output naming settings, with images written to the project's images directory.
+	def getOutputNaming(self, projectPath):
+		extension = renderTasks.getImageExtension(self.getValue("defaultRenderGlobals", "imageFormat"), self.getValue("defaultRenderGlobals", "imfPluginKey"))
+		return renderTasks.OutputNaming(os.path.join(projectPath, "images"),
+			self.getValue("defaultRenderGlobals", "imageFilePrefix"),
+			int(self.getValue("defaultRenderGlobals", "extensionPadding")),
+			extension,
+			bool(self.getValue("defaultRenderGlobals", "putFrameBeforeExt")),
+			int(self.getValue("defaultRenderGlobals", "periodInExt")))
+
+def readScene(path, currentLayer = "defaultRenderLayer"):
+	# Returns the scene snapshot of a .ma file.
+	return MayaAsciiReader().read(path).getSnapshot(currentLayer)
+
+def getProjectPath(scenePath):
+	# Guesses the project from the scene path: the folder above "scenes", or the scene's own folder.
+	sceneDirectory = os.path.dirname(os.path.abspath(scenePath))
+	if os.path.basename(sceneDirectory) == "scenes":
+		return os.path.dirname(sceneDirectory)
+	return sceneDirectory
+
+def getOperatingSystem():
+	# Returns this machine's operating system in the form cmds.about(os = True) uses.
+	if sys.platform == "darwin":
+		return "mac"
+	if sys.platform.startswith("win"):
+		return "windows"
+	return "linux"
+
+def exportScript(scenePath, framesPerTask = 0, resume = False, rendererPath = None, projectPath = None, operatingSystem = None):
+	# Exports the render script and task manifest for a .ma file without Maya.
+	reader = MayaAsciiReader().read(scenePath)
+	projectPath = projectPath or getProjectPath(scenePath)
+	if rendererPath is None:
+		rendererPath = renderTasks.cleanPath(os.getenv("MAYA_LOCATION") or "") + "bin/render"
+	return renderTasks.exportRenderScript(reader.getSnapshot(), os.path.abspath(scenePath), rendererPath, projectPath, operatingSystem or getOperatingSystem(), framesPerTask, reader.getOutputNaming(projectPath), resume)
+
+def main(arguments = None):
+	parser = argparse.ArgumentParser(description = "Exports a render script from a Maya ASCII scene without Maya.")
+	parser.add_argument("scene", help = "Maya ASCII (.ma) scene.")
+	parser.add_argument("--frames-per-task", type = int, default = 0, help = "Split each camera's frame range into tasks of this many frames.")
+	parser.add_argument("--resume", action = "store_true", help = "Leave out frames whose images already exist.")
+	parser.add_argument("--renderer", default = None, help = "Render executable. Defaults to $MAYA_LOCATION/bin/render.")
+	parser.add_argument("--project", default = None, help = "Project folder. Defaults to the folder above scenes/.")
+	parser.add_argument("--os", default = None, help = "mac, windows, or linux. Defaults to this machine.")
+	options = parser.parse_args(arguments)
+
+	start = time.time()
+	scriptName = exportScript(options.scene, options.frames_per_task, options.resume, options.renderer, options.project, options.os)
+	print ("Exported '%s' in %.3f s." % (scriptName, time.time() - start))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,14 @@
+"""
+Finds Maya's executables from MAYA_LOCATION, for tools that start mayapy processes. Needs nothing but the standard library.
+
+	import mayaPaths
+	subprocess.call([mayaPaths.getMayapy(), "-c", "print ('hello')"])
+"""
+
+import os
+import sys
+
+def getMayapy():
+	# Returns the mayapy executable from MAYA_LOCATION.
+	executable = "mayapy.exe" if sys.platform.startswith("win") else "mayapy"
+	return os.path.join(os.getenv("MAYA_LOCATION") or "", "bin", executable)
@@ -0,0 +1,28 @@
+"""
+Reads a Maya mesh into NumPy arrays in bulk through the API, for tools that work on whole meshes at once.
+
+	import meshArrays
+	points, counts, connects, normals = meshArrays.getMeshArrays("pSphere1", withNormals = True)
+"""
+
+import maya.api.OpenMaya as om
+import numpy
+
+def getMeshArrays(mesh, triangulate = False, withNormals = False):
+	# Returns the world space points, face vertex counts, and face vertex indices of a mesh, given by name or dag path, as arrays,
+	# followed by its world space vertex normals, or None without withNormals.
+	# With triangulate, the faces are the mesh's triangles, so every count is 3.
+	if not isinstance(mesh, om.MDagPath):
+		selection = om.MSelectionList()
+		selection.add(mesh)
+		mesh = selection.getDagPath(0)
+	meshFn = om.MFnMesh(mesh)
+	points = numpy.array(meshFn.getPoints(om.MSpace.kWorld))[:, :3]
+	if triangulate:
+		connects = numpy.array(meshFn.getTriangles()[1], dtype = numpy.int64)
+		counts = numpy.full(len(connects) // 3, 3, dtype = numpy.int64)
+	else:
+		counts, connects = meshFn.getVertices()
+		counts, connects = numpy.array(counts, dtype = numpy.int64), numpy.array(connects, dtype = numpy.int64)
+	normals = numpy.array(meshFn.getVertexNormals(False, om.MSpace.kWorld)) if withNormals else None
+	return points, counts, connects, normals
@@ -0,0 +1,126 @@
+"""
+Mirrors polygon meshes given as plain arrays, the way objectMirror does in Maya, e.g.:
+
+	import meshMirror
+	points, counts, connects = meshMirror.mirrorMesh(points, counts, connects)
+
+A mesh is a (vertices, 3) array of positions, the vertex count of each face, and the vertex indices of every face in order,
+the same arrays MFnMesh.getPoints() and MFnMesh.getVertices() return.
+"""
+
+import numpy
+
+# Largest number of grid cells per axis that fits the encoded cell keys in 64 bits.
+MAXIMUM_CELLS = 2 ** 20
+
+def getFaceOffsets(counts):
+	# Returns where each face starts in the connects array, followed by the total length.
+	offsets = numpy.zeros(len(counts) + 1, dtype = numpy.int64)
+	numpy.cumsum(counts, out = offsets[1:])
+	return offsets
+
+def getNegativeFaces(points, counts, connects, axis = 0):
+	# Returns a mask of the faces whose bounding box center is on the negative side of the axis.
+	values = points[connects, axis]
+	starts = getFaceOffsets(counts)[:-1]
+	centers = (numpy.minimum.reduceat(values, starts) + numpy.maximum.reduceat(values, starts)) / 2.0
+	return centers < 0
+
+def getSeamVertices(vertexCount, counts, connects, removed):
+	# Returns a mask of the vertices shared by removed and kept faces, which end up on the cut.
+	removedCorners = numpy.repeat(removed, counts)
+	inRemoved = numpy.bincount(connects[removedCorners], minlength = vertexCount) > 0
+	inKept = numpy.bincount(connects[~removedCorners], minlength = vertexCount) > 0
+	return inRemoved & inKept
+
+def getReversedCorners(counts):
+	# Returns, for every face corner, the index of the corner that takes its place when each face's winding is reversed.
+	offsets = getFaceOffsets(counts)
+	starts = numpy.repeat(offsets[:-1], counts)
+	return 2 * starts + numpy.repeat(counts, counts) - 1 - numpy.arange(offsets[-1])
+
+def findCloseVertexPairs(points, tolerance):
+	# Returns two index arrays of the vertex pairs no further apart than tolerance.
+	# Vertices are hashed into a grid of tolerance sized cells, so only vertices in neighboring cells are compared.
+	count = len(points)
+	if not count:
+		return numpy.zeros(0, dtype = numpy.int64), numpy.zeros(0, dtype = numpy.int64)
+	cells = numpy.floor(points / tolerance).astype(numpy.int64)
+	cells -= cells.min(axis = 0) - 1
+	size = cells.max(axis = 0) + 2
+	if (size > MAXIMUM_CELLS).any():
+		raise ValueError("A merge tolerance of %g is too small for a mesh this size." % tolerance)
+	keys = (cells[:, 0] * size[1] + cells[:, 1]) * size[2] + cells[:, 2]
+	order = numpy.argsort(keys, kind = "mergesort")
+	sortedKeys = keys[order]
+
+	# The cell itself, plus half of its 26 neighbors, so every pair of cells is visited once.
+	offsets = [(0, 0, 0)] + [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) > (0, 0, 0)]
+	firsts, seconds = [], []
+	for x, y, z in offsets:
+		neighborKeys = keys + (x * size[1] + y) * size[2] + z
+		start = numpy.searchsorted(sortedKeys, neighborKeys, "left")
+		matches = numpy.searchsorted(sortedKeys, neighborKeys, "right") - start
+		found = matches > 0
+		if not found.any():
+			continue
+		matches = matches[found]
+		first = numpy.repeat(numpy.arange(count)[found], matches)
+		within = numpy.arange(matches.sum()) - numpy.repeat(numpy.cumsum(matches) - matches, matches)
+		second = order[numpy.repeat(start[found], matches) + within]
+		keep = ((points[first] - points[second]) ** 2).sum(axis = 1) <= tolerance * tolerance
+		if (x, y, z) == (0, 0, 0):
+			keep &= first < second
+		firsts.append(first[keep])
+		seconds.append(second[keep])
+	return numpy.concatenate(firsts), numpy.concatenate(seconds)
+
+def getMergeLabels(vertexCount, firsts, seconds):
+	# Returns the lowest vertex index of the group each vertex merges into, joining pairs transitively.
+	labels = numpy.arange(vertexCount)
+	while len(firsts):
+		low = numpy.minimum(labels[firsts], labels[seconds])
+		if (labels[firsts] == low).all() and (labels[seconds] == low).all():
+			break
+		numpy.minimum.at(labels, firsts, low)
+		numpy.minimum.at(labels, seconds, low)
+		labels = labels[labels]
+	return labels
+
+def mergeVertices(points, connects, tolerance):
+	# Merges vertices closer than tolerance to their average position. Returns the new points and connects.
+	labels = getMergeLabels(len(points), *findCloseVertexPairs(points, tolerance))
+	groups, index = numpy.unique(labels, return_inverse = True)
+	sizes = numpy.bincount(index, minlength = len(groups)).astype(float)
+	merged = numpy.zeros((len(groups), 3))
+	for axis in range(3):
+		merged[:, axis] = numpy.bincount(index, weights = points[:, axis], minlength = len(groups)) / sizes
+	return merged, index[connects]
+
+def mirrorMesh(points, counts, connects, axis = 0, tolerance = 0.0001):
+	# Deletes the faces on the negative side of the axis, snaps the cut to the axis, mirrors what is left across it,
+	# and merges the vertices that meet. Returns the new points, counts, and connects.
+	points = numpy.array(points, dtype = float)
+	counts = numpy.asarray(counts, dtype = numpy.int64)
+	connects = numpy.asarray(connects, dtype = numpy.int64)
+
+	removed = getNegativeFaces(points, counts, connects, axis)
+	points[getSeamVertices(len(points), counts, connects, removed), axis] = 0.0
+
+	# Drop the removed faces and any vertices only they used, keeping the order of the rest.
+	keptCorners = numpy.repeat(~removed, counts)
+	used = numpy.bincount(connects[keptCorners], minlength = len(points)) > 0
+	newIndex = numpy.cumsum(used) - 1
+	points = points[used]
+	counts = counts[~removed]
+	connects = newIndex[connects[keptCorners]]
+
+	# Mirror the half, reversing each mirrored face's winding so its normal still faces out.
+	mirrored = points.copy()
+	mirrored[:, axis] *= -1
+	points = numpy.concatenate([points, mirrored])
+	connects = numpy.concatenate([connects, connects[getReversedCorners(counts)] + len(mirrored)])
+	counts = numpy.concatenate([counts, counts])
+
+	points, connects = mergeVertices(points, connects, tolerance)
+	return points, counts, connects
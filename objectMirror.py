@@ -0,0 +1,59 @@
+"""
+Deletes the negative X side of the selected mesh, snaps the cut to the axis, and mirrors and merges it.
+A faster objectMirror.mel for dense meshes: the mesh is read in bulk through the API and classified with NumPy in meshMirror,
+and every edit is a single undoable command.
+
+	import objectMirror
+	objectMirror.objectMirror()
+"""
+
+import maya.cmds as cmds
+import numpy
+import meshArrays
+import meshMirror
+
+def getComponents(mesh, component, indices):
+	# Returns component names covering the indices with as few ranges as possible, e.g. ["pSphere1.f[0:99]", "pSphere1.f[120]"].
+	indices = numpy.unique(indices)
+	if not len(indices):
+		return []
+	breaks = numpy.nonzero(numpy.diff(indices) != 1)[0]
+	starts = indices[numpy.concatenate([[0], breaks + 1])]
+	ends = indices[numpy.concatenate([breaks, [len(indices) - 1]])]
+	return ["%s.%s[%d:%d]" % (mesh, component, start, end) for start, end in zip(starts, ends)]
+
+def objectMirror(mesh = None, tolerance = 0.0001):
+	# Mirrors the mesh, or the selected mesh, across world X. Returns the mesh.
+	if mesh is None:
+		selected = cmds.ls(selection = True, objectsOnly = True)
+		if not selected:
+			raise RuntimeError("Select a mesh to mirror.")
+		mesh = selected[0]
+
+	cmds.undoInfo(openChunk = True, chunkName = "objectMirror")
+	try:
+		points, counts, connects = meshArrays.getMeshArrays(mesh)[:3]
+		removed = meshMirror.getNegativeFaces(points, counts, connects)
+		seam = meshMirror.getSeamVertices(len(points), counts, connects, removed)
+
+		# Deleting faces drops the vertices only they used and renumbers the rest in order.
+		keptCorners = numpy.repeat(~removed, counts)
+		newIndex = numpy.cumsum(numpy.bincount(connects[keptCorners], minlength = len(points)) > 0) - 1
+		if removed.any():
+			cmds.delete(getComponents(mesh, "f", numpy.nonzero(removed)[0]))
+
+		# Flatten every seam vertex onto the axis in one move.
+		if seam.any():
+			cmds.move(0, getComponents(mesh, "vtx", newIndex[seam]), x = True, absolute = True, worldSpace = True)
+
+		cmds.polyMirrorFace(mesh, worldSpace = True, direction = 1, mergeMode = 0, constructionHistory = True)
+
+		# Merge only the vertices the spatial hash pairs up, rather than searching the whole mesh.
+		points = meshArrays.getMeshArrays(mesh)[0]
+		firsts, seconds = meshMirror.findCloseVertexPairs(points, tolerance)
+		if len(firsts):
+			cmds.polyMergeVertex(getComponents(mesh, "vtx", numpy.concatenate([firsts, seconds])), distance = tolerance, alwaysMergeTwoVertices = True, constructionHistory = True)
+		cmds.select(mesh, replace = True)
+	finally:
+		cmds.undoInfo(closeChunk = True)
+	return mesh
@@ -0,0 +1,234 @@
+"""
+Bakes per-vertex ambient occlusion on the CPU, from plain vertex and triangle arrays, e.g.:
+
+	import occlusionBaker
+	for samples, occlusion in occlusionBaker.iterateOcclusion(vertices, triangles, normals, samples = 64):
+		print ("%d samples, mean %.3f" % (samples, occlusion.mean()))
+
+Each vertex casts cosine-weighted rays over the hemisphere around its normal. The rays are tested against a bounding
+volume hierarchy over every triangle, in vectorized batches spread across a process pool. The result is the fraction
+of rays that escape, 1.0 for fully open and 0.0 for fully occluded, like mib_amb_occlusion's output.
+"""
+
+from collections import namedtuple
+import multiprocessing
+
+import numpy
+
+# lower and upper are the (nodes, 3) bounds. Internal nodes have count 0 and their children at first and first + 1.
+# Leaves have their triangles at first:first + count of the reordered v0, e1, and e2 edge arrays.
+BVH = namedtuple("BVH", ["lower", "upper", "first", "count", "v0", "e1", "e2"])
+
+# Successive sample points come from an additive recurrence, so a later pass continues where the preview stopped.
+SEQUENCE = (0.7548776662466927, 0.5698402909980532)
+
+def buildBVH(vertices, triangles, leafSize = 8):
+	# Returns a BVH over the triangles, split at the median centroid along the longest axis.
+	# A mesh with no triangles gets a tree with no nodes, which nothing can hit.
+	vertices = numpy.asarray(vertices, dtype = float).reshape(-1, 3)
+	triangles = numpy.asarray(triangles, dtype = numpy.int64).reshape(-1, 3)
+	if not len(triangles):
+		empty = numpy.zeros((0, 3))
+		return BVH(empty, empty, numpy.zeros(0, dtype = numpy.int64), numpy.zeros(0, dtype = numpy.int64), empty, empty, empty)
+	corners = vertices[triangles]
+	lows = corners.min(axis = 1)
+	highs = corners.max(axis = 1)
+	centers = (lows + highs) / 2.0
+	order = numpy.arange(len(corners))
+	lower, upper, first, count = [], [], [], []
+	def addNode():
+		for table in (lower, upper, first, count):
+			table.append(None)
+		return len(lower) - 1
+	stack = [(addNode(), 0, len(corners))]
+	while stack:
+		node, start, end = stack.pop()
+		members = order[start:end]
+		lower[node] = lows[members].min(axis = 0)
+		upper[node] = highs[members].max(axis = 0)
+		if end - start <= leafSize:
+			first[node], count[node] = start, end - start
+			continue
+		spread = centers[members]
+		axis = numpy.argmax(spread.max(axis = 0) - spread.min(axis = 0))
+		middle = (end - start) // 2
+		order[start:end] = members[numpy.argpartition(spread[:, axis], middle)]
+		left = addNode()
+		addNode()
+		first[node], count[node] = left, 0
+		stack.append((left, start, start + middle))
+		stack.append((left + 1, start + middle, end))
+	corners = corners[order]
+	return BVH(numpy.array(lower), numpy.array(upper), numpy.array(first), numpy.array(count), corners[:, 0], corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+def intersectTriangles(origins, directions, v0, e1, e2, maxDistance):
+	# Returns a mask of the rays that hit their paired triangle between just past the origin and maxDistance (Moller-Trumbore).
+	p = numpy.cross(directions, e2)
+	determinant = (e1 * p).sum(axis = 1)
+	valid = numpy.abs(determinant) > 1e-12
+	inverse = 1.0 / numpy.where(valid, determinant, 1.0)
+	s = origins - v0
+	u = (s * p).sum(axis = 1) * inverse
+	q = numpy.cross(s, e1)
+	v = (directions * q).sum(axis = 1) * inverse
+	t = (e2 * q).sum(axis = 1) * inverse
+	return valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 1e-9) & (t <= maxDistance)
+
+def findOccluded(bvh, origins, directions, maxDistance = numpy.inf):
+	# Returns a mask of the rays that hit any triangle within maxDistance.
+	# All rays walk the tree together: each step tests every live (ray, node) pair at once.
+	occluded = numpy.zeros(len(origins), dtype = bool)
+	if not len(bvh.count):
+		return occluded
+	directions = numpy.where(numpy.abs(directions) < 1e-12, 1e-12, directions)
+	# The slab test runs per axis on contiguous columns, which is much faster than reducing over rows of three.
+	inverse = [numpy.ascontiguousarray(1.0 / directions[:, axis]) for axis in range(3)]
+	start = [numpy.ascontiguousarray(origins[:, axis]) for axis in range(3)]
+	lower = [numpy.ascontiguousarray(bvh.lower[:, axis]) for axis in range(3)]
+	upper = [numpy.ascontiguousarray(bvh.upper[:, axis]) for axis in range(3)]
+	rays = numpy.arange(len(origins))
+	nodes = numpy.zeros(len(origins), dtype = numpy.int64)
+	while len(rays):
+		near = numpy.zeros(len(rays))
+		far = numpy.full(len(rays), maxDistance, dtype = float)
+		for axis in range(3):
+			scale = inverse[axis][rays]
+			offset = start[axis][rays]
+			low = (lower[axis][nodes] - offset) * scale
+			high = (upper[axis][nodes] - offset) * scale
+			numpy.maximum(near, numpy.minimum(low, high), out = near)
+			numpy.minimum(far, numpy.maximum(low, high), out = far)
+		hit = (far >= near) & ~occluded[rays]
+		rays, nodes = rays[hit], nodes[hit]
+
+		counts = bvh.count[nodes]
+		leaf = counts > 0
+		if leaf.any():
+			leafCounts = counts[leaf]
+			pairRays = numpy.repeat(rays[leaf], leafCounts)
+			within = numpy.arange(leafCounts.sum()) - numpy.repeat(numpy.cumsum(leafCounts) - leafCounts, leafCounts)
+			pairTriangles = numpy.repeat(bvh.first[nodes[leaf]], leafCounts) + within
+			hits = intersectTriangles(origins[pairRays], directions[pairRays], bvh.v0[pairTriangles], bvh.e1[pairTriangles], bvh.e2[pairTriangles], maxDistance)
+			occluded[pairRays[hits]] = True
+
+		inner = ~leaf
+		children = bvh.first[nodes[inner]]
+		rays = numpy.concatenate([rays[inner], rays[inner]])
+		nodes = numpy.concatenate([children, children + 1])
+	return occluded
+
+def getHemisphereDirections(normals, indices, sampleStart, sampleCount, seed = 0):
+	# Returns (vertices, samples, 3) cosine-weighted directions around each normal.
+	# Sample k of vertex i is the same however the vertices are chunked, so passes and processes agree.
+	normals = numpy.asarray(normals, dtype = float)
+	samples = numpy.arange(sampleStart, sampleStart + sampleCount)
+	shift = numpy.modf(numpy.outer(indices + seed, (0.6180339887498949, 0.41421356237309503)))[0]
+	u1 = numpy.modf(shift[:, 0:1] + samples[None, :] * SEQUENCE[0])[0]
+	u2 = numpy.modf(shift[:, 1:2] + samples[None, :] * SEQUENCE[1])[0]
+	radius = numpy.sqrt(u1)
+	angle = 2 * numpy.pi * u2
+	local = numpy.stack([radius * numpy.cos(angle), radius * numpy.sin(angle), numpy.sqrt(1 - u1)], axis = -1)
+
+	# An orthonormal frame around each normal, without branches (Duff et al. 2017).
+	x, y, z = normals[:, 0], normals[:, 1], normals[:, 2]
+	sign = numpy.where(z >= 0, 1.0, -1.0)
+	a = -1.0 / (sign + z)
+	b = x * y * a
+	tangent = numpy.stack([1 + sign * x * x * a, sign * b, -sign * x], axis = -1)
+	bitangent = numpy.stack([b, sign + y * y * a, -y], axis = -1)
+	return local[..., 0:1] * tangent[:, None] + local[..., 1:2] * bitangent[:, None] + local[..., 2:3] * normals[:, None]
+
+def getOcclusion(bvh, points, normals, indices, sampleStart, sampleCount, maxDistance, bias, seed = 0):
+	# Returns the fraction of unoccluded rays for each of the given vertices.
+	directions = getHemisphereDirections(normals, indices, sampleStart, sampleCount, seed)
+	origins = numpy.repeat(points + normals * bias, sampleCount, axis = 0)
+	occluded = findOccluded(bvh, origins, directions.reshape(-1, 3), maxDistance)
+	return 1.0 - occluded.reshape(len(points), sampleCount).mean(axis = 1)
+
+# The tree and settings each worker process receives once, when it starts.
+_worker = {}
+
+def initializeWorker(bvh, maxDistance, bias, seed):
+	_worker.update(bvh = bvh, maxDistance = maxDistance, bias = bias, seed = seed)
+
+def bakeChunk(job):
+	# Bakes one chunk of vertices in a worker process.
+	points, normals, indices, sampleStart, sampleCount = job
+	return getOcclusion(_worker["bvh"], points, normals, indices, sampleStart, sampleCount, _worker["maxDistance"], _worker["bias"], _worker["seed"])
+
+class OcclusionBaker(object):
+	# Holds the BVH and a process pool, so several passes over the same meshes share them.
+
+	def __init__(self, vertices, triangles, normals, maxDistance = None, bias = None, processes = 0, chunkSize = 256, seed = 0, executable = None):
+		self.vertices = numpy.asarray(vertices, dtype = float)
+		normals = numpy.asarray(normals, dtype = float)
+		self.normals = normals / numpy.maximum(numpy.linalg.norm(normals, axis = 1), 1e-12)[:, None]
+		self.bvh = buildBVH(self.vertices, triangles)
+		diagonal = numpy.linalg.norm(self.vertices.max(axis = 0) - self.vertices.min(axis = 0)) if len(self.vertices) else 1.0
+		self.maxDistance = maxDistance or numpy.inf
+		self.bias = diagonal * 1e-5 if bias is None else bias
+		self.chunkSize = chunkSize
+		self.seed = seed
+		self.processes = processes or multiprocessing.cpu_count()
+		self.pool = None
+		if self.processes > 1:
+			# Inside Maya, workers have to be spawned with mayapy rather than forked from or started as the Maya executable.
+			# Python 2 can't choose how workers start, so the bake runs in this process there.
+			arguments = (self.processes, initializeWorker, (self.bvh, self.maxDistance, self.bias, self.seed))
+			if not executable:
+				self.pool = multiprocessing.Pool(*arguments)
+			elif hasattr(multiprocessing, "get_context"):
+				context = multiprocessing.get_context("spawn")
+				context.set_executable(executable)
+				self.pool = context.Pool(*arguments)
+			else:
+				self.processes = 1
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	# Shuts the worker processes down.
+	def close(self):
+		if self.pool is not None:
+			self.pool.close()
+			self.pool.join()
+			self.pool = None
+
+	# Returns the unoccluded fraction of every vertex over samples sampleStart to sampleStart + sampleCount.
+	def bake(self, sampleStart, sampleCount):
+		jobs = []
+		for start in range(0, len(self.vertices), self.chunkSize):
+			end = min(start + self.chunkSize, len(self.vertices))
+			jobs.append((self.vertices[start:end], self.normals[start:end], numpy.arange(start, end), sampleStart, sampleCount))
+		if self.pool is None:
+			results = [getOcclusion(self.bvh, points, normals, indices, first, count, self.maxDistance, self.bias, self.seed) for points, normals, indices, first, count in jobs]
+		else:
+			results = self.pool.map(bakeChunk, jobs)
+		return numpy.concatenate(results) if results else numpy.zeros(0)
+
+def iterateOcclusion(vertices, triangles, normals, samples = 64, previewSamples = 8, **options):
+	# Yields (samples so far, occlusion) after a quick preview pass and again once all samples are done.
+	# The full pass only casts the remaining rays and averages them with the preview's.
+	if samples < 1:
+		raise ValueError("samples must be at least 1, not %r." % (samples,))
+	with OcclusionBaker(vertices, triangles, normals, **options) as baker:
+		previewSamples = min(previewSamples, samples)
+		occlusion = baker.bake(0, previewSamples) if previewSamples else None
+		if previewSamples:
+			yield previewSamples, occlusion
+		if samples > previewSamples:
+			remaining = baker.bake(previewSamples, samples - previewSamples)
+			if occlusion is None:
+				occlusion = remaining
+			else:
+				occlusion = (occlusion * previewSamples + remaining * (samples - previewSamples)) / float(samples)
+			yield samples, occlusion
+
+def bakeOcclusion(vertices, triangles, normals, samples = 64, **options):
+	# Returns the unoccluded fraction of every vertex, in one pass.
+	for count, occlusion in iterateOcclusion(vertices, triangles, normals, samples, 0, **options):
+		pass
+	return occlusion
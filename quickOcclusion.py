@@ -0,0 +1,65 @@
+"""
+Bakes ambient occlusion into the vertex colors of the selected meshes, a fast look check in place of quickOcclusion.mel's
+mental ray render. The meshes occlude each other. A low sample preview is shown first, then the full result.
+
+	import quickOcclusion
+	quickOcclusion.quickOcclusion()						# 64 samples, after an 8 sample preview.
+	quickOcclusion.quickOcclusion(samples = 256, maxDistance = 5.0)
+
+The rays are cast by occlusionBaker across a pool of mayapy processes. Vertex colors are written through the API,
+so the bake can't be undone; delete the colorSet to remove it.
+"""
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import numpy
+import time
+import mayaPaths
+import meshArrays
+import occlusionBaker
+
+# The color set the occlusion is written to.
+COLOR_SET = "occlusion"
+
+def getSelectedMeshes():
+	# Returns the dag paths of the selected meshes, including those under selected groups.
+	selection = om.MSelectionList()
+	for mesh in cmds.ls(selection = True, dag = True, type = "mesh", noIntermediate = True, long = True) or []:
+		selection.add(mesh)
+	return [selection.getDagPath(index) for index in range(selection.length())]
+
+def setOcclusionColors(dagPath, occlusion):
+	# Writes the occlusion as grey vertex colors to the occlusion color set and displays it.
+	meshFn = om.MFnMesh(dagPath)
+	if COLOR_SET not in meshFn.getColorSetNames():
+		meshFn.createColorSet(COLOR_SET, False)
+	meshFn.setCurrentColorSetName(COLOR_SET)
+	colors = om.MColorArray([om.MColor((value, value, value, 1.0)) for value in occlusion])
+	meshFn.setVertexColors(colors, om.MIntArray(range(len(occlusion))))
+	cmds.setAttr(dagPath.fullPathName() + ".displayColors", 1)
+
+def quickOcclusion(samples = 64, previewSamples = 8, maxDistance = None, processes = 0):
+	# Bakes occlusion into the selected meshes' vertex colors. Returns the seconds each pass took.
+	meshes = getSelectedMeshes()
+	if not meshes:
+		raise RuntimeError("Select the meshes to bake occlusion into.")
+
+	# Combine the meshes, offsetting each one's triangles past the vertices before it.
+	points, triangles, normals, offsets = [], [], [], [0]
+	for dagPath in meshes:
+		meshPoints, counts, connects, meshNormals = meshArrays.getMeshArrays(dagPath, triangulate = True, withNormals = True)
+		points.append(meshPoints)
+		triangles.append(connects.reshape(-1, 3) + offsets[-1])
+		normals.append(meshNormals)
+		offsets.append(offsets[-1] + len(meshPoints))
+	points, triangles, normals = numpy.concatenate(points), numpy.concatenate(triangles), numpy.concatenate(normals)
+
+	passes = []
+	start = time.time()
+	for count, occlusion in occlusionBaker.iterateOcclusion(points, triangles, normals, samples, previewSamples, maxDistance = maxDistance, processes = processes, executable = mayaPaths.getMayapy()):
+		for index, dagPath in enumerate(meshes):
+			setOcclusionColors(dagPath, occlusion[offsets[index]:offsets[index + 1]])
+		cmds.refresh()
+		passes.append(time.time() - start)
+		print ("quickOcclusion: %d samples on %d vertices in %.2f seconds" % (count, len(points), passes[-1]))
+	return passes
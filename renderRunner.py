@@ -0,0 +1,235 @@
+"""
+Runs the render commands exported by batchAndSave in parallel on the local machine.
+Reads either the JSON task manifest or the .sh/.bat/.command script itself, e.g.:
+
+	python renderRunner.py shot_v001.json --workers 8 --retries 2 --logs ./logs
+"""
+
+from collections import namedtuple
+import argparse
+import multiprocessing
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+try:
+	from shlex import quote
+except ImportError:
+	from pipes import quote
+
+import renderTasks
+
+# Something to run: an ID for logs and reports, the command line, and how many frames it renders.
+RunnerTask = namedtuple("RunnerTask", ["id", "command", "frames"])
+# The outcome of a task once all of its attempts are used.
+TaskResult = namedtuple("TaskResult", ["id", "returnCode", "attempts", "seconds", "logPath"])
+
+def splitCommand(command):
+	# Splits a render command into its executable and a list of its arguments, the way the shell would.
+	# On Windows, backslashes are kept and quoted arguments keep their quotes.
+	parts = shlex.split(command, posix = os.name != "nt")
+	if not parts:
+		return "", []
+	return parts[0], parts[1:]
+
+def joinCommand(parts):
+	# Joins what splitCommand() returns back into a command line.
+	if os.name == "nt":
+		return " ".join(parts)
+	return " ".join(quote(part) for part in parts)
+
+def prepareCommand(command, threads = 0, renderer = None):
+	# Returns the command with its thread count set and, optionally, its executable replaced.
+	# renderer is a command line of its own, such as a wrapper script with flags, so it is used as given.
+	executable, arguments = splitCommand(command)
+	if threads > 0 and "-n" not in arguments:
+		arguments = ["-n", str(threads)] + arguments
+	return (renderer or joinCommand([executable])) +" "+ joinCommand(arguments)
+
+def readScriptTasks(scriptPath):
+	# Returns one task per render command found in an exported script.
+	tasks = []
+	scriptFile = open(scriptPath, 'r')
+	for line in scriptFile:
+		line = line.strip()
+		if not line or line.startswith("#"):
+			continue
+		frames = 1
+		arguments = line.split()
+		if "-s" in arguments and "-e" in arguments:
+			try:
+				frames = int(float(arguments[arguments.index("-e") + 1])) - int(float(arguments[arguments.index("-s") + 1])) + 1
+			except (ValueError, IndexError):
+				pass
+		tasks.append(RunnerTask("task_%04d" % len(tasks), line, max(frames, 1)))
+	scriptFile.close()
+	return tasks
+
+def readManifestTasks(manifestPath, resume = False):
+	# Returns one task per entry in a JSON task manifest.
+	# With resume, tasks are narrowed to the frames whose images are missing or out of date.
+	manifest = renderTasks.readTaskManifest(manifestPath)
+	tasks = manifest["tasks"]
+	commands = manifest["commands"]
+	if resume and manifest.get("output"):
+		layerCommands = dict(((task.layer, task.camera), command) for task, command in zip(tasks, commands))
+		scenePath = manifest["scene"]
+		sceneTime = os.path.getmtime(scenePath) if os.path.exists(scenePath) else 0
+		sceneName = os.path.splitext(os.path.basename(scenePath))[0]
+		tasks = renderTasks.resumeTasks(tasks, manifest["output"], sceneName, sceneTime, manifest["layout"])
+		commands = [renderTasks.setCommandFrameRange(layerCommands[(task.layer, task.camera)], task.startFrame, task.endFrame) for task in tasks]
+	runnerTasks = []
+	for task, command in zip(tasks, commands):
+		runnerTasks.append(RunnerTask(task.id, command, task.endFrame - task.startFrame + 1))
+	return runnerTasks
+
+def readTasks(path, resume = False):
+	# Reads tasks from a manifest or a script depending on the file extension.
+	# Only manifests carry the output naming needed to resume.
+	if path.endswith(".json"):
+		return readManifestTasks(path, resume)
+	return readScriptTasks(path)
+
+def getWorkerLayout(workers = 0, threads = 0):
+	# Returns (workers, threads) so that workers * threads roughly fills the machine's cores.
+	cores = multiprocessing.cpu_count()
+	if workers <= 0:
+		workers = max(1, cores // (threads if threads > 0 else 8))
+	if threads <= 0:
+		threads = max(1, cores // workers)
+	return workers, threads
+
+def formatSeconds(seconds):
+	# Formats a duration as h:mm:ss.
+	seconds = int(round(seconds))
+	return "%d:%02d:%02d" % (seconds // 3600, (seconds % 3600) // 60, seconds % 60)
+
+class TaskRunner(object):
+	# Runs tasks in a bounded pool of worker threads, each driving one render process at a time.
+
+	def __init__(self, tasks, workers = 0, threads = 0, retries = 0, logDirectory = None, renderer = None, output = sys.stdout):
+		self.tasks = list(tasks)
+		self.workers, self.threads = getWorkerLayout(workers, threads)
+		self.retries = retries
+		self.logDirectory = logDirectory
+		self.renderer = renderer
+		self.output = output
+		self.results = []
+		self.lock = threading.Lock()
+
+	# Runs every task and returns the results in task order.
+	def run(self):
+		if self.logDirectory and not os.path.isdir(self.logDirectory):
+			os.makedirs(self.logDirectory)
+		self.totalFrames = sum(task.frames for task in self.tasks)
+		self.doneFrames = 0
+		self.startTime = time.time()
+
+		pending = queue.Queue()
+		for task in self.tasks:
+			pending.put(task)
+		threads = []
+		for index in range(min(self.workers, len(self.tasks))):
+			thread = threading.Thread(target = self.work, args = (pending,))
+			thread.daemon = True
+			thread.start()
+			threads.append(thread)
+		for thread in threads:
+			thread.join()
+
+		self.wallTime = time.time() - self.startTime
+		order = dict((task.id, index) for index, task in enumerate(self.tasks))
+		self.results.sort(key = lambda result: order[result.id])
+		return self.results
+
+	# Pulls tasks off the queue until it is empty.
+	def work(self, pending):
+		while True:
+			try:
+				task = pending.get_nowait()
+			except queue.Empty:
+				return
+			result = self.runTask(task)
+			with self.lock:
+				self.results.append(result)
+				self.doneFrames += task.frames
+				self.printProgress(task, result)
+
+	# Runs a single task, retrying it when the render exits with an error.
+	def runTask(self, task):
+		command = prepareCommand(task.command, self.threads, self.renderer)
+		logPath = None
+		if self.logDirectory:
+			logPath = os.path.join(self.logDirectory, renderTasks.getSafeName(task.id) +".log")
+		start = time.time()
+		attempts = 0
+		returnCode = None
+		while attempts <= self.retries:
+			attempts += 1
+			if logPath:
+				log = open(logPath, 'a')
+				log.write("# attempt %d: %s\n" % (attempts, command))
+				log.flush()
+			else:
+				log = open(os.devnull, 'w')
+			try:
+				returnCode = subprocess.call(command, shell = True, stdout = log, stderr = subprocess.STDOUT)
+			finally:
+				log.close()
+			if returnCode == 0:
+				break
+		return TaskResult(task.id, returnCode, attempts, time.time() - start, logPath)
+
+	# Prints one progress line with the estimated time remaining.
+	def printProgress(self, task, result):
+		elapsed = time.time() - self.startTime
+		remaining = self.totalFrames - self.doneFrames
+		eta = elapsed / self.doneFrames * remaining if self.doneFrames else 0
+		status = "done" if result.returnCode == 0 else "FAILED (%s)" % result.returnCode
+		self.output.write("[%d/%d] %s %s in %s, %d attempt(s). Elapsed %s, ETA %s\n" % (len(self.results), len(self.tasks), task.id, status, formatSeconds(result.seconds), result.attempts, formatSeconds(elapsed), formatSeconds(eta)))
+		self.output.flush()
+
+	# Returns the timing summary for the finished run.
+	def summary(self):
+		failed = [result for result in self.results if result.returnCode != 0]
+		taskTime = sum(result.seconds for result in self.results)
+		lines = []
+		lines.append("Tasks:      %d (%d failed)" % (len(self.results), len(failed)))
+		lines.append("Workers:    %d x %d render threads" % (self.workers, self.threads))
+		lines.append("Wall time:  %s" % formatSeconds(self.wallTime))
+		lines.append("Task time:  %s" % formatSeconds(taskTime))
+		if self.wallTime > 0:
+			lines.append("Speed-up:   %.2fx" % (taskTime / self.wallTime))
+		slowest = sorted(self.results, key = lambda result: -result.seconds)[:5]
+		for result in slowest:
+			lines.append("  %-40s %s" % (result.id, formatSeconds(result.seconds)))
+		for result in failed:
+			lines.append("FAILED %s (exit %s) log: %s" % (result.id, result.returnCode, result.logPath))
+		return "\n".join(lines)
+
+def main(arguments = None):
+	parser = argparse.ArgumentParser(description = "Runs an exported render script or task manifest in parallel.")
+	parser.add_argument("path", help = "Task manifest (.json) or exported render script.")
+	parser.add_argument("--workers", type = int, default = 0, help = "Render processes to run at once. Defaults to cores / 8.")
+	parser.add_argument("--threads", type = int, default = 0, help = "Render threads (-n) per process. Defaults to cores / workers.")
+	parser.add_argument("--retries", type = int, default = 0, help = "Times to retry a failed task.")
+	parser.add_argument("--logs", default = None, help = "Directory for per-task logs.")
+	parser.add_argument("--renderer", default = None, help = "Replaces the render executable in every command.")
+	parser.add_argument("--resume", action = "store_true", help = "Skip frames whose images already exist and are newer than the scene.")
+	options = parser.parse_args(arguments)
+
+	runner = TaskRunner(readTasks(options.path, options.resume), options.workers, options.threads, options.retries, options.logs, options.renderer)
+	results = runner.run()
+	print (runner.summary())
+	return 1 if [result for result in results if result.returnCode != 0] else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
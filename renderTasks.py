@@ -0,0 +1,330 @@
+"""
+Splits the render commands exported by batchAndSave into independent tasks and writes them to a JSON manifest.
+Tasks can also be narrowed to the frames whose images have not been rendered yet.
+Nothing in here needs Maya, so dispatchers and render nodes can import it directly.
+"""
+
+from collections import namedtuple
+import json
+import math
+import os
+import re
+
+# Immutable description of everything a render script needs from the scene.
+SceneSnapshot = namedtuple("SceneSnapshot", ["layers", "width", "height"])
+LayerSnapshot = namedtuple("LayerSnapshot", ["name", "cameras"])
+CameraSnapshot = namedtuple("CameraSnapshot", ["transform", "shape", "startFrame", "endFrame"])
+
+def getPlugResolver(currentLayer, adjustments, live):
+	# Returns a function giving the value a plug has on a render layer, from attribute values read once.
+	# live holds {plug: value} for the current layer, and adjustments holds each layer's {plug: value} overrides.
+	def resolve(layer, plug):
+		if layer == currentLayer:
+			return live[plug]
+		if plug in adjustments.get(layer, {}):
+			return adjustments[layer][plug]
+		# The master layer keeps the base values of attributes overridden by the current layer.
+		if plug in adjustments.get(currentLayer, {}):
+			return adjustments.get('defaultRenderLayer', {}).get(plug, live[plug])
+		return live[plug]
+	return resolve
+
+def resolveCamera(resolve, layer, shape, transform, frameRangeShapes):
+	# Returns a camera's snapshot on a layer, or None if it does not render there.
+	if not resolve(layer, shape +".renderable"):
+		return None
+	# Cameras without custom frame range attributes use the render globals.
+	if shape in frameRangeShapes:
+		startFrame = resolve(layer, shape +".startFrame")
+		endFrame = resolve(layer, shape +".endFrame")
+	else:
+		startFrame = resolve(layer, 'defaultRenderGlobals.startFrame')
+		endFrame = resolve(layer, 'defaultRenderGlobals.endFrame')
+	# The frames are kept as read, so the render commands pass them on the way Maya stores them.
+	return CameraSnapshot(transform, shape, startFrame, endFrame)
+
+def resolveSnapshot(renderLayers, currentLayer, adjustments, live, cameras, frameRangeShapes, width, height):
+	# Builds a scene snapshot from attribute values read once, without switching render layers.
+	# cameras is a list of (shape, transform) pairs.
+	resolve = getPlugResolver(currentLayer, adjustments, live)
+	layers = []
+	for layer in renderLayers:
+		layerCameras = [resolveCamera(resolve, layer, shape, transform, frameRangeShapes) for shape, transform in cameras]
+		layers.append(LayerSnapshot(layer, tuple(camera for camera in layerCameras if camera is not None)))
+	return SceneSnapshot(tuple(layers), width, height)
+
+# A single render command covering one frame range of one layer and camera.
+RenderTask = namedtuple("RenderTask", ["id", "layer", "camera", "startFrame", "endFrame"])
+
+def chunkFrameRange(startFrame, endFrame, framesPerTask = 0):
+	# Splits an inclusive frame range into a list of (start, end) pairs of at most framesPerTask frames.
+	# A framesPerTask of 0 or less keeps the range whole.
+	if framesPerTask <= 0 or endFrame < startFrame:
+		return [(startFrame, endFrame)]
+	# The frames may be floats, so the range is stepped by hand.
+	chunks = []
+	chunkStart = startFrame
+	while chunkStart <= endFrame:
+		chunks.append((chunkStart, min(chunkStart + framesPerTask - 1, endFrame)))
+		chunkStart += framesPerTask
+	return chunks
+
+def getSafeName(name):
+	# Replaces everything but letters, digits, underscores, periods, and hyphens, such as namespace colons and DAG path bars.
+	return re.sub(r'[^\w.-]', '_', name)
+
+def makeTask(layer, camera, startFrame, endFrame):
+	# Returns a render task with an ID built from its layer, camera, and frame range.
+	# The ID names the task's log file, so it is safe to use as a file name.
+	taskId = getSafeName("%s_%s_%g_%g" % (layer, camera, startFrame, endFrame))
+	return RenderTask(taskId, layer, camera, startFrame, endFrame)
+
+def chunkTasks(tasks, framesPerTask = 0):
+	# Splits each task into tasks of at most framesPerTask frames.
+	if framesPerTask <= 0:
+		return list(tasks)
+	chunked = []
+	for task in tasks:
+		for startFrame, endFrame in chunkFrameRange(task.startFrame, task.endFrame, framesPerTask):
+			chunked.append(makeTask(task.layer, task.camera, startFrame, endFrame))
+	return chunked
+
+def buildTasks(snapshot, framesPerTask = 0):
+	# Returns a list of render tasks for every renderable layer and camera in a scene snapshot.
+	tasks = []
+	for layer in snapshot.layers:
+		for camera in layer.cameras:
+			tasks.append(makeTask(layer.name, camera.transform, camera.startFrame, camera.endFrame))
+	return chunkTasks(tasks, framesPerTask)
+
+# The render globals settings that decide where each frame's image is written.
+# periodInExt: 0 = "name#.ext", 1 = "name.#.ext", 2 = "name_#.ext". putFrameBeforeExt 0 gives "name.ext.#".
+OutputNaming = namedtuple("OutputNaming", ["imageDirectory", "prefix", "padding", "extension", "putFrameBeforeExt", "periodInExt"])
+
+# Extensions for the defaultRenderGlobals.imageFormat values. 51 means the imfPluginKey is used instead.
+IMAGE_EXTENSIONS = {1: "pic", 2: "rla", 3: "tif", 4: "tif", 5: "rgb", 6: "pix", 7: "iff", 8: "jpg", 9: "eps", 10: "iff", 11: "cin", 12: "yuv", 13: "rgb", 19: "tga", 20: "bmp", 31: "psd", 32: "png", 35: "dds", 36: "psd"}
+
+def getImageExtension(imageFormat, pluginKey = None):
+	# Returns the file extension written for a render globals image format.
+	extension = IMAGE_EXTENSIONS.get(imageFormat)
+	if extension is None:
+		extension = pluginKey or "iff"
+	return extension
+
+def expandPrefix(naming, sceneName, layer, camera, multipleLayers = False, multipleCameras = False):
+	# Replaces the tokens in the image file prefix. An empty prefix falls back to Maya's default layout.
+	prefix = naming.prefix
+	if not prefix:
+		prefix = "<Scene>"
+		if multipleCameras:
+			prefix = "<Camera>/" + prefix
+		if multipleLayers:
+			prefix = "<RenderLayer>/" + prefix
+	camera = camera.rsplit("|", 1)[-1].replace(":", "_")
+	# Maya writes the default render layer's images as masterLayer.
+	if layer == "defaultRenderLayer":
+		layer = "masterLayer"
+	for token, value in (("<Scene>", sceneName), ("<RenderLayer>", layer), ("<Layer>", layer), ("<Camera>", camera), ("%s", sceneName), ("%l", layer), ("%c", camera)):
+		prefix = prefix.replace(token, value)
+	return prefix
+
+def getImagePath(naming, prefix, frame):
+	# Returns the path of one frame's image from an already expanded prefix.
+	number = "%0*d" % (naming.padding, frame)
+	separator = {0: "", 1: ".", 2: "_"}.get(naming.periodInExt, ".")
+	if naming.putFrameBeforeExt:
+		name = prefix + separator + number + "." + naming.extension
+	else:
+		name = prefix + "." + naming.extension + "." + number
+	return os.path.join(naming.imageDirectory, name)
+
+def findMissingFrames(naming, prefix, startFrame, endFrame, sceneTime = 0, listings = None):
+	# Returns the frames whose images are missing, empty, or older than the scene file.
+	# Each directory is listed once, so only images that exist are stat'ed.
+	if listings is None:
+		listings = {}
+	missing = []
+	# Images are numbered by whole frames.
+	for frame in range(int(math.ceil(startFrame)), int(math.floor(endFrame)) + 1):
+		path = getImagePath(naming, prefix, frame)
+		directory, name = os.path.split(path)
+		if directory not in listings:
+			try:
+				listings[directory] = set(os.listdir(directory or "."))
+			except OSError:
+				listings[directory] = set()
+		if name not in listings[directory]:
+			missing.append(frame)
+			continue
+		try:
+			info = os.stat(path)
+		except OSError:
+			missing.append(frame)
+			continue
+		if info.st_size == 0 or info.st_mtime < sceneTime:
+			missing.append(frame)
+	return missing
+
+def coalesceFrames(frames):
+	# Joins a sorted list of frames into contiguous (start, end) spans.
+	spans = []
+	for frame in frames:
+		if spans and frame == spans[-1][1] + 1:
+			spans[-1] = (spans[-1][0], frame)
+		else:
+			spans.append((frame, frame))
+	return spans
+
+def getOutputLayout(tasks):
+	# Returns (multipleLayers, multipleCameras) for all of a scene's tasks. They decide Maya's default image folders.
+	return len(set(task.layer for task in tasks)) > 1, len(set(task.camera for task in tasks)) > 1
+
+def resumeTasks(tasks, naming, sceneName, sceneTime = 0, layout = None):
+	# Returns tasks covering only the frames of the given tasks that still have to be rendered.
+	# Each task is narrowed to the gaps in its frame range; a task with several gaps becomes several tasks.
+	# layout is the scene's getOutputLayout(). Without it, it is worked out from the tasks, which must then cover the whole scene.
+	multipleLayers, multipleCameras = layout if layout is not None else getOutputLayout(tasks)
+	listings = {}
+	remaining = []
+	for task in tasks:
+		prefix = expandPrefix(naming, sceneName, task.layer, task.camera, multipleLayers, multipleCameras)
+		missing = findMissingFrames(naming, prefix, task.startFrame, task.endFrame, sceneTime, listings)
+		for startFrame, endFrame in coalesceFrames(missing):
+			remaining.append(makeTask(task.layer, task.camera, startFrame, endFrame))
+	return remaining
+
+def setCommandFrameRange(command, startFrame, endFrame):
+	# Replaces the -s/-e flags of a render command.
+	return re.sub(r"-s \S+ -e \S+", "-s %s -e %s" % (startFrame, endFrame), command, count = 1)
+
+def cleanPath(scenePath):
+	# This function reformats a path so the command line can read it.
+	# Breakdown the file path into components.
+	scenePath = scenePath.strip()
+	pathComponents = scenePath.split("/")
+	updatedComponents = []
+	
+	# If spaces exist in component names, surround them with quotations.
+	for component in pathComponents:
+		if component.find(" ") > -1:
+			outComponent = '"' + component + '"/'
+		else: 
+			outComponent = component + '/'
+		updatedComponents.append(outComponent)
+	
+	# Assemble a new string and return.
+	output = "".join(updatedComponents)
+	return output
+	
+def getHeader(operatingSystem):
+	# Adds a header for bash.
+	header = ""
+	if (operatingSystem == "mac"):
+		header = "#!/bin/bash\n"
+	else:
+		header = "\n"
+	return header
+	
+def getScriptExtension(operatingSystem):
+	# Returns the normalized operating system name and the matching script extension.
+	if operatingSystem == "mac":
+		return "mac", ".command"
+	elif operatingSystem == "nt" or operatingSystem == "win64" or operatingSystem == "windows":
+		return "windows", ".bat"
+	elif operatingSystem == "linux" or operatingSystem == "linux64":
+		return "linux", ".sh"
+	print ("Invalid operating system.")
+	return operatingSystem, ""
+	
+def getResolutionArguments(width, height):
+	# Returns the render flags for the scene's resolution.
+	return "-x "+ str(width) +" -y "+ str(height) +" "
+
+def getTaskArguments(task):
+	# Returns the render flags that select the task's layer, camera, and frame range.
+	return "-rl "+ task.layer +" -cam "+ task.camera +" -s "+ str(task.startFrame) +" -e "+ str(task.endFrame) +" "
+
+def getRenderCommand(rendererPath, project, task, resolution, filePath):
+	# Assembles the command line that renders a single task.
+	return rendererPath + " " + project + " " + getTaskArguments(task) + resolution + filePath
+
+def getScriptCommands(snapshot, sceneFile, rendererPath, projectPath, tasks):
+	# Returns the render command for each task, as written to the render script.
+	sceneDirectory, sceneName = os.path.split(sceneFile)
+	
+	# Get the file path and the project flag.
+	filePath = cleanPath(sceneDirectory) + sceneName
+	project = "-proj " + cleanPath(projectPath) + " "
+	resolution = getResolutionArguments(snapshot.width, snapshot.height)
+	return [getRenderCommand(rendererPath, project, task, resolution, filePath) for task in tasks]
+
+def writeTaskManifest(manifestPath, tasks, commands, scenePath, width, height, naming = None, layout = None):
+	# Writes the tasks and their command lines to a JSON manifest for dispatchers.
+	# The output naming and the scene's output layout let a runner skip frames that were already rendered.
+	manifest = {
+		"scene": scenePath,
+		"resolution": [width, height],
+		"tasks": [],
+	}
+	if naming is not None:
+		manifest["output"] = dict(naming._asdict())
+		multipleLayers, multipleCameras = layout if layout is not None else getOutputLayout(tasks)
+		manifest["output"]["multipleLayers"] = multipleLayers
+		manifest["output"]["multipleCameras"] = multipleCameras
+	for task, command in zip(tasks, commands):
+		entry = task._asdict()
+		entry["command"] = command
+		manifest["tasks"].append(dict(entry))
+	# Without indentation the manifest is encoded in C, which matters with tens of thousands of tasks.
+	manifestFile = open(manifestPath, 'w')
+	manifestFile.write(json.dumps(manifest))
+	manifestFile.close()
+	return manifestPath
+
+def readTaskManifest(manifestPath):
+	# Returns the manifest dictionary, with its tasks converted back into RenderTask tuples.
+	# The output layout is moved to "layout", None for manifests written before it was stored.
+	manifestFile = open(manifestPath, 'r')
+	manifest = json.load(manifestFile)
+	manifestFile.close()
+	manifest["commands"] = [entry["command"] for entry in manifest["tasks"]]
+	manifest["tasks"] = [RenderTask(*[entry[field] for field in RenderTask._fields]) for entry in manifest["tasks"]]
+	manifest["layout"] = None
+	if "output" in manifest:
+		if "multipleLayers" in manifest["output"]:
+			manifest["layout"] = (manifest["output"]["multipleLayers"], manifest["output"]["multipleCameras"])
+		manifest["output"] = OutputNaming(*[manifest["output"][field] for field in OutputNaming._fields])
+	return manifest
+
+def exportRenderScript(snapshot, sceneFile, rendererPath, projectPath, operatingSystem, framesPerTask = 0, naming = None, resume = False):
+	# Writes the render script and its task manifest next to the scene file. Returns the script name.
+	operatingSystem, extension = getScriptExtension(operatingSystem)
+	sceneDirectory, sceneName = os.path.split(sceneFile)
+	
+	# Get the script path and file name.
+	base = os.path.splitext(sceneName)[0]
+	scriptName = base + extension
+	scriptPath = os.path.join(sceneDirectory, scriptName)
+	
+	# Split the scene render layers into tasks.
+	tasks = buildTasks(snapshot)
+	layout = getOutputLayout(tasks)
+	if resume and naming is not None:
+		sceneTime = os.path.getmtime(sceneFile) if os.path.exists(sceneFile) else 0
+		tasks = resumeTasks(tasks, naming, base, sceneTime, layout)
+	tasks = chunkTasks(tasks, framesPerTask)
+	
+	# Create the list of render commands.
+	renderCommands = getScriptCommands(snapshot, sceneFile, rendererPath, projectPath, tasks)
+	
+	# Create the file and start writing.
+	batchFile = open(scriptPath, 'w')
+	batchFile.write(getHeader(operatingSystem))
+	for eachCommand in renderCommands:
+		batchFile.write(eachCommand +"\n")
+		batchFile.write("\n")
+	batchFile.close()
+	
+	# Write the task manifest alongside the script.
+	writeTaskManifest(os.path.join(sceneDirectory, base + ".json"), tasks, renderCommands, sceneFile, snapshot.width, snapshot.height, naming, layout)
+	return scriptName
@@ -0,0 +1,118 @@
+"""
+Computes RibbonSpine joint transforms outside Maya with NumPy, for a whole frame range in one call, e.g.:
+
+	import numpy, ribbonSolver
+	frames = 1000
+	top = numpy.zeros((frames, 3))
+	top[:, 0] = numpy.sin(numpy.linspace(0, 6, frames))
+	pose = ribbonSolver.solveRibbon(10.0, top, numpy.zeros((frames, 3)), numpy.zeros((frames, 3)), joints = 20)
+	pose.positions.shape	# (1000, 20, 3)
+
+The model follows the rig built by flexoPlane2.RibbonSpine, in the rig's own space (the master control's space):
+	- The wire curve has three CVs. Its ends follow the top and bottom controls. Its middle CV follows the mid control,
+	  plus half of each end control, like the 0.5 weighted clusters.
+	- The plane's center line follows the curve, and each joint sits at its follicle's U parameter.
+	- The twist runs from the bottom control's rotateY (endAngle) to the top control's rotateY (startAngle),
+	  about the twist handle's flipped Y axis.
+	- With squash and stretch enabled, joints scale by restLength / arcLength in Y and Z.
+"""
+
+from collections import namedtuple
+
+import numpy
+
+# positions (frames, joints, 3), matrices (frames, joints, 3, 3) whose rows are the joint X, Y, Z axes, scales (frames, joints, 3).
+RibbonPose = namedtuple("RibbonPose", ["positions", "matrices", "scales"])
+
+def getParameters(joints, endDensity = 1.0):
+	# Returns the follicle U parameters, as flexoPlane2.getFollicleParameters does.
+	bias = (endDensity - 1.0) / (endDensity + 1.0)
+	t = (numpy.arange(joints) + 0.5) / joints
+	return t - bias * numpy.sin(2 * numpy.pi * t) / (2 * numpy.pi)
+
+def getFrames(values, frames, width):
+	# Broadcasts a scalar, a single value, or a per-frame array to an array of (frames, width), or (frames,) when width is 0.
+	values = numpy.asarray(values, dtype = float)
+	shape = (frames, width) if width else (frames,)
+	return numpy.broadcast_to(values, shape)
+
+def getControlPoints(distance, top, mid, bottom):
+	# Returns the wire curve CVs for every frame as an array of (frames, 3, 3).
+	half = distance / 2.0
+	points = numpy.empty((len(top), 3, 3))
+	points[:, 0] = bottom
+	points[:, 1] = mid + 0.5 * (top + bottom)
+	points[:, 2] = top
+	points[:, 0, 1] -= half
+	points[:, 2, 1] += half
+	return points
+
+def evaluateCurve(points, parameters):
+	# Returns the positions and first derivatives of the degree 2 curve at each parameter, as arrays of (frames, joints, 3).
+	u = parameters[None, :, None]
+	p0, p1, p2 = points[:, None, 0], points[:, None, 1], points[:, None, 2]
+	positions = (1 - u) ** 2 * p0 + 2 * u * (1 - u) * p1 + u ** 2 * p2
+	tangents = 2 * (1 - u) * (p1 - p0) + 2 * u * (p2 - p1)
+	return positions, tangents
+
+def getArcLengths(points, samples = 16):
+	# Returns the curve length for every frame, by Gauss-Legendre quadrature.
+	nodes, weights = numpy.polynomial.legendre.leggauss(samples)
+	tangents = evaluateCurve(points, (nodes + 1) / 2.0)[1]
+	return numpy.linalg.norm(tangents, axis = 2).dot(weights) / 2.0
+
+def normalize(vectors):
+	return vectors / numpy.linalg.norm(vectors, axis = -1)[..., None]
+
+def solveRibbon(distance, top, mid, bottom, topTwist = 0.0, bottomTwist = 0.0, enable = True, joints = 5, endDensity = 1.0, arcSamples = 16):
+	# Returns a RibbonPose for every frame.
+	# top, mid, and bottom are the control translates as (frames, 3) arrays; the twists are rotateY in degrees and
+	# enable is the master control's squash and stretch switch, each a scalar or a (frames,) array.
+	top = numpy.asarray(top, dtype = float)
+	frames = len(top)
+	mid = getFrames(mid, frames, 3)
+	bottom = getFrames(bottom, frames, 3)
+	topTwist = getFrames(topTwist, frames, 0)
+	bottomTwist = getFrames(bottomTwist, frames, 0)
+	enable = getFrames(enable, frames, 0)
+	parameters = getParameters(joints, endDensity)
+
+	points = getControlPoints(float(distance), top, mid, bottom)
+	centers, tangents = evaluateCurve(points, parameters)
+
+	# The twist angle follows each point's height along the handle, clamped to its bounds.
+	height = (centers[..., 1] + distance / 2.0) / distance
+	inside = (height >= 0) & (height <= 1)
+	spread = numpy.radians(topTwist - bottomTwist)[:, None]
+	angles = -(numpy.radians(bottomTwist)[:, None] + spread * numpy.clip(height, 0, 1))
+	rates = numpy.where(inside, -spread / distance * tangents[..., 1], 0.0)
+	cos, sin = numpy.cos(angles), numpy.sin(angles)
+
+	# Rotate the center line about Y. The U tangent picks up the change in angle along the curve.
+	x, y, z = centers[..., 0], centers[..., 1], centers[..., 2]
+	positions = numpy.stack([x * cos + z * sin, y, z * cos - x * sin], axis = -1)
+	tx, ty, tz = tangents[..., 0], tangents[..., 1], tangents[..., 2]
+	uAxis = numpy.stack([tx * cos + tz * sin + rates * (z * cos - x * sin), ty, tz * cos - tx * sin + rates * (-x * cos - z * sin)], axis = -1)
+	# The plane's V direction is its rest -X axis, rotated by the twist.
+	vAxis = numpy.stack([-cos, numpy.zeros_like(cos), sin], axis = -1)
+
+	# Follicle axes: X along U, Z along the surface normal, Y completing the frame.
+	xAxis = normalize(uAxis)
+	zAxis = normalize(numpy.cross(uAxis, vAxis))
+	yAxis = numpy.cross(zAxis, xAxis)
+	matrices = numpy.stack([xAxis, yAxis, zAxis], axis = -2)
+
+	# The volume factor is 1 / (arcLength / restLength) while enabled, and 1 otherwise.
+	volume = numpy.where(enable == 1, distance / getArcLengths(points, arcSamples), 1.0)
+	scales = numpy.ones((frames, joints, 3))
+	scales[..., 1] = volume[:, None]
+	scales[..., 2] = volume[:, None]
+	return RibbonPose(positions, matrices, scales)
+
+def getEulerRotations(matrices):
+	# Returns XYZ rotate order Euler angles in degrees, (..., 3), for matrices whose rows are the X, Y, Z axes.
+	m = matrices
+	y = numpy.arcsin(numpy.clip(-m[..., 0, 2], -1.0, 1.0))
+	x = numpy.arctan2(m[..., 1, 2], m[..., 2, 2])
+	z = numpy.arctan2(m[..., 0, 1], m[..., 0, 0])
+	return numpy.degrees(numpy.stack([x, y, z], axis = -1))
@@ -0,0 +1,228 @@
+"""
+Finds versioned scene files named "name_v001.ext" without Maya.
+A per-directory version index answers "latest" and "next version" lookups and reserves new versions atomically.
+New versions are written next to their destination and renamed into place, so a reader never sees a partial file.
+"""
+
+import errno
+import os
+import re
+import shutil
+import sys
+import threading
+
+# Matches "name_v001.ext" the same way batchAndSave.splitName() splits it.
+VERSION_PATTERN = re.compile(r"^(?P<base>.+)_v(?P<version>\d+)\.(?P<extension>[^.]+)$")
+
+def parseVersion(fileName):
+	# Returns (base name, version number, padding, extension) for a versioned file name, or None.
+	match = VERSION_PATTERN.match(fileName)
+	if match is None:
+		return None
+	version = match.group("version")
+	return match.group("base"), int(version), len(version), match.group("extension")
+
+def findLatestVersions(directory, extensions = ("ma", "mb"), recursive = True):
+	# Returns the path of the highest version of each shot found under a directory.
+	# Empty files are versions reserved by a save that has not finished, or failed, so they are skipped.
+	latest = {}
+	for root, directories, files in os.walk(directory):
+		for fileName in files:
+			parsed = parseVersion(fileName)
+			if parsed is None or parsed[3] not in extensions:
+				continue
+			if os.path.getsize(os.path.join(root, fileName)) == 0:
+				continue
+			key = (root, parsed[0])
+			if key not in latest or parsed[1] > latest[key][0]:
+				latest[key] = (parsed[1], os.path.join(root, fileName))
+		if not recursive:
+			break
+	return [latest[key][1] for key in sorted(latest)]
+
+def listDirectory(directory):
+	# Returns the names of the files in a directory from a single listing.
+	# os.scandir reads the file type with the names, so no file is stat'ed.
+	if hasattr(os, "scandir"):
+		return [entry.name for entry in os.scandir(directory) if not entry.is_dir()]
+	return [name for name in os.listdir(directory) if not os.path.isdir(os.path.join(directory, name))]
+
+def getDirectoryStamp(directory):
+	# Returns a value that changes whenever files are added to or removed from a directory.
+	info = os.stat(directory)
+	return getattr(info, "st_mtime_ns", info.st_mtime), info.st_size
+
+def formatName(base, version, padding, extension):
+	# Returns "base_v###.extension". Versions longer than the padding simply grow, so v999 is followed by v1000.
+	return "%s_v%0*d.%s" % (base, padding, version, extension)
+
+class VersionIndex(object):
+	# The versions of every shot in one directory, built from a single directory listing.
+
+	def __init__(self, directory):
+		self.directory = directory
+		self.stamp = getDirectoryStamp(directory)
+		self.versions = {}
+		self.latest = {}
+		self.lock = threading.Lock()
+		for fileName in listDirectory(directory):
+			self.add(fileName)
+
+	# Adds a file to the index if it is a versioned scene.
+	def add(self, fileName):
+		parsed = parseVersion(fileName)
+		if parsed is None:
+			return
+		base, version, padding, extension = parsed
+		self.versions.setdefault(base, {})[version] = fileName
+		if base not in self.latest or version > self.latest[base][0]:
+			self.latest[base] = (version, padding, extension)
+
+	# Returns (version, padding, extension) of a shot's highest version, or None.
+	def getLatest(self, base):
+		return self.latest.get(base)
+
+	# Returns the path of a shot's highest version, or None.
+	def getLatestPath(self, base):
+		latest = self.latest.get(base)
+		if latest is None:
+			return None
+		return os.path.join(self.directory, self.versions[base][latest[0]])
+
+	# Returns the version number after a shot's highest version. Gaps in the numbering are never reused.
+	def getNext(self, base):
+		latest = self.latest.get(base)
+		return latest[0] + 1 if latest else 1
+
+	# Returns True when the shot already has the given version, in any extension.
+	def hasVersion(self, base, version):
+		return version in self.versions.get(base, {})
+
+	# Claims the next free version by creating its file exclusively and returns its path.
+	# O_EXCL creation is atomic, even on NFS, so two artists saving at once never get the same version.
+	def reserve(self, base, extension, padding = 3):
+		with self.lock:
+			version = self.getNext(base)
+			while True:
+				fileName = formatName(base, version, padding, extension)
+				path = os.path.join(self.directory, fileName)
+				try:
+					os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+				except OSError as error:
+					if error.errno != errno.EEXIST:
+						raise
+					self.add(fileName)
+					version += 1
+					continue
+				self.add(fileName)
+				# Our own new file should not invalidate the cached index.
+				self.stamp = getDirectoryStamp(self.directory)
+				return path
+
+	# Removes a reserved file that was never saved over.
+	def release(self, path):
+		if os.path.exists(path) and os.path.getsize(path) == 0:
+			os.remove(path)
+
+# The Linux ioctl that makes a copy-on-write clone of a file (btrfs, XFS, and some NFS servers).
+FICLONE = 0x40049409
+
+def cloneFile(source, destination):
+	# Makes destination a copy-on-write clone of source. Returns False where the file system cannot.
+	if not sys.platform.startswith("linux"):
+		return False
+	import fcntl
+	sourceFile = open(source, 'rb')
+	try:
+		destinationFile = open(destination, 'wb')
+		try:
+			fcntl.ioctl(destinationFile.fileno(), FICLONE, sourceFile.fileno())
+		except (IOError, OSError):
+			return False
+		finally:
+			destinationFile.close()
+	finally:
+		sourceFile.close()
+	return True
+
+def replaceFile(source, destination):
+	# Renames source over destination in one step.
+	if hasattr(os, "replace"):
+		os.replace(source, destination)
+	elif sys.platform.startswith("win") and os.path.exists(destination):
+		os.remove(destination)
+		os.rename(source, destination)
+	else:
+		os.rename(source, destination)
+
+def copyVersion(source, destination, allowHardlink = False):
+	# Creates destination with the contents of source as cheaply as the file system allows.
+	# Tries a reflink, then a hard link if allowed, then a plain copy. Returns the method used.
+	# Hard links share data with the previous version, so they are only safe when files are always replaced, never rewritten.
+	partial = destination + ".partial"
+	if os.path.exists(partial):
+		os.remove(partial)
+	method = None
+	if cloneFile(source, partial):
+		method = "reflink"
+	elif os.path.exists(partial):
+		os.remove(partial)
+	if method is None and allowHardlink and hasattr(os, "link"):
+		try:
+			os.link(source, partial)
+			method = "hardlink"
+		except OSError:
+			pass
+	if method is None:
+		shutil.copyfile(source, partial)
+		method = "copy"
+	replaceFile(partial, destination)
+	return method
+
+def getFileStamp(path):
+	# Returns the size and modification time of a file, or None if it does not exist.
+	try:
+		info = os.stat(path)
+	except OSError:
+		return None
+	return info.st_size, getattr(info, "st_mtime_ns", info.st_mtime)
+
+# Locks that let only one publish at a time write to each destination.
+_publishLocks = {}
+_publishLocksLock = threading.Lock()
+
+def getPublishLock(destination):
+	# Returns the lock for publishes to a destination.
+	destination = os.path.abspath(destination)
+	with _publishLocksLock:
+		return _publishLocks.setdefault(destination, threading.Lock())
+
+def publishFile(localPath, destination, expectedStamp = None):
+	# Copies a locally saved file to its destination and renames it into place, then removes the local file.
+	# With expectedStamp, the copy is dropped if the destination changed since the stamp was taken, so a newer save
+	# of the same file is never overwritten. Returns the destination, or None if the copy was dropped.
+	with getPublishLock(destination):
+		partial = destination + ".partial"
+		shutil.copyfile(localPath, partial)
+		if expectedStamp is not None and getFileStamp(destination) != expectedStamp:
+			os.remove(partial)
+			os.remove(localPath)
+			return None
+		replaceFile(partial, destination)
+		os.remove(localPath)
+		return destination
+
+# Version indexes by directory. Each is rebuilt when its directory's modification stamp changes.
+_indexes = {}
+_indexesLock = threading.Lock()
+
+def getVersionIndex(directory):
+	# Returns the cached version index for a directory, rebuilding it if files were added or removed.
+	directory = os.path.abspath(directory)
+	stamp = getDirectoryStamp(directory)
+	with _indexesLock:
+		index = _indexes.get(directory)
+		if index is None or index.stamp != stamp:
+			index = VersionIndex(directory)
+			_indexes[directory] = index
+		return index